@@ -2,17 +2,37 @@
 Configuration management using Pydantic Settings.
 Loads configuration from environment variables with validation.
 """
+import os
+from functools import cached_property, lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
-from pydantic_settings import BaseSettings
-from pydantic import Field, model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field, field_validator
 from typing import Optional
 
 from src.common.secrets import resolve_secret
 
-# Load .env file into os.environ so all nested BaseSettings pick up values
 _env_path = Path(__file__).resolve().parent.parent / ".env"
-load_dotenv(_env_path)
+
+# Set in os.environ once .env has been loaded, so child processes that
+# inherit the environment skip the file read entirely
+_ENV_LOADED_FLAG = "_TT_ENV_LOADED"
+_dotenv_loaded = False
+
+
+def _load_env_once() -> None:
+    """
+    Load the .env file into os.environ at most once per interpreter.
+
+    Existing environment variables always take precedence over .env values,
+    so all nested BaseSettings pick up container-provided configuration.
+    """
+    global _dotenv_loaded
+    if _dotenv_loaded or os.environ.get(_ENV_LOADED_FLAG):
+        return
+    load_dotenv(_env_path, override=False)
+    os.environ[_ENV_LOADED_FLAG] = "1"
+    _dotenv_loaded = True
 
 
 class RedisSettings(BaseSettings):
@@ -24,11 +44,19 @@ class RedisSettings(BaseSettings):
     db: int = Field(default=0)
     ssl: bool = Field(default=False)
     ssl_ca_certs: Optional[str] = Field(default=None)
+    unix_socket_path: Optional[str] = Field(
+        default=None, description="UNIX socket path; overrides host/port when set"
+    )
     stream_name: str = Field(default="email_ingestion_stream")
     max_stream_length: int = Field(default=10000)
 
-    class Config:
-        env_prefix = "REDIS_"
+    @field_validator("password")
+    @classmethod
+    def resolve_password(cls, value: Optional[str]) -> Optional[str]:
+        """Resolve file: and env: secret references."""
+        return resolve_secret(value) if value else value
+
+    model_config = SettingsConfigDict(env_prefix="REDIS_", frozen=True)
 
 
 class IMAPSettings(BaseSettings):
@@ -38,9 +66,11 @@ class IMAPSettings(BaseSettings):
     user: str = Field(default="")
     mailbox: str = Field(default="INBOX")
     poll_interval_seconds: int = Field(default=60)
+    # Kept below the producer's default batch size (50) so a full poll spans
+    # several chunks and the next chunk is prefetched while one is pushed
+    fetch_chunk_size: int = Field(default=25, ge=1, description="Max UIDs per UID FETCH command")
 
-    class Config:
-        env_prefix = "IMAP_"
+    model_config = SettingsConfigDict(env_prefix="IMAP_", frozen=True)
 
 
 class OAuth2Settings(BaseSettings):
@@ -50,13 +80,18 @@ class OAuth2Settings(BaseSettings):
     redirect_uri: str = Field(default="http://localhost:8080")
     token_file: str = Field(default="tokens/gmail_token.json")
 
-    @property
+    @field_validator("client_secret")
+    @classmethod
+    def resolve_client_secret(cls, value: str) -> str:
+        """Resolve file: and env: secret references."""
+        return resolve_secret(value) if value else value
+
+    @cached_property
     def is_configured(self) -> bool:
         """Check if OAuth2 credentials are fully configured."""
         return bool(self.client_id and self.client_secret)
 
-    class Config:
-        env_prefix = "GOOGLE_"
+    model_config = SettingsConfigDict(env_prefix="GOOGLE_", frozen=True)
 
 
 class OutlookOAuth2Settings(BaseSettings):
@@ -67,13 +102,18 @@ class OutlookOAuth2Settings(BaseSettings):
     redirect_uri: str = Field(default="http://localhost:8080")
     token_file: str = Field(default="tokens/outlook_token.json")
 
-    @property
+    @field_validator("client_secret")
+    @classmethod
+    def resolve_client_secret(cls, value: str) -> str:
+        """Resolve file: and env: secret references."""
+        return resolve_secret(value) if value else value
+
+    @cached_property
     def is_configured(self) -> bool:
         """Check if Outlook OAuth2 credentials are configured."""
         return bool(self.client_id)
 
-    class Config:
-        env_prefix = "MICROSOFT_"
+    model_config = SettingsConfigDict(env_prefix="MICROSOFT_", frozen=True)
 
 
 class WorkerSettings(BaseSettings):
@@ -83,16 +123,14 @@ class WorkerSettings(BaseSettings):
     batch_size: int = Field(default=10)
     block_timeout_ms: int = Field(default=5000)
 
-    class Config:
-        env_prefix = ""
+    model_config = SettingsConfigDict(env_prefix="", frozen=True)
 
 
 class IdempotencySettings(BaseSettings):
     """Idempotency configuration"""
     ttl_seconds: int = Field(default=86400)
 
-    class Config:
-        env_prefix = "IDEMPOTENCY_"
+    model_config = SettingsConfigDict(env_prefix="IDEMPOTENCY_", frozen=True)
 
 
 class DLQSettings(BaseSettings):
@@ -102,8 +140,7 @@ class DLQSettings(BaseSettings):
     initial_backoff_seconds: int = Field(default=2)
     max_backoff_seconds: int = Field(default=3600)
 
-    class Config:
-        env_prefix = "DLQ_"
+    model_config = SettingsConfigDict(env_prefix="DLQ_", frozen=True)
 
 
 class MonitoringSettings(BaseSettings):
@@ -113,8 +150,7 @@ class MonitoringSettings(BaseSettings):
     worker_metrics_port: int = Field(default=9091)
     worker_health_port: int = Field(default=8081)
 
-    class Config:
-        env_prefix = ""
+    model_config = SettingsConfigDict(env_prefix="", frozen=True)
 
 
 class ProcessorSettings(BaseSettings):
@@ -122,8 +158,7 @@ class ProcessorSettings(BaseSettings):
     output_stream_name: str = Field(default="email_processed_stream")
     max_email_size_bytes: int = Field(default=26214400)  # 25 MB
 
-    class Config:
-        env_prefix = "PROCESSOR_"
+    model_config = SettingsConfigDict(env_prefix="PROCESSOR_", frozen=True)
 
 
 class CircuitBreakerSettings(BaseSettings):
@@ -131,9 +166,11 @@ class CircuitBreakerSettings(BaseSettings):
     failure_threshold: int = Field(default=5)
     recovery_timeout_seconds: float = Field(default=60.0)
     success_threshold: int = Field(default=3)
+    # Only failures within this many seconds trip the breaker (None = count
+    # until the next success)
+    failure_window_seconds: Optional[float] = Field(default=None)
 
-    class Config:
-        env_prefix = "CB_"
+    model_config = SettingsConfigDict(env_prefix="CB_", frozen=True)
 
 
 class RecoverySettings(BaseSettings):
@@ -143,8 +180,7 @@ class RecoverySettings(BaseSettings):
     max_delivery_count: int = Field(default=10)
     check_interval_seconds: int = Field(default=60)
 
-    class Config:
-        env_prefix = "RECOVERY_"
+    model_config = SettingsConfigDict(env_prefix="RECOVERY_", frozen=True)
 
 
 class LoggingSettings(BaseSettings):
@@ -152,8 +188,7 @@ class LoggingSettings(BaseSettings):
     level: str = Field(default="INFO")
     format: str = Field(default="json")
 
-    class Config:
-        env_prefix = "LOG_"
+    model_config = SettingsConfigDict(env_prefix="LOG_", frozen=True)
 
 
 class Settings(BaseSettings):
@@ -172,20 +207,62 @@ class Settings(BaseSettings):
     recovery: RecoverySettings = Field(default_factory=RecoverySettings)
     logging: LoggingSettings = Field(default_factory=LoggingSettings)
 
-    class Config:
-        extra = "ignore"
+    model_config = SettingsConfigDict(extra="ignore", frozen=True)
+
+
+def _settings_env_keys() -> frozenset:
+    """
+    Collect every environment variable name the settings sections read.
+
+    Returns:
+        Upper-cased variable names (env_prefix + field name)
+    """
+    keys = set()
+    for name, field in Settings.model_fields.items():
+        section = field.annotation
+        if isinstance(section, type) and issubclass(section, BaseSettings):
+            prefix = section.model_config.get("env_prefix", "")
+            keys.update(f"{prefix}{field_name}".upper() for field_name in section.model_fields)
+        else:
+            keys.add(name.upper())
+    return frozenset(keys)
+
+
+_SETTINGS_ENV_KEYS = _settings_env_keys()
+
+
+def _env_fingerprint() -> tuple:
+    """
+    Snapshot the environment variables that feed Settings.
+
+    Matching is case-insensitive, like pydantic-settings itself.
+
+    Returns:
+        Sorted tuple of (name, value) pairs, usable as a cache key
+    """
+    return tuple(sorted(
+        (key, value) for key, value in os.environ.items()
+        if key.upper() in _SETTINGS_ENV_KEYS
+    ))
+
+
+@lru_cache(maxsize=4)
+def _build_settings(fingerprint: tuple) -> Settings:
+    """Validate a Settings instance for the given environment fingerprint."""
+    return Settings()
+
 
-    @model_validator(mode="after")
-    def resolve_secrets(self) -> "Settings":
-        """Resolve file: and env: secret references for sensitive fields."""
-        if self.redis.password:
-            self.redis.password = resolve_secret(self.redis.password)
-        if self.oauth2.client_secret:
-            self.oauth2.client_secret = resolve_secret(self.oauth2.client_secret)
-        if self.outlook_oauth2.client_secret:
-            self.outlook_oauth2.client_secret = resolve_secret(self.outlook_oauth2.client_secret)
-        return self
+def get_settings() -> Settings:
+    """
+    Return the process-wide Settings instance.
 
+    The .env file is loaded once, on first call. Instances are cached by a
+    fingerprint of the relevant environment variables, so repeated calls
+    return the same object while a changed variable (tests, --auth-setup)
+    triggers exactly one rebuild.
 
-# Singleton instance - import this in other modules
-settings = Settings()
+    Returns:
+        Cached Settings instance
+    """
+    _load_env_once()
+    return _build_settings(_env_fingerprint())
@@ -7,15 +7,12 @@ Integrated with Phase 4: shutdown manager, circuit breaker, health checks, corre
 """
 import sys
 import time
+import logging
 import argparse
-from typing import Optional, Union
-from datetime import datetime, timezone
-
-from config.settings import settings
-from src.auth.oauth2_gmail import create_oauth2_from_config
-from src.auth.oauth2_outlook import create_outlook_oauth2_from_config
-from src.imap.imap_client import create_imap_client_from_config, GmailIMAPClient
-from src.imap.outlook_imap_client import create_outlook_imap_client_from_config, OutlookIMAPClient
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple, Union, TYPE_CHECKING
+
+from config.settings import get_settings
 from src.producer.state_manager import ProducerStateManager
 from src.common.redis_client import create_redis_client_from_config
 from src.common.logging_config import setup_logging
@@ -28,21 +25,87 @@ from src.common.exceptions import (
 from src.common.shutdown import ShutdownManager
 from src.common.correlation import CorrelationContext, set_component
 from src.common.circuit_breaker import CircuitBreakers, CircuitBreakerError
-from src.common.health import HealthServer, HealthRegistry, HealthCheck
 from src.common.batch import BatchProducer
-from src.worker.recovery import ConnectionWatchdog
-from src.monitoring.metrics import (
-    get_metrics_collector,
-    start_metrics_server,
-    BackgroundMetricsUpdater,
-)
 
-SUPPORTED_PROVIDERS = ("gmail", "outlook")
+if TYPE_CHECKING:
+    from config.settings import Settings
+    from src.imap.imap_client import EmailMessage, GmailIMAPClient
+    from src.imap.outlook_imap_client import OutlookIMAPClient
+
+# How often an IMAP IDLE wait checks for shutdown
+IDLE_STOP_CHECK_SECONDS = 1.0
+
+# Max quiet time on the IMAP connection during a non-IDLE sleep before a NOOP
+KEEPALIVE_SECONDS = 300
+
+# Handlers and the component tag are configured in main(), so importing
+# this module (or running --help) does not build the JSON logging stack
+logger = logging.getLogger(__name__)
+
+
+# Provider SDK factories. Each run uses a single provider, so the Google /
+# MSAL / IMAP client modules are only imported when their factory is called.
 
-logger = setup_logging(__name__, level=settings.logging.level)
+def create_oauth2_from_config(config):
+    """Create the Gmail OAuth2 manager (imports google-auth on first use)."""
+    from src.auth.oauth2_gmail import create_oauth2_from_config as factory
+    return factory(config)
 
-# Set component name for logging
-set_component("producer")
+
+def create_outlook_oauth2_from_config(config):
+    """Create the Outlook OAuth2 manager (imports MSAL on first use)."""
+    from src.auth.oauth2_outlook import create_outlook_oauth2_from_config as factory
+    return factory(config)
+
+
+def create_imap_client_from_config(config, oauth2):
+    """Create the Gmail IMAP client (imports imapclient on first use)."""
+    from src.imap.imap_client import create_imap_client_from_config as factory
+    return factory(config, oauth2)
+
+
+def create_outlook_imap_client_from_config(config, oauth2):
+    """Create the Outlook IMAP client (imports imapclient on first use)."""
+    from src.imap.outlook_imap_client import (
+        create_outlook_imap_client_from_config as factory,
+    )
+    return factory(config, oauth2)
+
+
+class ProviderSpec(NamedTuple):
+    """Factories and settings section for one email provider"""
+    oauth_factory: Callable[[Any], Any]
+    imap_factory: Callable[[Any, Any], Any]
+    settings_attr: str
+    not_configured_msg: str
+
+
+# Dispatch table resolved once per producer. Factories go through the
+# module-level names at call time so they stay patchable in tests.
+PROVIDER_TABLE = {
+    "gmail": ProviderSpec(
+        oauth_factory=lambda config: create_oauth2_from_config(config),
+        imap_factory=lambda config, oauth2: create_imap_client_from_config(config, oauth2),
+        settings_attr="oauth2",
+        not_configured_msg=(
+            "OAuth2 not configured. Set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET "
+            "in .env file. See docs/OAUTH2_SETUP.md for instructions."
+        ),
+    ),
+    "outlook": ProviderSpec(
+        oauth_factory=lambda config: create_outlook_oauth2_from_config(config),
+        imap_factory=lambda config, oauth2: create_outlook_imap_client_from_config(
+            config, oauth2
+        ),
+        settings_attr="outlook_oauth2",
+        not_configured_msg=(
+            "Outlook OAuth2 not configured. Set MICROSOFT_CLIENT_ID "
+            "in .env file. See docs/OUTLOOK_OAUTH2_SETUP.md for instructions."
+        ),
+    ),
+}
+
+SUPPORTED_PROVIDERS = tuple(PROVIDER_TABLE)
 
 
 class EmailProducer:
@@ -55,6 +118,7 @@ class EmailProducer:
         batch_size: int = 50,
         poll_interval: int = 60,
         provider: str = "gmail",
+        settings: Optional["Settings"] = None,
     ):
         """
         Initialize email producer.
@@ -65,67 +129,92 @@ class EmailProducer:
             batch_size: Max emails to fetch per poll
             poll_interval: Seconds between polls
             provider: Email provider ('gmail' or 'outlook')
+            settings: Application settings (loaded with get_settings() if None)
         """
+        if settings is None:
+            settings = get_settings()
+        self.settings = settings
         self.username = username
         self.mailbox = mailbox
         self.batch_size = batch_size
         self.poll_interval = poll_interval
         self.provider = provider.lower()
 
-        if self.provider not in SUPPORTED_PROVIDERS:
+        spec = PROVIDER_TABLE.get(self.provider)
+        if spec is None:
             raise ValueError(
                 f"Unsupported email provider '{self.provider}'. "
                 f"Supported: {', '.join(SUPPORTED_PROVIDERS)}"
             )
 
         # Initialize components
-        logger.info(f"Initializing producer components (provider={self.provider})...")
+        logger.info("Initializing producer components (provider=%s)...", self.provider)
 
         self.redis_client = create_redis_client_from_config(settings)
         logger.info("✓ Redis client initialized")
 
         # Provider-specific OAuth2 initialization
-        if self.provider == "outlook":
-            if not settings.outlook_oauth2.is_configured:
-                raise OAuth2AuthenticationError(
-                    "Outlook OAuth2 not configured. Set MICROSOFT_CLIENT_ID "
-                    "in .env file. See docs/OUTLOOK_OAUTH2_SETUP.md for instructions."
-                )
-            self.oauth2 = create_outlook_oauth2_from_config(settings)
-        else:
-            if not settings.oauth2.is_configured:
-                raise OAuth2AuthenticationError(
-                    "OAuth2 not configured. Set GOOGLE_CLIENT_ID and GOOGLE_CLIENT_SECRET "
-                    "in .env file. See docs/OAUTH2_SETUP.md for instructions."
-                )
-            self.oauth2 = create_oauth2_from_config(settings)
-        logger.info(f"✓ OAuth2 manager initialized ({self.provider})")
-
-        self.imap_client: Optional[Union[GmailIMAPClient, OutlookIMAPClient]] = None
+        if not getattr(settings, spec.settings_attr).is_configured:
+            raise OAuth2AuthenticationError(spec.not_configured_msg)
+        self.oauth2 = spec.oauth_factory(settings)
+        self._imap_factory = spec.imap_factory
+        logger.info("✓ OAuth2 manager initialized (%s)", self.provider)
+
+        self.imap_client: Optional[Union["GmailIMAPClient", "OutlookIMAPClient"]] = None
+        self._backlog = False  # last poll hit batch_size; poll again without waiting
         self.state_manager = ProducerStateManager(self.redis_client, username)
         logger.info("✓ State manager initialized")
 
+        # Static config, bound once instead of walking the settings tree later
         self.stream_name = settings.redis.stream_name
         self.max_stream_length = settings.redis.max_stream_length
+        self.dlq_stream_name = settings.dlq.stream_name
+        self.health_port = settings.monitoring.producer_health_port
+        self.metrics_port = settings.monitoring.producer_metrics_port
+        self.fetch_chunk_size = settings.imap.fetch_chunk_size
+
+        # Fetches the next UID chunk from IMAP while the current one is
+        # pushed to Redis; created on the first multi-chunk poll
+        self._prefetch: Optional[ThreadPoolExecutor] = None
+
+        # Reused for every poll; each fetched chunk is sent in one flush
+        self.batch = BatchProducer(
+            redis_client=self.redis_client,
+            stream_name=self.stream_name,
+            batch_size=self.batch_size,
+            maxlen=self.max_stream_length,
+            auto_flush=False
+        )
 
         # Circuit breakers
         self.redis_cb = CircuitBreakers.get(
             "redis",
             failure_threshold=settings.circuit_breaker.failure_threshold,
             recovery_timeout=settings.circuit_breaker.recovery_timeout_seconds,
-            success_threshold=settings.circuit_breaker.success_threshold
+            success_threshold=settings.circuit_breaker.success_threshold,
+            failure_window=settings.circuit_breaker.failure_window_seconds
         )
         self.imap_cb = CircuitBreakers.get(
             "imap",
             failure_threshold=settings.circuit_breaker.failure_threshold,
             recovery_timeout=settings.circuit_breaker.recovery_timeout_seconds,
-            success_threshold=settings.circuit_breaker.success_threshold
+            success_threshold=settings.circuit_breaker.success_threshold,
+            failure_window=settings.circuit_breaker.failure_window_seconds
         )
 
         # Shutdown manager
         self.shutdown = ShutdownManager()
 
-        logger.info(f"Producer initialized for {username}/{mailbox}")
+        # Poll failure handlers, looked up along the exception's MRO
+        self._poll_error_handlers = {
+            IMAPConnectionError: self._on_imap_error,
+            StateManagementError: self._on_state_error,
+            RedisConnectionError: self._on_redis_error,
+            CircuitBreakerError: self._on_circuit_breaker_error,
+            Exception: self._on_unexpected_error,
+        }
+
+        logger.info("Producer initialized for %s/%s", username, mailbox)
 
     def verify_connectivity(self):
         """Verify Redis and OAuth2 connectivity before starting"""
@@ -154,14 +243,7 @@ class EmailProducer:
         """
         # Connect IMAP if needed (provider-aware)
         if not self.imap_client:
-            if self.provider == "outlook":
-                self.imap_client = create_outlook_imap_client_from_config(
-                    settings, self.oauth2
-                )
-            else:
-                self.imap_client = create_imap_client_from_config(
-                    settings, self.oauth2
-                )
+            self.imap_client = self._imap_factory(self.settings, self.oauth2)
             self.imap_client.connect()
 
         # Select mailbox and get UIDVALIDITY
@@ -170,66 +252,147 @@ class EmailProducer:
         # Check for UIDVALIDITY change
         if self.state_manager.check_uidvalidity_change(self.mailbox, current_uidvalidity):
             logger.warning(
-                f"UIDVALIDITY changed for {self.mailbox}! "
-                "Mailbox was reset. Starting from beginning."
+                "UIDVALIDITY changed for %s! "
+                "Mailbox was reset. Starting from beginning.",
+                self.mailbox
             )
             self.state_manager.reset_mailbox_state(self.mailbox)
 
         # Get last processed UID
         last_uid = self.state_manager.get_last_uid(self.mailbox)
-        logger.info(f"Mailbox: {self.mailbox}, UIDVALIDITY: {current_uidvalidity}, Last UID: {last_uid}, Total: {total_messages}")
+        logger.info(
+            "Mailbox: %s, UIDVALIDITY: %s, Last UID: %s, Total: %s",
+            self.mailbox, current_uidvalidity, last_uid, total_messages
+        )
 
         # Fetch new UIDs
         new_uids = self.imap_client.fetch_uids_since(last_uid, self.batch_size)
 
+        # A full page means more mail may be waiting beyond this batch
+        self._backlog = len(new_uids) >= self.batch_size
+
         if not new_uids:
             logger.debug("No new emails found")
             self.state_manager.update_last_poll_time(self.mailbox)
             return 0
 
-        # Fetch and parse messages
-        logger.info(f"Fetching {len(new_uids)} new emails...")
-        messages = self.imap_client.fetch_messages(new_uids)
+        # Fetch and push chunk by chunk (fetch_messages sends one UID FETCH per
+        # call, so chunking lives only here); while one chunk is pushed to
+        # Redis the next is fetched from IMAP on the prefetch thread (separate
+        # sockets)
+        logger.info("Fetching %s new emails...", len(new_uids))
+        step = self.fetch_chunk_size
+        chunks = [new_uids[i:i + step] for i in range(0, len(new_uids), step)]
+
+        total_pushed = 0
+        messages = self.imap_client.fetch_messages(chunks[0])
+        for index in range(len(chunks)):
+            pending: Optional[Future] = None
+            if index + 1 < len(chunks):
+                if self._prefetch is None:
+                    self._prefetch = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="imap-prefetch"
+                    )
+                pending = self._prefetch.submit(
+                    self.imap_client.fetch_messages, chunks[index + 1]
+                )
 
+            try:
+                pushed_count, complete = self._push_messages(
+                    messages, current_uidvalidity
+                )
+            finally:
+                # The IMAP connection must be idle again before it is reused
+                # or dropped by an error handler
+                if pending is not None:
+                    wait([pending])
+            total_pushed += pushed_count
+
+            if not complete:
+                self._backlog = False  # don't hot-loop on a failing push
+                break
+            if pending is not None:
+                messages = pending.result()
+
+        return total_pushed
+
+    def _push_messages(
+        self,
+        messages: List["EmailMessage"],
+        current_uidvalidity: int
+    ) -> Tuple[int, bool]:
+        """
+        Push one chunk of fetched messages and advance the stored state.
+
+        Args:
+            messages: Parsed messages, in UID order
+            current_uidvalidity: UIDVALIDITY the messages were fetched under
+
+        Returns:
+            Tuple of (emails pushed within the committed prefix, whether the
+            whole chunk was handled)
+
+        Raises:
+            StateManagementError: If the state update fails
+        """
         # Push to Redis Stream using batch pipeline
-        batch = BatchProducer(
-            redis_client=self.redis_client,
-            stream_name=self.stream_name,
-            batch_size=len(messages),  # flush all at once
-            maxlen=self.max_stream_length
-        )
+        batch = self.batch
+        batch.reset()  # auto_flush is off; the chunk is sent once below
 
+        # A message that cannot be serialized never will be, so it is skipped
+        # for good (logged) rather than blocking every later UID forever
+        queued: List[bool] = []
         for message in messages:
             try:
-                payload = message.to_json()
-                batch.add({'payload': payload})
+                batch.add_raw(message.to_json_bytes())
+                queued.append(True)
             except Exception as e:
-                logger.error(f"Failed to serialize email UID {message.uid}: {e}")
+                logger.error(
+                    "Skipping email UID %s, failed to serialize: %s", message.uid, e
+                )
+                queued.append(False)
 
         try:
-            msg_ids = batch.flush()
-            pushed_count = len(msg_ids)
-            logger.debug(f"Batch pushed {pushed_count} emails to stream")
+            outcomes = iter(batch.flush_each())
         except Exception as e:
-            logger.error(f"Batch flush failed: {e}")
-            pushed_count = 0
-
-        # Update state atomically with last successfully pushed UID
-        if pushed_count > 0:
-            last_pushed_uid = messages[pushed_count - 1].uid
-            self.state_manager.atomic_update_state(
+            logger.error("Batch flush failed: %s", e)
+            outcomes = iter(())
+
+        # Advance state only across the unbroken run of handled messages. The
+        # first failed XADD ends it: that message and everything after it are
+        # fetched and pushed again on the next poll, so only the prefix counts
+        pushed_count = 0
+        last_uid = None
+        complete = True
+        for message, was_queued in zip(messages, queued):
+            if was_queued:
+                outcome = next(outcomes, None)
+                if outcome is None or isinstance(outcome, Exception):
+                    logger.error(
+                        "Failed to push email UID %s: %s",
+                        message.uid, outcome or "no reply"
+                    )
+                    complete = False
+                    break
+                pushed_count += 1
+            last_uid = message.uid
+        logger.debug("Batch pushed %s emails to stream", pushed_count)
+
+        if last_uid is not None:
+            self.state_manager.update_and_increment(
                 self.mailbox,
                 current_uidvalidity,
-                last_pushed_uid
+                last_uid,
+                pushed_count
             )
-            self.state_manager.increment_email_count(self.mailbox, pushed_count)
 
             logger.info(
-                f"✓ Successfully processed {pushed_count}/{len(messages)} emails. "
-                f"Last UID: {last_pushed_uid}"
+                "✓ Successfully processed %s/%s emails. "
+                "Last UID: %s",
+                pushed_count, len(messages), last_uid
             )
 
-        return pushed_count
+        return pushed_count, complete
 
     def run(self, dry_run: bool = False):
         """
@@ -239,23 +402,34 @@ class EmailProducer:
             dry_run: If True, fetch emails but don't push to Redis
         """
         logger.info("=" * 60)
-        logger.info(f"Email Producer Starting")
-        logger.info(f"Provider: {self.provider}")
-        logger.info(f"Username: {self.username}")
-        logger.info(f"Mailbox: {self.mailbox}")
-        logger.info(f"Poll interval: {self.poll_interval}s")
-        logger.info(f"Batch size: {self.batch_size}")
-        logger.info(f"Stream: {self.stream_name}")
-        logger.info(f"Dry run: {dry_run}")
+        logger.info("Email Producer Starting")
+        logger.info("Provider: %s", self.provider)
+        logger.info("Username: %s", self.username)
+        logger.info("Mailbox: %s", self.mailbox)
+        logger.info("Poll interval: %ss", self.poll_interval)
+        logger.info("Batch size: %s", self.batch_size)
+        logger.info("Stream: %s", self.stream_name)
+        logger.info("Dry run: %s", dry_run)
         logger.info("=" * 60)
 
+        # Monitoring stack is only needed by the main loop, not by
+        # --auth-setup or import-time callers
+        from src.common.health import HealthServer, HealthRegistry, HealthCheck
+        from src.worker.recovery import ConnectionWatchdog
+        from src.monitoring.metrics import (
+            get_metrics_collector,
+            start_metrics_server,
+            BackgroundMetricsUpdater,
+        )
+        from src.common.scheduler import PeriodicScheduler
+
         try:
             # Verify connectivity
             self.verify_connectivity()
 
             # Get initial state
             state = self.state_manager.get_state_summary(self.mailbox)
-            logger.info(f"Initial state: {state}")
+            logger.info("Initial state: %s", state)
 
             # Setup health checks
             health_registry = HealthRegistry("producer")
@@ -268,24 +442,31 @@ class EmailProducer:
             )
             health_server = HealthServer(
                 health_registry,
-                port=settings.monitoring.producer_health_port
+                port=self.health_port
             )
             health_server.start()
 
             # Setup Prometheus metrics server
-            start_metrics_server(port=settings.monitoring.producer_metrics_port)
+            start_metrics_server(port=self.metrics_port)
+            self._metrics = get_metrics_collector()
             metrics_updater = BackgroundMetricsUpdater(
-                collector=get_metrics_collector(),
+                collector=self._metrics,
                 redis_client=self.redis_client,
                 stream_name=self.stream_name,
-                dlq_stream_name=settings.dlq.stream_name,
+                dlq_stream_name=self.dlq_stream_name,
             )
-            metrics_updater.start()
 
             # Setup connection watchdog
             watchdog = ConnectionWatchdog(check_interval=30)
             watchdog.add_check("redis", lambda: self.redis_client.ping())
-            watchdog.start()
+
+            # Both periodic tasks share one scheduler thread
+            scheduler = PeriodicScheduler(name="producer-scheduler")
+            scheduler.add_job(
+                "metrics_updater", metrics_updater.tick, metrics_updater.interval
+            )
+            scheduler.add_job("watchdog", watchdog.tick, watchdog.check_interval)
+            scheduler.start()
 
             # Register shutdown callbacks
             self.shutdown.register(
@@ -297,12 +478,8 @@ class EmailProducer:
                 priority=5, name="health_server"
             )
             self.shutdown.register(
-                lambda: watchdog.stop(),
-                priority=5, name="watchdog"
-            )
-            self.shutdown.register(
-                lambda: metrics_updater.stop(),
-                priority=5, name="metrics_updater"
+                lambda: scheduler.stop(),
+                priority=5, name="scheduler"
             )
             self.shutdown.register(
                 lambda: self.cleanup(),
@@ -318,97 +495,191 @@ class EmailProducer:
 
                 # Each poll gets a unique correlation ID for tracing
                 with CorrelationContext() as ctx:
-                    logger.info(
-                        f"--- Poll #{poll_count} at "
-                        f"{datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')} ---"
-                    )
+                    # The JSON formatter already stamps every record
+                    logger.info("--- Poll #%d ---", poll_count)
 
                     try:
-                        if dry_run:
-                            logger.info("DRY RUN: Would fetch and push emails")
-                            time.sleep(self.poll_interval)
+                        count = self._do_poll(dry_run)
+                    except Exception as e:
+                        self._handle_poll_error(e)
+                    else:
+                        if count is None:
+                            # Poll skipped; _do_poll already waited
                             continue
-
-                        # Check circuit breakers before operations
-                        if self.redis_cb.is_open:
-                            logger.warning(
-                                "Redis circuit breaker open, skipping poll"
+                        total_processed += count
+                        if count > 0:
+                            logger.info(
+                                "Processed %s emails "
+                                "(total: %s)",
+                                count, total_processed
                             )
-                            time.sleep(5)
+                        if self._backlog:
+                            # Drain the backlog in full batches before waiting
                             continue
 
-                        if self.imap_cb.is_open:
-                            logger.warning(
-                                "IMAP circuit breaker open, skipping poll"
-                            )
-                            time.sleep(5)
-                            continue
+                self._wait_for_next_poll()
 
-                        # Fetch and push emails
-                        poll_start = time.time()
-                        count = self.fetch_and_push_emails()
-                        total_processed += count
+        except KeyboardInterrupt:
+            logger.info("Interrupted by user")
 
-                        # Record metrics
-                        metrics = get_metrics_collector()
-                        metrics.observe_poll_duration(time.time() - poll_start)
-                        metrics.inc_imap_polls()
-                        if count > 0:
-                            metrics.inc_produced(count)
+        finally:
+            self.cleanup()
 
-                        # Record success on circuit breakers
-                        self.redis_cb.record_success()
-                        self.imap_cb.record_success()
+        logger.info("Producer stopped. Total emails processed: %s", total_processed)
 
-                        if count > 0:
-                            logger.info(
-                                f"Processed {count} emails "
-                                f"(total: {total_processed})"
-                            )
+    def _do_poll(self, dry_run: bool = False) -> Optional[int]:
+        """
+        Run a single poll: check circuit breakers, fetch and push, record metrics.
 
-                    except IMAPConnectionError as e:
-                        logger.error(f"IMAP error: {e}. Reconnecting on next poll...")
-                        self.imap_cb.record_failure(e)
-                        if self.imap_client:
-                            self.imap_client.disconnect()
-                            self.imap_client = None
+        Args:
+            dry_run: If True, skip fetching and just wait for the poll interval
 
-                    except StateManagementError as e:
-                        logger.error(f"State management error: {e}")
+        Returns:
+            Number of emails pushed, or None if the poll was skipped
+            (the skip path already waited before returning)
 
-                    except RedisConnectionError as e:
-                        logger.error(f"Redis error: {e}. Will retry...")
-                        self.redis_cb.record_failure(e)
+        Raises:
+            Any exception from fetch_and_push_emails; see _handle_poll_error
+        """
+        if dry_run:
+            logger.info("DRY RUN: Would fetch and push emails")
+            self.shutdown.wait_for_shutdown(timeout=self.poll_interval)
+            return None
+
+        # Check circuit breakers before operations
+        if self.redis_cb.is_open:
+            logger.warning("Redis circuit breaker open, skipping poll")
+            self.shutdown.wait_for_shutdown(timeout=5)
+            return None
+
+        if self.imap_cb.is_open:
+            logger.warning("IMAP circuit breaker open, skipping poll")
+            self.shutdown.wait_for_shutdown(timeout=5)
+            return None
+
+        # Fetch and push emails
+        poll_start_ns = time.monotonic_ns()
+        count = self.fetch_and_push_emails()
+
+        # Record metrics
+        self._metrics.observe_poll_duration(
+            (time.monotonic_ns() - poll_start_ns) / 1e9
+        )
+        self._metrics.inc_imap_polls()
+        if count > 0:
+            self._metrics.inc_produced(count)
 
-                    except CircuitBreakerError as e:
-                        logger.warning(f"Circuit breaker: {e}")
-                        time.sleep(e.retry_after)
+        # Record success on circuit breakers
+        self.redis_cb.record_success()
+        self.imap_cb.record_success()
 
-                    except Exception as e:
-                        logger.error(f"Unexpected error: {e}", exc_info=True)
+        return count
 
-                # Sleep until next poll (interruptible)
-                logger.debug(f"Sleeping for {self.poll_interval}s...")
-                for _ in range(self.poll_interval):
-                    if not self.shutdown.is_running:
-                        break
-                    time.sleep(1)
+    def _handle_poll_error(self, error: Exception) -> None:
+        """
+        Dispatch a poll failure to the handler for its exception type.
 
-        except KeyboardInterrupt:
-            logger.info("Interrupted by user")
+        Args:
+            error: Exception raised by _do_poll
+        """
+        for cls in type(error).__mro__:
+            handler = self._poll_error_handlers.get(cls)
+            if handler is not None:
+                handler(error)
+                return
+
+    def _on_imap_error(self, e: IMAPConnectionError) -> None:
+        """Drop the IMAP connection so the next poll reconnects"""
+        logger.error("IMAP error: %s. Reconnecting on next poll...", e)
+        self.imap_cb.record_failure(e)
+        if self.imap_client:
+            self.imap_client.disconnect()
+            self.imap_client = None
 
-        finally:
-            self.cleanup()
+    def _on_state_error(self, e: StateManagementError) -> None:
+        """Log a state failure; the next poll retries from stored state"""
+        logger.error("State management error: %s", e)
+
+    def _on_redis_error(self, e: RedisConnectionError) -> None:
+        """Count a Redis failure against its circuit breaker"""
+        logger.error("Redis error: %s. Will retry...", e)
+        self.redis_cb.record_failure(e)
 
-        logger.info(f"Producer stopped. Total emails processed: {total_processed}")
+    def _on_circuit_breaker_error(self, e: CircuitBreakerError) -> None:
+        """Back off until the open circuit may be retried"""
+        logger.warning("Circuit breaker: %s", e)
+        self.shutdown.wait_for_shutdown(timeout=e.retry_after)
+
+    def _on_unexpected_error(self, e: Exception) -> None:
+        """Log any other poll failure with its traceback"""
+        logger.error("Unexpected error: %s", e, exc_info=True)
+
+    def _wait_for_next_poll(self) -> None:
+        """
+        Wait until the next poll is due.
+
+        Uses IMAP IDLE when the server supports it: the next poll runs as soon
+        as new mail is announced, and at the latest after the poll interval.
+        The cap matters because IDLE only reports mail that arrives while
+        it is active: messages left behind by a failed or partial push, or
+        announced during the poll's own SEARCH/FETCH, get no EXISTS.
+        Otherwise sleeps for the poll interval. Both return early once
+        shutdown begins.
+        """
+        if self.imap_client and self.imap_client.supports_idle():
+            idle_timeout = min(self.poll_interval, self.imap_client.IDLE_MAX_SECONDS)
+            logger.debug("Waiting in IMAP IDLE for up to %ss...", idle_timeout)
+            try:
+                self.imap_client.idle_wait(
+                    idle_timeout,
+                    should_stop=lambda: not self.shutdown.is_running,
+                    check_interval=IDLE_STOP_CHECK_SECONDS
+                )
+                return
+            except IMAPConnectionError as e:
+                logger.warning("%s. Reconnecting on next poll...", e)
+                self.imap_client.disconnect()
+                self.imap_client = None
+                return
+
+        logger.debug("Sleeping for %ss...", self.poll_interval)
+        remaining = self.poll_interval
+        while remaining > 0:
+            step = min(remaining, KEEPALIVE_SECONDS)
+            if self.shutdown.wait_for_shutdown(timeout=step):
+                return
+            remaining -= step
+            if remaining > 0:
+                self._keepalive()
+
+    def _keepalive(self) -> None:
+        """
+        NOOP the IMAP connection during long sleeps so providers that drop
+        idle sessions don't force a full reconnect on the next poll.
+        The connection is only dropped (and lazily re-created) if NOOP fails.
+        """
+        if not self.imap_client:
+            return
+        try:
+            self.imap_client.noop()
+        except IMAPConnectionError as e:
+            logger.warning("%s. Reconnecting on next poll...", e)
+            self.imap_client.disconnect()
+            self.imap_client = None
 
     def cleanup(self):
         """Clean up resources"""
         logger.info("Cleaning up resources...")
 
+        if self._prefetch is not None:
+            self._prefetch.shutdown(wait=True)
+
         if self.imap_client:
             self.imap_client.disconnect()
 
+        # Persist token refreshes kept in memory by the OAuth2 manager
+        self.oauth2.close()
+
         if self.redis_client:
             self.redis_client.close()
 
@@ -424,7 +695,7 @@ def main():
     )
     parser.add_argument(
         "--provider",
-        choices=["gmail", "outlook"],
+        choices=SUPPORTED_PROVIDERS,
         help="Email provider (default: from EMAIL_PROVIDER env var or 'gmail')"
     )
     parser.add_argument(
@@ -441,7 +712,7 @@ def main():
     parser.add_argument(
         "--poll-interval",
         type=int,
-        help=f"Seconds between polls (default: {settings.imap.poll_interval_seconds})"
+        help="Seconds between polls (default: IMAP_POLL_INTERVAL_SECONDS or 60)"
     )
     parser.add_argument(
         "--dry-run",
@@ -456,35 +727,35 @@ def main():
 
     args = parser.parse_args()
 
+    # Loaded only after argument parsing, so --help works without a valid env
+    settings = get_settings()
+    setup_logging(__name__, level=settings.logging.level)
+    set_component("producer")
+
     # Determine provider
-    provider = args.provider or settings.email_provider
+    provider = (args.provider or settings.email_provider).lower()
 
     # OAuth2 setup mode
     if args.auth_setup:
-        logger.info(f"Running OAuth2 setup for provider '{provider}'...")
+        logger.info("Running OAuth2 setup for provider '%s'...", provider)
         try:
-            if provider == "outlook":
-                if not settings.outlook_oauth2.is_configured:
-                    logger.error(
-                        "Outlook OAuth2 not configured. Set MICROSOFT_CLIENT_ID "
-                        "in .env file. See docs/OUTLOOK_OAUTH2_SETUP.md."
-                    )
-                    return 1
-                oauth = create_outlook_oauth2_from_config(settings)
-            else:
-                if not settings.oauth2.is_configured:
-                    logger.error(
-                        "OAuth2 not configured. Set GOOGLE_CLIENT_ID and "
-                        "GOOGLE_CLIENT_SECRET in .env file."
-                    )
-                    return 1
-                oauth = create_oauth2_from_config(settings)
+            spec = PROVIDER_TABLE.get(provider)
+            if spec is None:
+                logger.error(
+                    "Unsupported email provider '%s'. Supported: %s",
+                    provider, ", ".join(SUPPORTED_PROVIDERS)
+                )
+                return 1
+            if not getattr(settings, spec.settings_attr).is_configured:
+                logger.error(spec.not_configured_msg)
+                return 1
+            oauth = spec.oauth_factory(settings)
             oauth.authenticate(force_reauth=True)
             logger.info("✓ OAuth2 setup complete!")
-            logger.info(f"Token saved to: {oauth.token_file}")
+            logger.info("Token saved to: %s", oauth.token_file)
             return 0
         except Exception as e:
-            logger.error(f"OAuth2 setup failed: {e}")
+            logger.error("OAuth2 setup failed: %s", e)
             return 1
 
     # Determine username
@@ -508,18 +779,19 @@ def main():
             batch_size=args.batch_size,
             poll_interval=args.poll_interval or settings.imap.poll_interval_seconds,
             provider=provider,
+            settings=settings,
         )
 
         producer.run(dry_run=args.dry_run)
         return 0
 
     except OAuth2AuthenticationError as e:
-        logger.error(f"OAuth2 authentication failed: {e}")
+        logger.error("OAuth2 authentication failed: %s", e)
         logger.error("Run with --auth-setup to authenticate")
         return 1
 
     except Exception as e:
-        logger.error(f"Producer failed: {e}", exc_info=True)
+        logger.error("Producer failed: %s", e, exc_info=True)
         return 1
 
 
@@ -10,6 +10,7 @@ Usage:
     python scripts/backup.py
     python scripts/backup.py --output-dir ./backups --retention-days 30
     python scripts/backup.py --redis-host 10.0.0.5 --redis-port 6380
+    python scripts/backup.py --redis-socket /var/run/redis/redis.sock
 """
 import os
 import sys
@@ -26,14 +27,41 @@ sys.path.insert(0, str(_project_root))
 
 from src.common.logging_config import get_logger
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 logger = get_logger(__name__)
 
+# Linux ioctl request that makes dest share src's extents (reflink)
+FICLONE = 0x40049409
+
+# LASTSAVE polling backoff: small RDBs finish within the first few checks,
+# large ones are still polled at a modest cadence.
+LASTSAVE_POLL_INITIAL_SECONDS = 0.02
+LASTSAVE_POLL_MAX_SECONDS = 0.5
+LASTSAVE_POLL_FACTOR = 1.5
+
 
-def _connect_redis(host: str, port: int, password: str | None, db: int):
+def _connect_redis(
+    host: str,
+    port: int,
+    password: str | None,
+    db: int,
+    unix_socket_path: str | None = None,
+):
     """
     Create a raw ``redis.Redis`` connection (no project wrapper needed).
+
+    Connects over *unix_socket_path* instead of TCP when given.
     """
     import redis
+    if unix_socket_path:
+        return redis.Redis(
+            unix_socket_path=unix_socket_path, password=password, db=db,
+            decode_responses=True, socket_connect_timeout=5,
+        )
     return redis.Redis(
         host=host, port=port, password=password, db=db,
         decode_responses=True, socket_connect_timeout=5,
@@ -44,6 +72,9 @@ def trigger_bgsave(client, timeout: int = 120) -> bool:
     """
     Issue ``BGSAVE`` and poll ``LASTSAVE`` until it changes.
 
+    Polls with exponential backoff (20 ms, growing 1.5x per check up to 500 ms)
+    so small saves are detected almost immediately.
+
     Args:
         client: redis.Redis instance
         timeout: Maximum seconds to wait for the save to finish
@@ -57,13 +88,18 @@ def trigger_bgsave(client, timeout: int = 120) -> bool:
     client.bgsave()
     logger.info("BGSAVE initiated – waiting for completion…")
 
-    deadline = time.time() + timeout
-    while time.time() < deadline:
+    deadline = time.monotonic() + timeout
+    delay = LASTSAVE_POLL_INITIAL_SECONDS
+    while True:
         current = client.lastsave()
         if current != last_save_before:
             logger.info(f"BGSAVE completed at {current}")
             return True
-        time.sleep(1)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(delay, remaining))
+        delay = min(delay * LASTSAVE_POLL_FACTOR, LASTSAVE_POLL_MAX_SECONDS)
 
     logger.error(f"BGSAVE did not complete within {timeout}s")
     return False
@@ -86,6 +122,56 @@ def locate_rdb_file(client) -> Path | None:
         return None
 
 
+def _reflink(src_fd: int, dest_fd: int) -> bool:
+    """
+    Clone *src_fd* into *dest_fd* with ``FICLONE``.
+
+    Returns:
+        True if the filesystem shared the extents (Btrfs, XFS with reflink),
+        False if cloning is unsupported here
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        fcntl.ioctl(dest_fd, FICLONE, src_fd)
+        return True
+    except OSError as exc:
+        logger.debug(f"FICLONE unavailable ({exc})")
+        return False
+
+
+def copy_file(src: Path, dest: Path, fsync: bool = False) -> None:
+    """
+    Copy *src* to *dest* without passing the data through user space.
+
+    Tries a metadata-only reflink (``FICLONE``) first, then
+    ``os.copy_file_range`` (Linux 4.5+), then copies metadata like
+    ``shutil.copy2``.  Falls back to ``shutil.copy2`` elsewhere, or when the
+    kernel rejects both (e.g. cross-filesystem on older kernels).
+
+    Args:
+        src: File to copy
+        dest: Destination path (overwritten)
+        fsync: Flush *dest* to disk before returning
+    """
+    try:
+        with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+            if not _reflink(fsrc.fileno(), fdst.fileno()):
+                if not hasattr(os, "copy_file_range"):
+                    raise OSError("copy_file_range not available")
+                while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30) > 0:
+                    pass
+    except OSError as exc:
+        logger.debug(f"In-kernel copy unavailable ({exc}); using shutil.copy2")
+        shutil.copy2(str(src), str(dest))
+    else:
+        shutil.copystat(str(src), str(dest))
+
+    if fsync:
+        with open(dest, "r+b") as f:
+            os.fsync(f.fileno())
+
+
 def copy_backup(rdb_path: Path, output_dir: Path) -> Path | None:
     """
     Copy the RDB file to ``output_dir`` with a timestamped name.
@@ -98,7 +184,7 @@ def copy_backup(rdb_path: Path, output_dir: Path) -> Path | None:
     dest = output_dir / f"redis_{ts}.rdb"
 
     try:
-        shutil.copy2(str(rdb_path), str(dest))
+        copy_file(rdb_path, dest)
         size_mb = dest.stat().st_size / (1024 * 1024)
         logger.info(f"Backup saved: {dest}  ({size_mb:.2f} MB)")
         return dest
@@ -107,30 +193,64 @@ def copy_backup(rdb_path: Path, output_dir: Path) -> Path | None:
         return None
 
 
-def prune_old_backups(output_dir: Path, retention_days: int) -> int:
+def scan_backups(output_dir: Path) -> list[tuple[Path, os.stat_result]]:
     """
-    Delete backup files older than *retention_days*.
+    Read backup files and their stat results in a single directory pass.
 
     Returns:
-        Number of files removed.
+        ``(path, stat)`` pairs sorted newest-first by file name.
+    """
+    if not output_dir.is_dir():
+        return []
+    with os.scandir(output_dir) as it:
+        backups = [
+            (Path(entry.path), entry.stat())
+            for entry in it
+            if entry.name.startswith("redis_") and entry.name.endswith(".rdb")
+            and entry.is_file()
+        ]
+    backups.sort(key=lambda item: item[0].name, reverse=True)
+    return backups
+
+
+def _prune(
+    backups: list[tuple[Path, os.stat_result]], retention_days: int
+) -> tuple[int, list[tuple[Path, os.stat_result]]]:
     """
-    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    Delete scanned backups older than *retention_days*.
+
+    Returns:
+        Number of files removed and the ``(path, stat)`` pairs kept.
+    """
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=retention_days)).timestamp()
     removed = 0
-    for f in sorted(output_dir.glob("redis_*.rdb")):
-        mtime = datetime.fromtimestamp(f.stat().st_mtime, tz=timezone.utc)
-        if mtime < cutoff:
-            f.unlink()
-            logger.info(f"Pruned old backup: {f.name}")
+    kept = []
+    for path, st in backups:
+        if st.st_mtime < cutoff:
+            path.unlink()
+            logger.info(f"Pruned old backup: {path.name}")
             removed += 1
+        else:
+            kept.append((path, st))
     if removed:
         logger.info(f"Pruned {removed} backup(s) older than {retention_days} days")
+    return removed, kept
+
+
+def prune_old_backups(output_dir: Path, retention_days: int) -> int:
+    """
+    Delete backup files older than *retention_days*.
+
+    Returns:
+        Number of files removed.
+    """
+    removed, _ = _prune(scan_backups(output_dir), retention_days)
     return removed
 
 
 def list_backups(output_dir: Path) -> list[Path]:
     """Return list of existing backup files sorted newest-first."""
-    backups = sorted(output_dir.glob("redis_*.rdb"), reverse=True)
-    return backups
+    return [path for path, _ in scan_backups(output_dir)]
 
 
 def run_backup(
@@ -141,6 +261,7 @@ def run_backup(
     output_dir: str = "backups",
     retention_days: int = 30,
     timeout: int = 120,
+    unix_socket_path: str | None = None,
 ) -> bool:
     """
     Full backup workflow: BGSAVE → copy → prune.
@@ -149,12 +270,12 @@ def run_backup(
         True on success
     """
     out = Path(output_dir)
-    client = _connect_redis(host, port, password, db)
+    client = _connect_redis(host, port, password, db, unix_socket_path)
 
     # Verify connection
     try:
         client.ping()
-        logger.info(f"Connected to Redis at {host}:{port}")
+        logger.info(f"Connected to Redis at {unix_socket_path or f'{host}:{port}'}")
     except Exception as exc:
         logger.error(f"Cannot connect to Redis: {exc}")
         return False
@@ -177,14 +298,11 @@ def run_backup(
     if dest is None:
         return False
 
-    # Prune old backups
-    prune_old_backups(out, retention_days)
-
-    # List current backups
-    backups = list_backups(out)
+    # Prune old backups and list the rest from the same directory scan
+    _, backups = _prune(scan_backups(out), retention_days)
     logger.info(f"Backups on disk: {len(backups)}")
-    for b in backups[:5]:
-        size = b.stat().st_size / (1024 * 1024)
+    for b, st in backups[:5]:
+        size = st.st_size / (1024 * 1024)
         logger.info(f"  {b.name}  ({size:.2f} MB)")
 
     return True
@@ -206,6 +324,10 @@ def main() -> int:
     parser.add_argument(
         "--redis-db", type=int, default=0, help="Redis database (default: 0)"
     )
+    parser.add_argument(
+        "--redis-socket", default=None,
+        help="Redis UNIX socket path (overrides host/port)"
+    )
     parser.add_argument(
         "--output-dir", default="backups",
         help="Directory to store backup files (default: backups/)"
@@ -226,15 +348,15 @@ def main() -> int:
     args = parser.parse_args()
 
     if args.list:
-        backups = list_backups(Path(args.output_dir))
+        backups = scan_backups(Path(args.output_dir))
         if not backups:
             print("No backups found.")
         else:
             print(f"{'File':<40} {'Size (MB)':>10} {'Date':<20}")
             print("-" * 72)
-            for b in backups:
-                size = b.stat().st_size / (1024 * 1024)
-                mtime = datetime.fromtimestamp(b.stat().st_mtime).strftime(
+            for b, st in backups:
+                size = st.st_size / (1024 * 1024)
+                mtime = datetime.fromtimestamp(st.st_mtime).strftime(
                     "%Y-%m-%d %H:%M:%S"
                 )
                 print(f"{b.name:<40} {size:>10.2f} {mtime:<20}")
@@ -248,6 +370,7 @@ def main() -> int:
         output_dir=args.output_dir,
         retention_days=args.retention_days,
         timeout=args.timeout,
+        unix_socket_path=args.redis_socket,
     )
     return 0 if ok else 1
 
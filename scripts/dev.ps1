@@ -151,7 +151,7 @@ from src.common.redis_client import RedisClient, create_redis_client_from_config
 from src.auth.oauth2_gmail import OAuth2Manager, create_oauth2_from_config
 from src.imap.imap_client import GmailIMAPClient, create_imap_client_from_config
 from src.producer.state_manager import ProducerStateManager
-from config.settings import settings
+from config.settings import get_settings
 
 print()
 print('═══════════════════════════════════════════════════════')
@@ -163,10 +163,10 @@ print('  • RedisClient, create_redis_client_from_config')
 print('  • OAuth2Manager, create_oauth2_from_config')
 print('  • GmailIMAPClient, create_imap_client_from_config')
 print('  • ProducerStateManager')
-print('  • settings (config)')
+print('  • get_settings (config)')
 print()
 print('Quick start:')
-print('  redis = create_redis_client_from_config(settings)')
+print('  redis = create_redis_client_from_config(get_settings())')
 print('  redis.ping()')
 print()
 "@
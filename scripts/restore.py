@@ -11,8 +11,8 @@ Usage:
     python scripts/restore.py --file backups/redis_20260217_120000.rdb --dry-run
 """
 import os
+import stat
 import sys
-import shutil
 import argparse
 from datetime import datetime
 from pathlib import Path
@@ -21,75 +21,129 @@ _project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(_project_root))
 
 from src.common.logging_config import get_logger
+from scripts.backup import copy_file, scan_backups
+
+try:
+    import redis
+except ImportError:  # only needed to talk to a live server
+    redis = None
 
 logger = get_logger(__name__)
 
 
 def list_backups(backup_dir: Path) -> list[Path]:
     """Return backup files sorted newest-first."""
-    backups = sorted(backup_dir.glob("redis_*.rdb"), reverse=True)
-    return backups
+    return [path for path, _ in scan_backups(backup_dir)]
 
 
 def print_backups(backup_dir: Path) -> None:
     """Pretty-print available backups."""
-    backups = list_backups(backup_dir)
+    backups = scan_backups(backup_dir)
     if not backups:
         print(f"No backups found in {backup_dir}")
         return
 
-    print(f"\nAvailable backups in {backup_dir}:\n")
-    print(f"  {'#':<4} {'File':<40} {'Size (MB)':>10} {'Date':<20}")
-    print(f"  {'-'*74}")
-    for i, b in enumerate(backups, 1):
-        size = b.stat().st_size / (1024 * 1024)
-        mtime = datetime.fromtimestamp(b.stat().st_mtime).strftime(
+    # Build the whole table and write it once instead of once per row
+    lines = [
+        f"\nAvailable backups in {backup_dir}:\n",
+        f"  {'#':<4} {'File':<40} {'Size (MB)':>10} {'Date':<20}",
+        f"  {'-'*74}",
+    ]
+    for i, (b, st) in enumerate(backups, 1):
+        size = st.st_size / (1024 * 1024)
+        mtime = datetime.fromtimestamp(st.st_mtime).strftime(
             "%Y-%m-%d %H:%M:%S"
         )
-        print(f"  {i:<4} {b.name:<40} {size:>10.2f} {mtime:<20}")
-    print()
+        lines.append(f"  {i:<4} {b.name:<40} {size:>10.2f} {mtime:<20}")
+    lines.append("")
+    print("\n".join(lines))
 
 
 def validate_backup_file(path: Path) -> bool:
     """Check that the backup file exists and has a reasonable size."""
-    if not path.exists():
-        logger.error(f"Backup file not found: {path}")
+    # One stat covers the existence, type and size checks
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        logger.error("Backup file not found: %s", path)
+        return False
+    except OSError as exc:
+        logger.error("Cannot access backup file %s: %s", path, exc)
         return False
-    if not path.is_file():
-        logger.error(f"Path is not a file: {path}")
+    if not stat.S_ISREG(st.st_mode):
+        logger.error("Path is not a file: %s", path)
         return False
-    size = path.stat().st_size
-    if size == 0:
-        logger.error(f"Backup file is empty: {path}")
+    if st.st_size == 0:
+        logger.error("Backup file is empty: %s", path)
         return False
     # RDB files start with "REDIS" magic bytes
     try:
-        with open(path, "rb") as f:
-            header = f.read(5)
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            header = os.read(fd, 5)
+        finally:
+            os.close(fd)
         if header != b"REDIS":
             logger.warning(
-                f"File does not appear to be a valid RDB dump "
-                f"(header: {header!r}).  Proceeding anyway."
+                "File does not appear to be a valid RDB dump "
+                "(header: %r).  Proceeding anyway.",
+                header
             )
     except Exception as exc:
-        logger.warning(f"Could not read file header: {exc}")
+        logger.warning("Could not read file header: %s", exc)
     return True
 
 
-def locate_redis_rdb(host: str, port: int, password: str | None, db: int) -> Path | None:
-    """Query Redis for the current RDB file location."""
-    try:
-        import redis
-        client = redis.Redis(
-            host=host, port=port, password=password, db=db,
+def _connect_redis(
+    host: str,
+    port: int,
+    password: str | None,
+    db: int,
+    unix_socket_path: str | None = None,
+):
+    """
+    Create a raw ``redis.Redis`` client.  No connection is opened until the
+    first command, so one client can serve every step of a restore.
+
+    Connects over *unix_socket_path* instead of TCP when given.
+    """
+    if redis is None:
+        raise RuntimeError("The redis package is required to talk to Redis")
+    if unix_socket_path:
+        return redis.Redis(
+            unix_socket_path=unix_socket_path, password=password, db=db,
             decode_responses=True, socket_connect_timeout=5,
         )
+    return redis.Redis(
+        host=host, port=port, password=password, db=db,
+        decode_responses=True, socket_connect_timeout=5,
+    )
+
+
+def locate_redis_rdb(
+    host: str,
+    port: int,
+    password: str | None,
+    db: int,
+    client=None,
+    unix_socket_path: str | None = None,
+) -> Path | None:
+    """
+    Query Redis for the current RDB file location.
+
+    Args:
+        client: Existing ``redis.Redis`` client to reuse (created if None)
+        unix_socket_path: UNIX socket to connect through when creating one
+    """
+    try:
+        if client is None:
+            client = _connect_redis(host, port, password, db, unix_socket_path)
         client.ping()
         rdb_dir = client.config_get("dir").get("dir", ".")  # type: ignore[union-attr]
         rdb_name = client.config_get("dbfilename").get("dbfilename", "dump.rdb")  # type: ignore[union-attr]
         return Path(rdb_dir) / rdb_name
     except Exception as exc:
-        logger.error(f"Could not query Redis for RDB path: {exc}")
+        logger.error("Could not query Redis for RDB path: %s", exc)
         return None
 
 
@@ -101,6 +155,7 @@ def restore_backup(
     db: int = 0,
     dry_run: bool = False,
     force: bool = False,
+    unix_socket_path: str | None = None,
 ) -> bool:
     """
     Restore a Redis backup.
@@ -117,6 +172,8 @@ def restore_backup(
         backup_file: Path to the .rdb backup
         dry_run: If True, only show what would be done
         force: If True, attempt automated restore (local Redis only)
+        unix_socket_path: Connect over this UNIX socket instead of TCP
+            (implies a local Redis)
 
     Returns:
         True if validations pass (or restore completed in force mode)
@@ -125,14 +182,20 @@ def restore_backup(
         return False
 
     size_mb = backup_file.stat().st_size / (1024 * 1024)
-    logger.info(f"Backup file: {backup_file}  ({size_mb:.2f} MB)")
+    logger.info("Backup file: %s  (%.2f MB)", backup_file, size_mb)
 
-    rdb_target = locate_redis_rdb(host, port, password, db)
+    # One client for the RDB lookup and, in force mode, the reload
+    try:
+        client = _connect_redis(host, port, password, db, unix_socket_path)
+    except Exception as exc:
+        logger.error("Could not create Redis client: %s", exc)
+        client = None
+    rdb_target = locate_redis_rdb(host, port, password, db, client=client)
 
     if dry_run:
         logger.info("[DRY RUN] Would restore backup – no changes made")
         if rdb_target:
-            logger.info(f"[DRY RUN] Target RDB path: {rdb_target}")
+            logger.info("[DRY RUN] Target RDB path: %s", rdb_target)
         _print_manual_instructions(backup_file, rdb_target, host, port)
         return True
 
@@ -145,7 +208,7 @@ def restore_backup(
         logger.error("Cannot determine RDB path – manual restore required")
         return False
 
-    if host not in ("localhost", "127.0.0.1"):
+    if not unix_socket_path and host not in ("localhost", "127.0.0.1"):
         logger.error(
             "Automated restore only supported for local Redis.  "
             "Use manual steps for remote hosts."
@@ -155,18 +218,13 @@ def restore_backup(
     logger.warning("⚠  Force mode: replacing RDB and reloading Redis…")
 
     try:
-        import redis as _redis
-        client = _redis.Redis(
-            host=host, port=port, password=password, db=db,
-            decode_responses=True,
-        )
-
         # Shutdown save first
         client.config_set("save", "")
 
-        # Copy backup over current RDB
-        shutil.copy2(str(backup_file), str(rdb_target))
-        logger.info(f"Copied {backup_file.name} → {rdb_target}")
+        # Copy backup over current RDB (reflink / in-kernel where possible),
+        # durable on disk before Redis reads it back
+        copy_file(backup_file, rdb_target, fsync=True)
+        logger.info("Copied %s → %s", backup_file.name, rdb_target)
 
         # Reload
         client.execute_command("DEBUG", "RELOAD")
@@ -177,7 +235,7 @@ def restore_backup(
         return True
 
     except Exception as exc:
-        logger.error(f"Automated restore failed: {exc}")
+        logger.error("Automated restore failed: %s", exc)
         logger.info("Attempting manual restore instructions instead:")
         _print_manual_instructions(backup_file, rdb_target, host, port)
         return False
@@ -249,6 +307,10 @@ def main() -> int:
     parser.add_argument(
         "--redis-db", type=int, default=0, help="Redis database"
     )
+    parser.add_argument(
+        "--redis-socket", default=None,
+        help="Redis UNIX socket path (overrides host/port)"
+    )
 
     args = parser.parse_args()
 
@@ -269,6 +331,7 @@ def main() -> int:
         db=args.redis_db,
         dry_run=args.dry_run,
         force=args.force,
+        unix_socket_path=args.redis_socket,
     )
     return 0 if ok else 1
 
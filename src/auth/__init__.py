@@ -1,6 +1,14 @@
 """Authentication package"""
-from src.auth.oauth2_gmail import OAuth2Gmail, create_oauth2_from_config
-from src.auth.oauth2_outlook import OAuth2Outlook, create_outlook_oauth2_from_config
+import importlib
+
+# Provider SDKs (google-auth, MSAL) are heavy; load a provider's module only
+# when one of its names is first accessed.
+_LAZY_EXPORTS = {
+    "OAuth2Gmail": "src.auth.oauth2_gmail",
+    "create_oauth2_from_config": "src.auth.oauth2_gmail",
+    "OAuth2Outlook": "src.auth.oauth2_outlook",
+    "create_outlook_oauth2_from_config": "src.auth.oauth2_outlook",
+}
 
 __all__ = [
     "OAuth2Gmail",
@@ -8,3 +16,10 @@ __all__ = [
     "OAuth2Outlook",
     "create_outlook_oauth2_from_config",
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
@@ -6,9 +6,12 @@ import os
 import json
 import base64
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import ClassVar, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta, timezone
 
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
@@ -22,6 +25,9 @@ logger = get_logger(__name__)
 # Gmail IMAP requires this scope
 SCOPES = ['https://mail.google.com/']
 
+# A cached XOAUTH2 string is reused until its token is this close to expiry
+XOAUTH2_CACHE_MARGIN = timedelta(minutes=5)
+
 
 class OAuth2Gmail:
     """
@@ -29,6 +35,10 @@ class OAuth2Gmail:
     Handles the full OAuth2 flow including token storage and refresh.
     """
 
+    # HTTP session shared by every instance for token refresh and revocation,
+    # so Google's token endpoints reuse pooled TLS connections
+    _http_session: ClassVar[Optional[requests.Session]] = None
+
     def __init__(
         self,
         client_id: str,
@@ -50,11 +60,22 @@ class OAuth2Gmail:
         self.token_file = Path(token_file)
         self.redirect_uri = redirect_uri
         self.credentials: Optional[Credentials] = None
+        # (username, access token, encoded XOAUTH2 string) of the last IMAP login
+        self._xoauth2_cache: Optional[Tuple[str, str, str]] = None
 
         # Ensure token directory exists
         self.token_file.parent.mkdir(parents=True, exist_ok=True)
 
-        logger.info(f"OAuth2 manager initialized, token file: {self.token_file}")
+        logger.info("OAuth2 manager initialized, token file: %s", self.token_file)
+
+    @classmethod
+    def _session(cls) -> requests.Session:
+        """Return the shared HTTP session, creating it on first use."""
+        if cls._http_session is None:
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+            cls._http_session = session
+        return cls._http_session
 
     def load_credentials(self) -> bool:
         """
@@ -63,10 +84,7 @@ class OAuth2Gmail:
         Returns:
             True if credentials loaded successfully, False otherwise
         """
-        if not self.token_file.exists():
-            logger.info("Token file not found, need to authenticate")
-            return False
-
+        # Opening the file is the existence check; no separate stat()
         try:
             self.credentials = Credentials.from_authorized_user_file(
                 str(self.token_file),
@@ -74,8 +92,11 @@ class OAuth2Gmail:
             )
             logger.info("Credentials loaded from token file")
             return True
+        except FileNotFoundError:
+            logger.info("Token file not found, need to authenticate")
+            return False
         except Exception as e:
-            logger.error(f"Failed to load credentials: {e}")
+            logger.error("Failed to load credentials: %s", e)
             return False
 
     def save_credentials(self):
@@ -95,12 +116,18 @@ class OAuth2Gmail:
                 'expiry': self.credentials.expiry.isoformat() if self.credentials.expiry else None
             }
 
-            with open(self.token_file, 'w') as f:
-                json.dump(creds_data, f, indent=2)
+            # Write a sibling temp file and rename it over the token file, so
+            # a crash mid-write never leaves a truncated token behind
+            tmp_file = self.token_file.with_name(self.token_file.name + ".tmp")
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(creds_data, option=orjson.OPT_INDENT_2))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.token_file)
 
-            logger.info(f"Credentials saved to {self.token_file}")
+            logger.info("Credentials saved to %s", self.token_file)
         except Exception as e:
-            logger.error(f"Failed to save credentials: {e}")
+            logger.error("Failed to save credentials: %s", e)
             raise OAuth2AuthenticationError(f"Failed to save credentials: {e}")
 
     def authenticate(self, force_reauth: bool = False) -> Credentials:
@@ -117,6 +144,11 @@ class OAuth2Gmail:
         Raises:
             OAuth2AuthenticationError: If authentication fails
         """
+        # Credentials already in memory need no token file read
+        if not force_reauth and self.credentials is not None and self.credentials.valid:
+            logger.debug("Using in-memory credentials")
+            return self.credentials
+
         # Load existing credentials if not forcing reauth
         if not force_reauth and self.load_credentials():
             # Check if credentials are valid
@@ -128,12 +160,12 @@ class OAuth2Gmail:
             if self.credentials and self.credentials.expired and self.credentials.refresh_token:
                 logger.info("Token expired, refreshing...")
                 try:
-                    self.credentials.refresh(Request())
+                    self.credentials.refresh(Request(self._session()))
                     self.save_credentials()
                     logger.info("Token refreshed successfully")
                     return self.credentials
                 except RefreshError as e:
-                    logger.error(f"Token refresh failed: {e}")
+                    logger.error("Token refresh failed: %s", e)
                     # Fall through to reauth flow
 
         # Need new authentication
@@ -180,7 +212,7 @@ class OAuth2Gmail:
             return self.credentials
 
         except Exception as e:
-            logger.error(f"OAuth2 flow failed: {e}")
+            logger.error("OAuth2 flow failed: %s", e)
             raise OAuth2AuthenticationError(f"OAuth2 authentication failed: {e}")
 
     def get_access_token(self) -> str:
@@ -200,10 +232,10 @@ class OAuth2Gmail:
         if self.credentials.expired and self.credentials.refresh_token:
             try:
                 logger.info("Access token expired, refreshing...")
-                self.credentials.refresh(Request())
+                self.credentials.refresh(Request(self._session()))
                 self.save_credentials()
             except RefreshError as e:
-                logger.error(f"Token refresh failed: {e}")
+                logger.error("Token refresh failed: %s", e)
                 raise TokenRefreshError(f"Failed to refresh token: {e}")
 
         if not self.credentials or not self.credentials.token:
@@ -223,11 +255,31 @@ class OAuth2Gmail:
 
         Example output format:
             user=username@gmail.com\x01auth=Bearer ya29.xxx\x01\x01
+
+        The encoded string is cached and reused on reconnects while the same
+        token stays more than 5 minutes from expiry.
         """
+        cached = self._xoauth2_cache
+        credentials = self.credentials
+        if (
+            cached is not None
+            and credentials is not None
+            and cached[0] == username
+            and cached[1] == credentials.token
+            and (
+                credentials.expiry is None
+                or credentials.expiry.replace(tzinfo=timezone.utc)
+                > datetime.now(timezone.utc) + XOAUTH2_CACHE_MARGIN
+            )
+        ):
+            return cached[2]
+
         access_token = self.get_access_token()
 
         auth_string = f"user={username}\x01auth=Bearer {access_token}\x01\x01"
-        return base64.b64encode(auth_string.encode()).decode()
+        encoded = base64.b64encode(auth_string.encode()).decode()
+        self._xoauth2_cache = (username, access_token, encoded)
+        return encoded
 
     def is_token_valid(self) -> bool:
         """
@@ -251,6 +303,9 @@ class OAuth2Gmail:
 
         return True
 
+    def close(self):
+        """Nothing to write back: credentials are saved whenever they change."""
+
     def revoke_token(self):
         """
         Revoke current token and delete token file.
@@ -264,22 +319,20 @@ class OAuth2Gmail:
 
         try:
             # Revoke token with Google
-            import requests
-            requests.post(
+            self._session().post(
                 'https://oauth2.googleapis.com/revoke',
                 params={'token': self.credentials.token},
                 headers={'content-type': 'application/x-www-form-urlencoded'}
             )
 
             # Delete token file
-            if self.token_file.exists():
-                self.token_file.unlink()
+            self.token_file.unlink(missing_ok=True)
 
             self.credentials = None
             logger.info("Token revoked and file deleted")
 
         except Exception as e:
-            logger.error(f"Token revocation failed: {e}")
+            logger.error("Token revocation failed: %s", e)
             raise OAuth2AuthenticationError(f"Failed to revoke token: {e}")
 
     def get_token_info(self) -> Dict[str, Any]:
@@ -330,7 +383,7 @@ def create_oauth2_from_config(config) -> OAuth2Gmail:
 # CLI utility for initial setup
 if __name__ == "__main__":
     import argparse
-    from config.settings import settings
+    from config.settings import get_settings
 
     parser = argparse.ArgumentParser(description="OAuth2 Gmail Authentication Setup")
     parser.add_argument("--setup", action="store_true", help="Run initial authentication flow")
@@ -341,7 +394,7 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     try:
-        oauth = create_oauth2_from_config(settings)
+        oauth = create_oauth2_from_config(get_settings())
 
         if args.setup:
             print("Starting OAuth2 authentication flow...")
@@ -5,12 +5,14 @@ Microsoft 365 / Outlook.com accounts.
 """
 import os
 import json
+import time
 import base64
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta, timezone
 
 import msal
+import orjson
 
 from src.common.logging_config import get_logger
 from src.common.exceptions import OAuth2AuthenticationError, TokenRefreshError
@@ -26,6 +28,26 @@ OUTLOOK_SCOPES = [
 # Microsoft identity platform endpoints
 AUTHORITY_BASE = "https://login.microsoftonline.com"
 
+# Treat a token as expired this many seconds before it actually is
+TOKEN_EXPIRY_MARGIN_SECONDS = 300
+
+
+class _OrjsonTokenCache(msal.SerializableTokenCache):
+    """
+    MSAL token cache that parses the token file with orjson.
+
+    serialize() is left to MSAL, so the file format on disk is unchanged.
+    deserialize() mirrors MSAL's own and uses its private _lock and _cache;
+    msal is pinned to <2 in requirements.txt and a unit test round-trips a
+    real MSAL token file to catch upstream changes.
+    """
+
+    def deserialize(self, state):
+        """Load the cache from JSON text or bytes produced by serialize()."""
+        with self._lock:
+            self._cache = orjson.loads(state) if state else {}
+            self.has_state_changed = False
+
 
 class OAuth2Outlook:
     """
@@ -59,11 +81,19 @@ class OAuth2Outlook:
         self.authority = f"{AUTHORITY_BASE}/{tenant_id}"
 
         # MSAL token cache (serializable to disk)
-        self._cache = msal.SerializableTokenCache()
+        self._cache = _OrjsonTokenCache()
+        # Serialized cache as last read from / written to the token file
+        self._saved_cache_data: Optional[bytes] = None
+        # Accounts found in the MSAL cache; None until first looked up
+        self._accounts_cached: Optional[List[Dict[str, Any]]] = None
 
         # Current access token info
         self._access_token: Optional[str] = None
-        self._token_expiry: Optional[datetime] = None
+        self._token_expiry: Optional[datetime] = None  # for get_token_info()
+        # time.monotonic() value after which the token needs refreshing
+        self._token_deadline: Optional[float] = None
+        # (username, access token, encoded XOAUTH2 string) of the last IMAP login
+        self._xoauth2_cache: Optional[Tuple[str, str, str]] = None
 
         # Ensure token directory exists
         self.token_file.parent.mkdir(parents=True, exist_ok=True)
@@ -72,8 +102,8 @@ class OAuth2Outlook:
         self._app = self._build_msal_app()
 
         logger.info(
-            f"Outlook OAuth2 manager initialized, "
-            f"tenant={tenant_id}, token file: {self.token_file}"
+            "Outlook OAuth2 manager initialized, tenant=%s, token file: %s",
+            tenant_id, self.token_file
         )
 
     def _build_msal_app(self) -> msal.ClientApplication:
@@ -103,6 +133,19 @@ class OAuth2Outlook:
             )
         return app
 
+    def _accounts(self) -> List[Dict[str, Any]]:
+        """
+        Return the accounts in the MSAL token cache.
+
+        The list is looked up once and reused until load_credentials(),
+        _set_token_from_result() or revoke_token() clears it.  MSAL's
+        has_state_changed is no use here: silent refreshes leave it set
+        until the cache is saved on close().
+        """
+        if self._accounts_cached is None:
+            self._accounts_cached = self._app.get_accounts()
+        return self._accounts_cached
+
     def load_credentials(self) -> bool:
         """
         Load token cache from file if it exists.
@@ -110,21 +153,29 @@ class OAuth2Outlook:
         Returns:
             True if cache loaded and contains at least one account, False otherwise
         """
-        if not self.token_file.exists():
+        # Opening the file is the existence check; no separate stat()
+        try:
+            with open(self.token_file, "rb") as f:
+                cache_data = f.read()
+        except FileNotFoundError:
             logger.info("Token file not found, need to authenticate")
             return False
+        except Exception as e:
+            logger.error("Failed to load credentials: %s", e)
+            return False
 
         try:
-            cache_data = self.token_file.read_text(encoding="utf-8")
             self._cache.deserialize(cache_data)
-            # Rebuild app with loaded cache
-            self._app = self._build_msal_app()
+            self._saved_cache_data = cache_data
+            # deserialize() fills the cache object _app already holds, so the
+            # app (and its resolved authority) is kept as is
+            self._accounts_cached = None
 
-            accounts = self._app.get_accounts()
+            accounts = self._accounts()
             if accounts:
                 logger.info(
-                    f"Credentials loaded from token file "
-                    f"({len(accounts)} account(s))"
+                    "Credentials loaded from token file (%d account(s))",
+                    len(accounts)
                 )
                 return True
             else:
@@ -132,21 +183,56 @@ class OAuth2Outlook:
                 return False
 
         except Exception as e:
-            logger.error(f"Failed to load credentials: {e}")
+            logger.error("Failed to load credentials: %s", e)
             return False
 
     def save_credentials(self):
-        """Save token cache to file."""
+        """
+        Save token cache to file.
+
+        Writes a temporary file, fsyncs it and renames it over the token
+        file, so a crash never leaves a truncated cache behind. Skipped
+        when the serialized cache matches what is already on disk.
+        """
         try:
-            if self._cache.has_state_changed:
-                self.token_file.write_text(
-                    self._cache.serialize(), encoding="utf-8"
-                )
-                logger.info(f"Credentials saved to {self.token_file}")
+            if not self._cache.has_state_changed:
+                return
+            data = self._cache.serialize().encode("utf-8")
+            if data == self._saved_cache_data:
+                self._cache.has_state_changed = False
+                return
+
+            tmp_file = self.token_file.with_name(self.token_file.name + ".tmp")
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_file, self.token_file)
+
+            self._saved_cache_data = data
+            self._cache.has_state_changed = False
+            logger.info("Credentials saved to %s", self.token_file)
         except Exception as e:
-            logger.error(f"Failed to save credentials: {e}")
+            logger.error("Failed to save credentials: %s", e)
             raise OAuth2AuthenticationError(f"Failed to save credentials: {e}")
 
+    def close(self):
+        """
+        Write back token cache changes that have not been saved yet.
+
+        Silent token acquisition only updates the in-memory MSAL cache;
+        call this on shutdown so refreshed tokens reach the token file.
+        Errors are logged, not raised, so shutdown always completes.
+        """
+        try:
+            self.save_credentials()
+        except OAuth2AuthenticationError:
+            pass  # already logged by save_credentials()
+
     def authenticate(self, force_reauth: bool = False):
         """
         Authenticate and acquire a valid access token.
@@ -168,7 +254,7 @@ class OAuth2Outlook:
             self.load_credentials()
 
             # Attempt silent token acquisition from cache
-            accounts = self._app.get_accounts()
+            accounts = self._accounts()
             if accounts:
                 result = self._app.acquire_token_silent(
                     OUTLOOK_SCOPES, account=accounts[0]
@@ -176,7 +262,6 @@ class OAuth2Outlook:
                 if result and "access_token" in result:
                     self._set_token_from_result(result)
                     logger.info("Token acquired silently from cache")
-                    self.save_credentials()
                     return result["access_token"]
 
         # Need interactive authentication
@@ -229,7 +314,7 @@ class OAuth2Outlook:
         except OAuth2AuthenticationError:
             raise
         except Exception as e:
-            logger.error(f"OAuth2 flow failed: {e}")
+            logger.error("OAuth2 flow failed: %s", e)
             raise OAuth2AuthenticationError(f"OAuth2 authentication failed: {e}")
 
     def _set_token_from_result(self, result: Dict[str, Any]):
@@ -240,10 +325,15 @@ class OAuth2Outlook:
             result: MSAL token acquisition result dict
         """
         self._access_token = result["access_token"]
+        self._xoauth2_cache = None
+        self._accounts_cached = None  # acquisition may have added an account
         # MSAL returns expires_in (seconds)
-        expires_in = result.get("expires_in", 3600)
+        expires_in = int(result.get("expires_in", 3600))
         self._token_expiry = datetime.now(timezone.utc) + timedelta(
-            seconds=int(expires_in)
+            seconds=expires_in
+        )
+        self._token_deadline = (
+            time.monotonic() + expires_in - TOKEN_EXPIRY_MARGIN_SECONDS
         )
 
     def get_access_token(self) -> str:
@@ -261,14 +351,13 @@ class OAuth2Outlook:
             return self._access_token
 
         # Try silent acquisition (MSAL handles refresh automatically)
-        accounts = self._app.get_accounts()
+        accounts = self._accounts()
         if accounts:
             result = self._app.acquire_token_silent(
                 OUTLOOK_SCOPES, account=accounts[0]
             )
             if result and "access_token" in result:
                 self._set_token_from_result(result)
-                self.save_credentials()
                 logger.info("Access token refreshed silently")
                 return result["access_token"]
 
@@ -290,10 +379,19 @@ class OAuth2Outlook:
 
         Returns:
             Base64-encoded XOAUTH2 string
+
+        The encoded string is reused while the username and access token
+        are unchanged.
         """
         access_token = self.get_access_token()
+        cached = self._xoauth2_cache
+        if cached is not None and cached[0] == username and cached[1] == access_token:
+            return cached[2]
+
         auth_string = f"user={username}\x01auth=Bearer {access_token}\x01\x01"
-        return base64.b64encode(auth_string.encode()).decode()
+        encoded = base64.b64encode(auth_string.encode()).decode()
+        self._xoauth2_cache = (username, access_token, encoded)
+        return encoded
 
     def is_token_valid(self) -> bool:
         """
@@ -305,12 +403,11 @@ class OAuth2Outlook:
         if not self._access_token:
             return False
 
-        if not self._token_expiry:
+        if self._token_deadline is None:
             return False
 
-        # 5-minute buffer before expiry
-        buffer_time = datetime.now(timezone.utc) + timedelta(minutes=5)
-        if self._token_expiry < buffer_time:
+        # Deadline already includes the 5-minute buffer before expiry
+        if time.monotonic() >= self._token_deadline:
             logger.info("Token expiring soon")
             return False
 
@@ -326,22 +423,24 @@ class OAuth2Outlook:
         """
         try:
             # Remove all accounts from MSAL cache
-            accounts = self._app.get_accounts()
+            accounts = self._accounts()
             for account in accounts:
                 self._app.remove_account(account)
 
             # Clear local state
             self._access_token = None
             self._token_expiry = None
+            self._token_deadline = None
+            self._xoauth2_cache = None
+            self._accounts_cached = None
 
             # Delete token file
-            if self.token_file.exists():
-                self.token_file.unlink()
+            self.token_file.unlink(missing_ok=True)
 
             logger.info("Token cache cleared and file deleted")
 
         except Exception as e:
-            logger.error(f"Token revocation failed: {e}")
+            logger.error("Token revocation failed: %s", e)
             raise OAuth2AuthenticationError(f"Failed to revoke token: {e}")
 
     def get_token_info(self) -> Dict[str, Any]:
@@ -351,7 +450,7 @@ class OAuth2Outlook:
         Returns:
             Dictionary with token info
         """
-        accounts = self._app.get_accounts() if self._app else []
+        accounts = self._accounts() if self._app else []
 
         info: Dict[str, Any] = {
             "status": "valid" if self.is_token_valid() else "invalid",
@@ -397,7 +496,7 @@ def create_outlook_oauth2_from_config(config) -> OAuth2Outlook:
 # CLI utility for initial setup
 if __name__ == "__main__":
     import argparse
-    from config.settings import settings
+    from config.settings import get_settings
 
     parser = argparse.ArgumentParser(
         description="OAuth2 Outlook Authentication Setup"
@@ -418,7 +517,7 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     try:
-        oauth = create_outlook_oauth2_from_config(settings)
+        oauth = create_outlook_oauth2_from_config(get_settings())
 
         if args.setup:
             print("Starting OAuth2 authentication flow for Outlook...")
@@ -2,37 +2,85 @@
 Performance optimization utilities for Redis Streams operations.
 
 Provides batch operations using Redis pipelines for improved throughput:
-    - BatchProducer: Batch XADD with pipeline
-    - BatchAcknowledger: Batch XACK with pipeline
+    - BatchProducer: Batch XADD with a server-side Lua script
+    - BatchAcknowledger: Batch XACK with one multi-ID command
     - Batch helpers for reducing round-trips
 """
-from typing import Dict, Any, List, Optional, Tuple
+import time
+from itertools import chain
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from redis.exceptions import NoScriptError
 
 from src.common.redis_client import RedisClient
 from src.common.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Stream entry ID as returned by the client: str when it decodes
+# responses (as RedisClient does), bytes otherwise
+MessageId = Union[str, bytes]
+
+# Message IDs per XACK command; larger flushes are split and pipelined
+XACK_MAX_IDS = 1000
+
+# Appends a whole batch to one stream in a single EVALSHA.
+# ARGV: trim-arg count, trim args (e.g. MAXLEN ~ 1000), then for each
+# message its field/value pair count followed by the pairs.
+# redis.pcall() keeps going past a failed XADD and returns its error in
+# place of the ID, so callers still get one outcome per message.
+_XADD_BATCH_SCRIPT = """
+local ntrim = tonumber(ARGV[1])
+local head = {'XADD', KEYS[1]}
+for t = 2, ntrim + 1 do
+    head[#head + 1] = ARGV[t]
+end
+head[#head + 1] = '*'
+local ids = {}
+local i = ntrim + 2
+while i <= #ARGV do
+    local cmd = {unpack(head)}
+    local last = i + tonumber(ARGV[i]) * 2
+    for f = i + 1, last do
+        cmd[#cmd + 1] = ARGV[f]
+    end
+    ids[#ids + 1] = redis.pcall(unpack(cmd))
+    i = last + 1
+end
+return ids
+"""
+
 
 class BatchProducer:
     """
-    Batch XADD operations using Redis pipelines.
-    Reduces network round-trips for high-throughput producing.
+    Batch XADD operations using a server-side Lua script.
+    Sends the whole batch as one EVALSHA for high-throughput producing,
+    falling back to a pipeline if the script cannot be run.
 
     Usage:
         batch = BatchProducer(redis, "email_stream", batch_size=50)
         for email in emails:
-            batch.add(email)
+            batch.add(email)  # or batch.add_raw(payload_bytes)
         results = batch.flush()  # Sends all at once
     """
 
+    __slots__ = (
+        "redis", "stream_name", "batch_size", "maxlen", "approximate",
+        "return_ids", "auto_flush", "_flush_interval", "_oldest", "_buffer", "_head",
+        "_pipe", "_xadd_script", "_trim_args", "_xadd_args", "_script_args",
+        "total_sent", "total_batches",
+    )
+
     def __init__(
         self,
         redis_client: RedisClient,
         stream_name: str,
         batch_size: int = 50,
         maxlen: Optional[int] = None,
-        approximate: bool = True
+        approximate: bool = True,
+        return_ids: bool = True,
+        flush_interval_ms: Optional[int] = None,
+        auto_flush: bool = True
     ):
         """
         Initialize batch producer.
@@ -43,77 +91,245 @@ class BatchProducer:
             batch_size: Auto-flush after this many messages
             maxlen: Optional max stream length
             approximate: Use approximate trimming
+            return_ids: Have flush() return the message IDs; if False it
+                returns only the number of messages sent
+            flush_interval_ms: Also auto-flush on add once the oldest
+                buffered message has waited this long (None disables)
+            auto_flush: If False, add() and add_raw() never flush; the
+                buffer grows until flush() or flush_each() is called
         """
         self.redis = redis_client
         self.stream_name = stream_name
         self.batch_size = batch_size
         self.maxlen = maxlen
         self.approximate = approximate
-        self._buffer: List[Dict[str, Any]] = []
+        self.return_ids = return_ids
+        self.auto_flush = auto_flush
+        self._flush_interval = (
+            flush_interval_ms / 1000.0 if flush_interval_ms is not None else None
+        )
+        self._oldest = 0.0  # monotonic time the first buffered message was added
+        # Field dicts from add(), raw payload bytes from add_raw(), in a
+        # preallocated slot list: the first _head slots are pending
+        self._buffer: List[Union[Dict[str, Any], bytes, None]] = [None] * batch_size
+        self._head = 0
+        self._pipe = None  # created on first pipeline fallback, reused afterwards
+        self._xadd_script = None  # registered on first flush
+
+        # Trimming arguments and pre-built XADD arguments for add_raw()
+        # payloads, encoded once so redis-py passes them through without
+        # re-encoding on every message
+        self._trim_args: Tuple[bytes, ...] = ()
+        if maxlen is not None:
+            limit = str(maxlen).encode("ascii")
+            self._trim_args = (b"MAXLEN", b"~", limit) if approximate else (b"MAXLEN", limit)
+        self._xadd_args: Tuple[bytes, ...] = (
+            (b"XADD", stream_name.encode("utf-8")) + self._trim_args + (b"*",)
+        )
+        # Script arguments for the buffered messages, appended as each one
+        # is added so flushing does no per-message encoding work
+        self._script_args: List[Any] = []
 
         # Stats
         self.total_sent = 0
         self.total_batches = 0
 
-    def add(self, fields: Dict[str, Any]) -> Optional[List[str]]:
+    def reset(self, batch_size: Optional[int] = None) -> None:
         """
-        Add a message to the buffer. Auto-flushes when batch_size is reached.
+        Drop any buffered messages so the producer can be reused.
+
+        Args:
+            batch_size: Optional new auto-flush threshold
+        """
+        self._clear()
+        if batch_size is not None:
+            self.batch_size = batch_size
+            if batch_size > len(self._buffer):
+                self._buffer.extend([None] * (batch_size - len(self._buffer)))
+
+    def add(self, fields: Dict[str, Any]) -> Optional[Union[List[MessageId], int]]:
+        """
+        Add a message to the buffer. Auto-flushes when batch_size is reached
+        (unless auto_flush is off).
 
         Args:
             fields: Message fields
 
         Returns:
-            List of message IDs if auto-flushed, None otherwise
+            flush() result if auto-flushed, None otherwise
         """
-        self._buffer.append(fields)
-        if len(self._buffer) >= self.batch_size:
+        self._push(fields)
+        args = self._script_args
+        args.append(len(fields))
+        args.extend(chain.from_iterable(fields.items()))
+        if self.auto_flush and (self._head >= self.batch_size or self._flush_due()):
             return self.flush()
         return None
 
-    def flush(self) -> List[str]:
+    def add_raw(self, payload: bytes) -> Optional[Union[List[MessageId], int]]:
         """
-        Send all buffered messages via pipeline.
+        Add a pre-serialized payload as the message's single ``payload`` field.
+
+        Skips the per-message fields dict: the payload is sent with
+        pre-built arguments at flush time.
+
+        Args:
+            payload: Serialized message body
 
         Returns:
-            List of message IDs for sent messages
+            flush() result if auto-flushed, None otherwise
         """
-        if not self._buffer:
-            return []
+        self._push(payload)
+        # Every raw entry carries the same single "payload" field, so Redis
+        # stores it in the stream listpack as a "same fields" entry (field
+        # names are not repeated). Keep it that way.
+        self._script_args += (1, b"payload", payload)
+        if self.auto_flush and (self._head >= self.batch_size or self._flush_due()):
+            return self.flush()
+        return None
 
-        pipe = self.redis.pipeline()
-        for fields in self._buffer:
-            pipe.xadd(  # type: ignore[arg-type]
-                self.stream_name,
-                fields,
-                maxlen=self.maxlen,
-                approximate=self.approximate
-            )
+    def flush(self) -> Union[List[MessageId], int]:
+        """
+        Send all buffered messages in one round-trip.
+
+        Returns:
+            List of message IDs for sent messages, or just their count
+            when the producer was created with ``return_ids=False``
+
+        Raises:
+            Exception: If the batch or any message in it failed; the
+                buffer is kept for retry
+        """
+        if not self._head:
+            return [] if self.return_ids else 0
 
         try:
-            results = pipe.execute()
-            msg_ids = [str(r) for r in results if r]
-            count = len(msg_ids)
+            results = self._send()
+            for r in results:
+                if isinstance(r, Exception):
+                    raise r
+            count = len(results)
 
             self.total_sent += count
             self.total_batches += 1
 
             logger.debug(
-                f"BatchProducer: flushed {count} messages "
-                f"(batch #{self.total_batches})"
+                "BatchProducer: flushed %d messages (batch #%d)",
+                count, self.total_batches
             )
 
-            self._buffer.clear()
-            return msg_ids
+            self._clear()
+            # IDs are passed through as the client decoded them
+            return results if self.return_ids else count
 
         except Exception as e:
-            logger.error(f"BatchProducer flush failed: {e}")
+            logger.error("BatchProducer flush failed: %s", e)
             # Keep buffer for retry
             raise
 
+    def flush_each(self) -> List[Union[MessageId, Exception]]:
+        """
+        Send all buffered messages and report the outcome of each one.
+
+        Unlike flush(), a failed XADD does not abort the batch: its
+        exception is returned in place of a message ID and the buffer
+        is always cleared.
+
+        Returns:
+            One entry per buffered message, in order: the message ID,
+            or the exception raised for that message
+
+        Raises:
+            Exception: If the batch itself could not be sent
+        """
+        if not self._head:
+            return []
+
+        try:
+            outcomes: List[Union[MessageId, Exception]] = self._send()
+        except Exception as e:
+            logger.error("BatchProducer flush failed: %s", e)
+            self._clear()
+            raise
+
+        count = sum(1 for r in outcomes if not isinstance(r, Exception))
+
+        self.total_sent += count
+        self.total_batches += 1
+        logger.debug(
+            "BatchProducer: flushed %d/%d messages (batch #%d)",
+            count, len(outcomes), self.total_batches
+        )
+
+        self._clear()
+        return outcomes
+
+    def _send(self) -> List[Any]:
+        """
+        Send every buffered message with the batch script.
+
+        Returns:
+            One entry per buffered message: the message ID, or the
+            exception for a failed XADD
+        """
+        if self._xadd_script is None:
+            self._xadd_script = self.redis.client.register_script(_XADD_BATCH_SCRIPT)
+
+        args = [len(self._trim_args), *self._trim_args, *self._script_args]
+        try:
+            # redis-py reloads the script and retries on NOSCRIPT itself
+            return self._xadd_script(keys=[self.stream_name], args=args)
+        except NoScriptError as e:
+            logger.warning("BatchProducer script unavailable, using pipeline: %s", e)
+            return self._queue_buffer().execute(raise_on_error=False)
+
+    def _push(self, item: Union[Dict[str, Any], bytes]) -> None:
+        """Store a message in the next buffer slot."""
+        if self._head == 0 and self._flush_interval is not None:
+            self._oldest = time.monotonic()
+        if self._head < len(self._buffer):
+            self._buffer[self._head] = item
+        else:
+            # Only after a failed flush kept the buffer full
+            self._buffer.append(item)
+        self._head += 1
+
+    def _flush_due(self) -> bool:
+        """Whether the oldest buffered message has waited past the interval."""
+        return (
+            self._flush_interval is not None
+            and time.monotonic() - self._oldest >= self._flush_interval
+        )
+
+    def _clear(self) -> None:
+        """Drop the buffered messages and their script arguments."""
+        # Slots are overwritten by the next batch rather than released
+        self._head = 0
+        self._script_args.clear()
+
+    def _queue_buffer(self):
+        """Queue every buffered message on the reusable pipeline."""
+        # redis-py resets a pipeline after execute(), so one instance
+        # can be reused for every flush. Stream appends need no MULTI/EXEC.
+        if self._pipe is None:
+            self._pipe = self.redis.pipeline(transaction=False)
+        pipe = self._pipe
+        for fields in self._buffer[:self._head]:
+            if isinstance(fields, bytes):
+                pipe.execute_command(*self._xadd_args, b"payload", fields)
+                continue
+            pipe.xadd(  # type: ignore[arg-type]
+                self.stream_name,
+                fields,
+                maxlen=self.maxlen,
+                approximate=self.approximate
+            )
+        return pipe
+
     @property
     def pending_count(self) -> int:
         """Number of messages in buffer waiting to be sent."""
-        return len(self._buffer)
+        return self._head
 
     def get_stats(self) -> Dict[str, Any]:
         """Get batch producer statistics."""
@@ -130,8 +346,8 @@ class BatchProducer:
 
 class BatchAcknowledger:
     """
-    Batch XACK operations using Redis pipelines.
-    Reduces round-trips for acknowledging multiple messages.
+    Batch XACK operations.
+    Acknowledges every buffered ID with a single multi-ID XACK.
 
     Usage:
         acker = BatchAcknowledger(redis, "email_stream", "workers")
@@ -140,12 +356,19 @@ class BatchAcknowledger:
         count = acker.flush()
     """
 
+    __slots__ = (
+        "redis", "stream_name", "consumer_group", "batch_size",
+        "_flush_interval", "_oldest", "_buffer", "_head",
+        "total_acked", "total_batches",
+    )
+
     def __init__(
         self,
         redis_client: RedisClient,
         stream_name: str,
         consumer_group: str,
-        batch_size: int = 50
+        batch_size: int = 50,
+        flush_interval_ms: Optional[int] = None
     ):
         """
         Initialize batch acknowledger.
@@ -155,12 +378,20 @@ class BatchAcknowledger:
             stream_name: Stream name
             consumer_group: Consumer group name
             batch_size: Auto-flush after this many ACKs
+            flush_interval_ms: Also auto-flush on add once the oldest
+                buffered ID has waited this long (None disables)
         """
         self.redis = redis_client
         self.stream_name = stream_name
         self.consumer_group = consumer_group
         self.batch_size = batch_size
-        self._buffer: List[str] = []
+        self._flush_interval = (
+            flush_interval_ms / 1000.0 if flush_interval_ms is not None else None
+        )
+        self._oldest = 0.0  # monotonic time the first buffered ID was added
+        # Preallocated slot list: the first _head slots are pending
+        self._buffer: List[Optional[str]] = [None] * batch_size
+        self._head = 0
 
         # Stats
         self.total_acked = 0
@@ -176,48 +407,68 @@ class BatchAcknowledger:
         Returns:
             Total ACKed if auto-flushed, None otherwise
         """
-        self._buffer.append(message_id)
-        if len(self._buffer) >= self.batch_size:
+        if self._head == 0 and self._flush_interval is not None:
+            self._oldest = time.monotonic()
+        if self._head < len(self._buffer):
+            self._buffer[self._head] = message_id
+        else:
+            # Only after a failed flush kept the buffer full
+            self._buffer.append(message_id)
+        self._head += 1
+        if self._head >= self.batch_size or self._flush_due():
             return self.flush()
         return None
 
+    def _flush_due(self) -> bool:
+        """Whether the oldest buffered ID has waited past the interval."""
+        return (
+            self._flush_interval is not None
+            and time.monotonic() - self._oldest >= self._flush_interval
+        )
+
     def flush(self) -> int:
         """
-        Send all buffered ACKs via pipeline.
+        Send all buffered ACKs in one XACK command.
 
         Returns:
             Number of messages acknowledged
         """
-        if not self._buffer:
+        if not self._head:
             return 0
 
-        pipe = self.redis.pipeline()
-        for msg_id in self._buffer:
-            pipe.xack(self.stream_name, self.consumer_group, msg_id)
-
+        ids = self._buffer[:self._head]
         try:
-            results = pipe.execute()
-            count = sum(1 for r in results if r)
+            if len(ids) <= XACK_MAX_IDS:
+                count = self.redis.xack(self.stream_name, self.consumer_group, *ids)
+            else:
+                pipe = self.redis.pipeline(transaction=False)
+                for start in range(0, len(ids), XACK_MAX_IDS):
+                    pipe.xack(
+                        self.stream_name,
+                        self.consumer_group,
+                        *ids[start:start + XACK_MAX_IDS]
+                    )
+                count = sum(pipe.execute())
 
             self.total_acked += count
             self.total_batches += 1
 
             logger.debug(
-                f"BatchAcknowledger: ACKed {count} messages "
-                f"(batch #{self.total_batches})"
+                "BatchAcknowledger: ACKed %d messages (batch #%d)",
+                count, self.total_batches
             )
 
-            self._buffer.clear()
+            self._head = 0
             return count
 
         except Exception as e:
-            logger.error(f"BatchAcknowledger flush failed: {e}")
+            logger.error("BatchAcknowledger flush failed: %s", e)
             raise
 
     @property
     def pending_count(self) -> int:
         """Number of IDs waiting to be ACKed."""
-        return len(self._buffer)
+        return self._head
 
     def get_stats(self) -> Dict[str, Any]:
         """Get acknowledger statistics."""
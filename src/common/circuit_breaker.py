@@ -8,15 +8,18 @@ States:
     HALF_OPEN - Recovery test, limited requests allowed
 
 Transitions:
-    CLOSED -> OPEN:      failure_count >= failure_threshold
+    CLOSED -> OPEN:      failure_count >= failure_threshold (within
+                         failure_window seconds, when one is set)
     OPEN -> HALF_OPEN:   recovery_timeout elapsed
     HALF_OPEN -> CLOSED: success_count >= success_threshold
     HALF_OPEN -> OPEN:   any failure
 """
 import time
+import weakref
 import threading
 import functools
-from typing import Optional, Callable, Any, Dict
+from collections import deque
+from typing import Optional, Callable, Any, Deque, Dict, List, Tuple
 from enum import Enum
 from datetime import datetime
 
@@ -45,6 +48,12 @@ class CircuitBreakerError(Exception):
         )
 
 
+class _ShardOwner:
+    """Thread-local marker whose collection retires the thread's stats shard."""
+
+    __slots__ = ("__weakref__",)
+
+
 class CircuitBreaker:
     """
     Thread-safe circuit breaker implementation.
@@ -72,7 +81,8 @@ class CircuitBreaker:
         failure_threshold: int = 5,
         recovery_timeout: float = 60.0,
         success_threshold: int = 3,
-        excluded_exceptions: tuple = ()
+        excluded_exceptions: tuple = (),
+        failure_window: Optional[float] = None
     ):
         """
         Initialize circuit breaker.
@@ -83,44 +93,74 @@ class CircuitBreaker:
             recovery_timeout: Seconds before trying half-open
             success_threshold: Successes in half-open before closing
             excluded_exceptions: Exception types that don't count as failures
+            failure_window: If set, only failures within this many seconds
+                count towards the threshold and successes no longer reset
+                the count; if None, failures count until the next success
         """
         self.name = name
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
+        self._recovery_timeout_ns = int(recovery_timeout * 1e9)
         self.success_threshold = success_threshold
         self.excluded_exceptions = excluded_exceptions
+        self.failure_window = failure_window
+        self._failure_window_ns = (
+            int(failure_window * 1e9) if failure_window is not None else None
+        )
 
         self._state = CircuitState.CLOSED
         self._failure_count = 0
         self._success_count = 0
-        self._last_failure_time: Optional[float] = None
-        self._last_state_change: float = time.time()
-        self._lock = threading.Lock()
-
-        # Statistics
-        self._total_calls = 0
-        self._total_failures = 0
+        # time.monotonic_ns() of the last failure, for recovery interval math
+        self._last_failure_time: Optional[int] = None
+        # monotonic_ns() of recent failures when a failure window is set;
+        # only the newest failure_threshold entries can matter
+        self._failure_times: Deque[int] = deque(maxlen=failure_threshold)
+        self._last_state_change: float = time.time()  # wall clock, for display
+        self._lock = threading.Lock()  # guards state transitions
+
+        # Statistics: each thread counts calls in its own [calls, successes,
+        # failures] shard without locking; get_stats() adds them up. When a
+        # thread exits its shard is folded into _retired, so short-lived
+        # threads (e.g. health server requests) do not pile up shards.
+        self._stats_lock = threading.Lock()  # guards _shards and _retired
+        self._local = threading.local()
+        self._shards: List[List[int]] = []
+        self._retired = [0, 0, 0]
         self._total_rejections = 0
-        self._total_successes = 0
 
         logger.info(
             f"CircuitBreaker '{name}' initialized: "
             f"failure_threshold={failure_threshold}, "
             f"recovery_timeout={recovery_timeout}s, "
-            f"success_threshold={success_threshold}"
+            f"success_threshold={success_threshold}, "
+            f"failure_window={failure_window}"
         )
 
     @property
     def state(self) -> CircuitState:
         """Get current circuit state (may transition from OPEN to HALF_OPEN)."""
         with self._lock:
-            if self._state == CircuitState.OPEN:
-                # Check if recovery timeout has elapsed
-                if self._last_failure_time and \
-                   time.time() - self._last_failure_time >= self.recovery_timeout:
-                    self._transition_to(CircuitState.HALF_OPEN)
+            self._maybe_transition_to_half_open()
             return self._state
 
+    def _maybe_transition_to_half_open(self) -> None:
+        """Move OPEN to HALF_OPEN once the recovery timeout has elapsed (lock held)."""
+        if self._state == CircuitState.OPEN:
+            # Check if recovery timeout has elapsed
+            if self._last_failure_time is not None and \
+               time.monotonic_ns() - self._last_failure_time >= self._recovery_timeout_ns:
+                self._transition_to(CircuitState.HALF_OPEN)
+
+    def _observed_state(self) -> CircuitState:
+        """Current state as ``state`` would report it, read without the lock."""
+        state = self._state
+        last_failure = self._last_failure_time
+        if state is CircuitState.OPEN and last_failure is not None and \
+           time.monotonic_ns() - last_failure >= self._recovery_timeout_ns:
+            return CircuitState.HALF_OPEN
+        return state
+
     @property
     def is_closed(self) -> bool:
         """Check if circuit is closed (normal operation)."""
@@ -138,6 +178,11 @@ class CircuitBreaker:
         Returns:
             True if request is allowed, False if circuit is open
         """
+        # CLOSED fast path: a single attribute read is atomic, so the common
+        # case needs no lock. Only other states take it to check recovery.
+        if self._state is CircuitState.CLOSED:
+            return True
+
         current_state = self.state
 
         if current_state == CircuitState.CLOSED:
@@ -150,10 +195,19 @@ class CircuitBreaker:
 
     def record_success(self) -> None:
         """Record a successful operation."""
-        with self._lock:
-            self._total_successes += 1
-            self._total_calls += 1
+        self._record_call(success=True)
+
+        # Check without the lock first: a success while CLOSED with no
+        # failures pending changes nothing, which is the common case. With a
+        # failure window, successes never reset the count.
+        state = self._state
+        if state is CircuitState.CLOSED:
+            if not self._failure_count or self._failure_window_ns is not None:
+                return
+        elif state is not CircuitState.HALF_OPEN:
+            return
 
+        with self._lock:
             if self._state == CircuitState.HALF_OPEN:
                 self._success_count += 1
                 if self._success_count >= self.success_threshold:
@@ -173,20 +227,66 @@ class CircuitBreaker:
         if exception and isinstance(exception, self.excluded_exceptions):
             return
 
+        self._record_call(success=False)
+
+        # Stragglers failing while already OPEN change nothing; skip the lock
+        # so an outage does not serialize every failing caller. The recovery
+        # window keeps counting from the failure that opened the circuit.
+        if self._state is CircuitState.OPEN:
+            return
+
         with self._lock:
-            self._total_failures += 1
-            self._total_calls += 1
-            self._last_failure_time = time.time()
+            now = time.monotonic_ns()
+            self._last_failure_time = now
 
             if self._state == CircuitState.HALF_OPEN:
                 # Any failure in half-open goes back to open
                 self._transition_to(CircuitState.OPEN)
 
             elif self._state == CircuitState.CLOSED:
-                self._failure_count += 1
+                if self._failure_window_ns is None:
+                    self._failure_count += 1
+                else:
+                    # Drop failures that have slid out of the window
+                    times = self._failure_times
+                    times.append(now)
+                    cutoff = now - self._failure_window_ns
+                    while times[0] < cutoff:
+                        times.popleft()
+                    self._failure_count = len(times)
                 if self._failure_count >= self.failure_threshold:
                     self._transition_to(CircuitState.OPEN)
 
+    def _record_call(self, success: bool) -> None:
+        """Update the calling thread's call statistics."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = [0, 0, 0]
+            # Dropped along with the thread's locals when the thread exits
+            self._local.owner = owner = _ShardOwner()
+            weakref.finalize(owner, self._retire_shard, shard)
+            with self._stats_lock:
+                self._shards.append(shard)
+        shard[0] += 1
+        shard[1 if success else 2] += 1
+
+    def _retire_shard(self, shard: List[int]) -> None:
+        """Fold an exited thread's shard into the retired totals."""
+        with self._stats_lock:
+            for index, live in enumerate(self._shards):
+                if live is shard:
+                    del self._shards[index]
+                    break
+            for column, count in enumerate(shard):
+                self._retired[column] += count
+
+    def _call_totals(self) -> List[int]:
+        """Sum the per-thread shards into [calls, successes, failures]."""
+        with self._stats_lock:
+            shards = list(self._shards)
+            retired = list(self._retired)
+        return [sum(column) for column in zip(retired, *shards)]
+
     def _transition_to(self, new_state: CircuitState) -> None:
         """
         Transition to a new state.
@@ -200,6 +300,7 @@ class CircuitBreaker:
 
         if new_state == CircuitState.CLOSED:
             self._failure_count = 0
+            self._failure_times.clear()
             self._success_count = 0
         elif new_state == CircuitState.HALF_OPEN:
             self._success_count = 0
@@ -218,28 +319,34 @@ class CircuitBreaker:
         Returns:
             Seconds remaining, or 0 if not open
         """
-        if self._state != CircuitState.OPEN or not self._last_failure_time:
+        last_failure = self._last_failure_time
+        if self._state != CircuitState.OPEN or last_failure is None:
             return 0.0
-        elapsed = time.time() - self._last_failure_time
-        return max(0.0, self.recovery_timeout - elapsed)
+        remaining_ns = self._recovery_timeout_ns - (time.monotonic_ns() - last_failure)
+        return max(0.0, remaining_ns / 1e9)
 
     def get_stats(self) -> Dict[str, Any]:
         """
         Get circuit breaker statistics.
 
+        Reads a lock-free snapshot, so polling stats never contends with
+        callers on the transition lock.
+
         Returns:
             Statistics dictionary
         """
+        total_calls, total_successes, total_failures = self._call_totals()
         return {
             "name": self.name,
-            "state": self.state.value,
+            "state": self._observed_state().value,
             "failure_count": self._failure_count,
             "failure_threshold": self.failure_threshold,
+            "failure_window": self.failure_window,
             "success_count": self._success_count,
             "success_threshold": self.success_threshold,
-            "total_calls": self._total_calls,
-            "total_failures": self._total_failures,
-            "total_successes": self._total_successes,
+            "total_calls": total_calls,
+            "total_failures": total_failures,
+            "total_successes": total_successes,
             "total_rejections": self._total_rejections,
             "retry_after": self.get_retry_after(),
             "last_state_change": datetime.fromtimestamp(
@@ -252,6 +359,7 @@ class CircuitBreaker:
         with self._lock:
             self._transition_to(CircuitState.CLOSED)
             self._failure_count = 0
+            self._failure_times.clear()
             self._success_count = 0
             self._last_failure_time = None
             logger.info(f"CircuitBreaker '{self.name}' manually reset")
@@ -295,6 +403,9 @@ class CircuitBreakers:
 
     _breakers: Dict[str, CircuitBreaker] = {}
     _lock = threading.Lock()
+    # (monotonic time, per-breaker state key, stats) of the last get_all_stats
+    _stats_cache: Optional[Tuple[float, tuple, Dict[str, Any]]] = None
+    _stats_ttl = 1.0
 
     @classmethod
     def get(
@@ -302,7 +413,8 @@ class CircuitBreakers:
         name: str,
         failure_threshold: int = 5,
         recovery_timeout: float = 60.0,
-        success_threshold: int = 3
+        success_threshold: int = 3,
+        failure_window: Optional[float] = None
     ) -> CircuitBreaker:
         """
         Get or create a named circuit breaker.
@@ -312,6 +424,8 @@ class CircuitBreakers:
             failure_threshold: Failures before opening
             recovery_timeout: Recovery timeout in seconds
             success_threshold: Successes before closing
+            failure_window: Seconds within which failures must occur to
+                count towards the threshold (None counts until a success)
 
         Returns:
             CircuitBreaker instance
@@ -322,7 +436,8 @@ class CircuitBreakers:
                     name=name,
                     failure_threshold=failure_threshold,
                     recovery_timeout=recovery_timeout,
-                    success_threshold=success_threshold
+                    success_threshold=success_threshold,
+                    failure_window=failure_window
                 )
             return cls._breakers[name]
 
@@ -331,13 +446,26 @@ class CircuitBreakers:
         """
         Get stats for all registered circuit breakers.
 
+        The result is reused for up to ``_stats_ttl`` seconds as long as no
+        breaker has been added or changed state, so frequent /status and
+        metrics polls do not rebuild every breaker's stats.
+
         Returns:
-            Dictionary of circuit breaker stats
+            Dictionary of circuit breaker stats (shared; do not mutate)
         """
-        return {
-            name: cb.get_stats()
-            for name, cb in cls._breakers.items()
-        }
+        breakers = list(cls._breakers.items())
+        key = tuple(
+            (name, cb._state, cb._last_state_change) for name, cb in breakers
+        )
+        now = time.monotonic()
+        cached = cls._stats_cache
+        if cached is not None and cached[1] == key and \
+           now - cached[0] < cls._stats_ttl:
+            return cached[2]
+
+        stats = {name: cb.get_stats() for name, cb in breakers}
+        cls._stats_cache = (now, key, stats)
+        return stats
 
     @classmethod
     def reset_all(cls) -> None:
@@ -346,3 +474,4 @@ class CircuitBreakers:
             for cb in cls._breakers.values():
                 cb.reset()
             cls._breakers.clear()
+            cls._stats_cache = None
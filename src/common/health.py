@@ -7,18 +7,47 @@ Endpoints:
     GET /ready   - Readiness: all dependencies connected
     GET /status  - Detailed status with statistics
 """
-import json
 import threading
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from typing import Dict, Any, Callable, Optional, List
-from datetime import datetime, timezone
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from functools import lru_cache
+from typing import Dict, Any, Callable, Optional, List, Tuple
+
+import orjson
 
 from src.common.logging_config import get_logger
 from src.common.circuit_breaker import CircuitBreakers
 
 logger = get_logger(__name__)
 
+# Stats providers may key their dicts by non-string values (e.g. ints)
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+@lru_cache(maxsize=1)
+def _utc_second(seconds: int) -> str:
+    """
+    Format whole UTC seconds as ``YYYY-MM-DDTHH:MM:SS``.
+
+    Probes arriving within the same second share the cached prefix.
+    """
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+
+
+def _iso_utc_z(ns: Optional[int] = None) -> str:
+    """
+    Format a UTC timestamp as ISO 8601 with microseconds and a Z suffix.
+
+    Args:
+        ns: Nanoseconds since the epoch (defaults to now)
+    """
+    if ns is None:
+        ns = time.time_ns()
+    seconds, micros = divmod(ns // 1000, 1_000_000)
+    return f"{_utc_second(seconds)}.{micros:06d}Z"
+
 
 class HealthCheck:
     """
@@ -48,7 +77,8 @@ class HealthCheck:
             check_fn: Function that returns True if healthy.
                       Should raise or return False if unhealthy.
             critical: If True, failure makes service unready
-            timeout: Check timeout in seconds
+            timeout: Check timeout in seconds; enforced by
+                     ``HealthRegistry.run_checks``
         """
         self.name = name
         self.check_fn = check_fn
@@ -105,6 +135,27 @@ class HealthCheck:
                 "consecutive_failures": self.consecutive_failures
             }
 
+    def record_timeout(self) -> Dict[str, Any]:
+        """
+        Record a run that did not finish within ``timeout``.
+
+        Returns:
+            Unhealthy result dictionary for the timed-out run
+        """
+        self.last_result = False
+        self.last_check_time = time.time()
+        self.last_error = f"Check timed out after {self.timeout}s"
+        self.consecutive_failures += 1
+
+        return {
+            "name": self.name,
+            "status": "unhealthy",
+            "critical": self.critical,
+            "response_time_ms": round(self.timeout * 1000, 2),
+            "error": self.last_error,
+            "consecutive_failures": self.consecutive_failures
+        }
+
 
 class HealthRegistry:
     """
@@ -112,21 +163,49 @@ class HealthRegistry:
     Central point for all health-related data.
     """
 
-    def __init__(self, component: str = "unknown"):
+    def __init__(self, component: str = "unknown", checks_ttl: float = 1.0):
         """
         Initialize health registry.
 
         Args:
             component: Component name (e.g., "producer", "worker")
+            checks_ttl: Seconds a ``run_checks`` result is reused, so
+                        concurrent probes of /ready and /status share one
+                        round of dependency checks (0 disables caching)
         """
         self.component = component
         self.checks: List[HealthCheck] = []
         self.stats_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
         self.start_time = time.time()
+        # Checks run concurrently on this pool (created on first use); a
+        # check still running from an earlier probe is waited on again
+        # rather than started a second time
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[HealthCheck, Future] = {}
+        self._pending_lock = threading.Lock()
+        self._checks_ttl = checks_ttl
+        self._checks_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._refresh_lock = threading.Lock()
+        # /health only varies in uptime and timestamp, so its JSON is
+        # encoded once and those two fields are spliced in per request
+        self._liveness_template = (
+            b'{\n'
+            b'  "status": "alive",\n'
+            b'  "component": %s,\n'
+            b'  "uptime_seconds": %%.1f,\n'
+            b'  "timestamp": "%%s"\n'
+            b'}'
+        ) % orjson.dumps(component)
 
     def register_check(self, check: HealthCheck) -> None:
         """Register a health check."""
         self.checks.append(check)
+        # Resize the pool on next use so every check gets a worker
+        with self._pending_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        self._checks_cache = None
         logger.debug(f"Registered health check: {check.name}")
 
     def register_stats_provider(
@@ -146,16 +225,46 @@ class HealthRegistry:
 
     def run_checks(self) -> Dict[str, Any]:
         """
-        Run all registered health checks.
+        Run all registered health checks concurrently.
+
+        Each check is given its own ``timeout``; one that overruns is
+        reported unhealthy without waiting for it to finish.  Results are
+        reused for ``checks_ttl`` seconds; when they expire, one caller
+        refreshes them while concurrent callers wait for that result.
 
         Returns:
             Aggregated results with overall status
         """
+        cached = self._checks_cache
+        if cached is not None and time.monotonic() - cached[0] < self._checks_ttl:
+            return cached[1]
+
+        with self._refresh_lock:
+            cached = self._checks_cache
+            if cached is not None and time.monotonic() - cached[0] < self._checks_ttl:
+                return cached[1]
+            result = self._run_checks()
+            self._checks_cache = (time.monotonic(), result)
+            return result
+
+    def _run_checks(self) -> Dict[str, Any]:
+        """Run every check once, bypassing the result cache."""
+        checks = list(self.checks)
+        start = time.monotonic()
+        futures = self._submit_checks(checks)
+
         results = []
         all_healthy = True
 
-        for check in self.checks:
-            result = check.run()
+        for check, future in zip(checks, futures):
+            remaining = check.timeout - (time.monotonic() - start)
+            try:
+                result = future.result(timeout=max(remaining, 0))
+            except FutureTimeoutError:
+                result = check.record_timeout()
+                logger.warning(
+                    f"Health check {check.name} timed out after {check.timeout}s"
+                )
             results.append(result)
             if check.critical and result["status"] != "healthy":
                 all_healthy = False
@@ -165,6 +274,22 @@ class HealthRegistry:
             "checks": results
         }
 
+    def _submit_checks(self, checks: List[HealthCheck]) -> List[Future]:
+        """Start each check on the pool, reusing runs still in flight."""
+        futures = []
+        with self._pending_lock:
+            if checks and self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=len(checks), thread_name_prefix="health-check"
+                )
+            for check in checks:
+                future = self._pending.get(check)
+                if future is None or future.done():
+                    future = self._executor.submit(check.run)
+                    self._pending[check] = future
+                futures.append(future)
+        return futures
+
     def get_liveness(self) -> Dict[str, Any]:
         """
         Liveness check - is the process alive?
@@ -176,9 +301,21 @@ class HealthRegistry:
             "status": "alive",
             "component": self.component,
             "uptime_seconds": round(time.time() - self.start_time, 1),
-            "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+            "timestamp": _iso_utc_z()
         }
 
+    def get_liveness_bytes(self) -> bytes:
+        """
+        Liveness response pre-encoded as JSON.
+
+        Returns:
+            Same document as ``get_liveness()``, serialized
+        """
+        return self._liveness_template % (
+            round(time.time() - self.start_time, 1),
+            _iso_utc_z().encode("ascii"),
+        )
+
     def get_readiness(self) -> Dict[str, Any]:
         """
         Readiness check - are all critical dependencies available?
@@ -191,7 +328,7 @@ class HealthRegistry:
             "status": "ready" if check_results["status"] == "healthy" else "not_ready",
             "component": self.component,
             "checks": check_results["checks"],
-            "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+            "timestamp": _iso_utc_z()
         }
 
     def get_status(self) -> Dict[str, Any]:
@@ -215,7 +352,7 @@ class HealthRegistry:
             "component": self.component,
             "status": check_results["status"],
             "uptime_seconds": round(time.time() - self.start_time, 1),
-            "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "timestamp": _iso_utc_z(),
             "health_checks": check_results["checks"],
             "circuit_breakers": CircuitBreakers.get_all_stats(),
             "statistics": stats
@@ -231,8 +368,10 @@ class HealthHTTPHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         """Handle GET requests for health endpoints."""
         if self.path == "/health":
-            data = self.registry.get_liveness() if self.registry else {"status": "alive"}
-            self._send_json(200, data)
+            if self.registry:
+                self._send_body(200, self.registry.get_liveness_bytes())
+            else:
+                self._send_json(200, {"status": "alive"})
 
         elif self.path == "/ready":
             if self.registry:
@@ -252,7 +391,12 @@ class HealthHTTPHandler(BaseHTTPRequestHandler):
 
     def _send_json(self, status_code: int, data: Dict[str, Any]):
         """Send JSON response."""
-        body = json.dumps(data, indent=2).encode("utf-8")
+        self._send_body(
+            status_code, orjson.dumps(data, default=str, option=_JSON_OPTIONS)
+        )
+
+    def _send_body(self, status_code: int, body: bytes):
+        """Send an already-encoded JSON body."""
         self.send_response(status_code)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(body)))
@@ -267,7 +411,9 @@ class HealthHTTPHandler(BaseHTTPRequestHandler):
 class HealthServer:
     """
     Threaded HTTP server for health check endpoints.
-    Runs in a daemon thread so it doesn't block shutdown.
+    Runs in a daemon thread so it doesn't block shutdown.  Each request is
+    served on its own thread, so a slow readiness check never holds up a
+    concurrent liveness probe.
 
     Usage:
         registry = HealthRegistry("worker")
@@ -289,20 +435,21 @@ class HealthServer:
         """
         self.registry = registry
         self.port = port
-        self._server: Optional[HTTPServer] = None
+        self._server: Optional[ThreadingHTTPServer] = None
         self._thread: Optional[threading.Thread] = None
-
-    def start(self) -> None:
-        """Start the health check server in a daemon thread."""
-        # Create handler class with registry reference
-        handler = type(
+        # Handler class bound to this registry, built once per server
+        self._handler = type(
             'HealthHandler',
             (HealthHTTPHandler,),
-            {'registry': self.registry}
+            {'registry': registry}
         )
 
+    def start(self) -> None:
+        """Start the health check server in a daemon thread."""
         try:
-            self._server = HTTPServer(("0.0.0.0", self.port), handler)
+            self._server = ThreadingHTTPServer(
+                ("0.0.0.0", self.port), self._handler
+            )
             self._thread = threading.Thread(
                 target=self._server.serve_forever,
                 name="health-server",
@@ -320,6 +467,7 @@ class HealthServer:
         """Stop the health check server."""
         if self._server:
             self._server.shutdown()
+            self._server.server_close()
             logger.info("Health server stopped")
 
     @property
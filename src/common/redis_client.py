@@ -2,6 +2,8 @@
 Redis client wrapper with connection pooling and retry logic.
 Provides high-level abstractions for Redis Streams operations.
 """
+import socket
+
 import redis
 from redis.connection import ConnectionPool
 from redis.exceptions import RedisError, ConnectionError as RedisConnectionError
@@ -18,6 +20,25 @@ from src.common.exceptions import RedisConnectionError as CustomRedisConnectionE
 
 logger = get_logger(__name__)
 
+# Seconds between PINGs on connections idle longer than this, so a
+# half-open socket is detected before a command is sent on it
+HEALTH_CHECK_INTERVAL_SECONDS = 30
+
+
+def _tcp_keepalive_options() -> Dict[int, int]:
+    """
+    TCP keepalive tuning: probe after 30s idle, every 10s, drop after 3 misses.
+
+    Options not exposed by the platform's socket module are skipped, so the
+    OS defaults apply there.
+    """
+    wanted = {"TCP_KEEPIDLE": 30, "TCP_KEEPINTVL": 10, "TCP_KEEPCNT": 3}
+    return {
+        getattr(socket, name): value
+        for name, value in wanted.items()
+        if hasattr(socket, name)
+    }
+
 
 class RedisClient:
     """
@@ -34,7 +55,8 @@ class RedisClient:
         db: int = 0,
         max_connections: int = 20,
         ssl: bool = False,
-        ssl_ca_certs: Optional[str] = None
+        ssl_ca_certs: Optional[str] = None,
+        unix_socket_path: Optional[str] = None
     ):
         """
         Initialize Redis client with connection pool.
@@ -48,29 +70,40 @@ class RedisClient:
             max_connections: Maximum connections in pool
             ssl: Enable SSL/TLS connection
             ssl_ca_certs: Path to CA certificate file for SSL
+            unix_socket_path: Connect over this UNIX domain socket instead of
+                TCP (host, port, ssl and TCP keepalive are then ignored)
         """
         pool_kwargs = dict(
-            host=host,
-            port=port,
             password=password,
             db=db,
             max_connections=max_connections,
-            socket_keepalive=True,
-            socket_keepalive_options={},
+            health_check_interval=HEALTH_CHECK_INTERVAL_SECONDS,
             decode_responses=True,
             socket_connect_timeout=5,
             socket_timeout=5
         )
         if username:
             pool_kwargs['username'] = username
-        if ssl:
-            pool_kwargs['connection_class'] = redis.connection.SSLConnection
-            if ssl_ca_certs:
-                pool_kwargs['ssl_ca_certs'] = ssl_ca_certs
+        if unix_socket_path:
+            pool_kwargs['connection_class'] = redis.connection.UnixDomainSocketConnection
+            pool_kwargs['path'] = unix_socket_path
+            endpoint = f"unix://{unix_socket_path}"
+        else:
+            pool_kwargs.update(
+                host=host,
+                port=port,
+                socket_keepalive=True,
+                socket_keepalive_options=_tcp_keepalive_options(),
+            )
+            if ssl:
+                pool_kwargs['connection_class'] = redis.connection.SSLConnection
+                if ssl_ca_certs:
+                    pool_kwargs['ssl_ca_certs'] = ssl_ca_certs
+            endpoint = f"{host}:{port}"
 
         self.pool = ConnectionPool(**pool_kwargs)
         self.client = redis.Redis(connection_pool=self.pool)
-        logger.info(f"Redis client initialized: {host}:{port}, db={db}")
+        logger.info(f"Redis client initialized: {endpoint}, db={db}")
 
     @retry(
         stop=stop_after_attempt(3),
@@ -411,14 +444,17 @@ class RedisClient:
             logger.error(f"XCLAIM failed: {e}")
             raise CustomRedisConnectionError(f"Failed to claim messages: {e}")
 
-    def pipeline(self):
+    def pipeline(self, transaction: bool = True):
         """
         Create a Redis pipeline for batching commands.
 
+        Args:
+            transaction: Wrap queued commands in MULTI/EXEC
+
         Returns:
             Redis pipeline object
         """
-        return self.client.pipeline()
+        return self.client.pipeline(transaction=transaction)
 
     def __enter__(self):
         """Context manager entry"""
@@ -455,5 +491,6 @@ def create_redis_client_from_config(config) -> RedisClient:
         password=config.redis.password,
         db=config.redis.db,
         ssl=config.redis.ssl,
-        ssl_ca_certs=config.redis.ssl_ca_certs
+        ssl_ca_certs=config.redis.ssl_ca_certs,
+        unix_socket_path=config.redis.unix_socket_path
     )
@@ -0,0 +1,125 @@
+"""
+Shared periodic scheduler.
+Runs lightweight periodic callbacks (metrics refresh, connection checks)
+on a single daemon thread instead of one sleeping thread per component.
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from src.common.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class PeriodicScheduler:
+    """
+    Dispatches periodic jobs from one background thread.
+
+    Jobs run sequentially, so each callback should be short; a slow job
+    delays the others rather than overlapping with itself.
+
+    Usage:
+        scheduler = PeriodicScheduler()
+        scheduler.add_job("metrics", updater.tick, interval=15)
+        scheduler.add_job("watchdog", watchdog.tick, interval=30)
+        scheduler.start()
+        # ...
+        scheduler.stop()
+    """
+
+    def __init__(self, name: str = "periodic-scheduler"):
+        """
+        Initialize scheduler.
+
+        Args:
+            name: Name of the background thread
+        """
+        self.name = name
+        self._jobs: List[Tuple[str, Callable[[], None], float, bool]] = []
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], None],
+        interval: float,
+        run_immediately: bool = True
+    ) -> None:
+        """
+        Register a periodic job. Must be called before start().
+
+        Args:
+            name: Job name (used in logs)
+            func: Callable invoked on each tick
+            interval: Seconds between runs
+            run_immediately: Run once at start instead of after the first interval
+
+        Raises:
+            ValueError: If interval is not positive
+            RuntimeError: If the scheduler is already running
+        """
+        if interval <= 0:
+            raise ValueError(f"Job interval must be positive, got {interval}")
+        if self.is_running:
+            raise RuntimeError("Cannot add jobs to a running scheduler")
+        self._jobs.append((name, func, float(interval), run_immediately))
+        logger.debug(f"Scheduled job '{name}' every {interval}s")
+
+    def start(self) -> None:
+        """Start the scheduler thread."""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=self.name, daemon=True
+        )
+        self._thread.start()
+        logger.info(f"PeriodicScheduler started ({len(self._jobs)} jobs)")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the scheduler thread.
+
+        Args:
+            timeout: Seconds to wait for a running job to finish
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        logger.info("PeriodicScheduler stopped")
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        """Main loop: sleep until the earliest job is due, run it, reschedule."""
+        now = time.monotonic()
+        counter = itertools.count()
+        queue = [
+            (now if immediate else now + interval, next(counter), name, func, interval)
+            for name, func, interval, immediate in self._jobs
+        ]
+        heapq.heapify(queue)
+
+        while queue and not self._stop_event.is_set():
+            due, _, name, func, interval = queue[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                if self._stop_event.wait(delay):
+                    break
+                continue
+
+            heapq.heappop(queue)
+            try:
+                func()
+            except Exception as e:
+                logger.warning(f"Scheduled job '{name}' failed: {e}")
+
+            # Skip missed ticks instead of running a burst to catch up
+            next_due = max(due + interval, time.monotonic())
+            heapq.heappush(queue, (next_due, next(counter), name, func, interval))
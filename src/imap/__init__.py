@@ -1,6 +1,15 @@
 """IMAP package"""
-from src.imap.imap_client import GmailIMAPClient, EmailMessage, create_imap_client_from_config
-from src.imap.outlook_imap_client import OutlookIMAPClient, create_outlook_imap_client_from_config
+import importlib
+
+# Load each client module only when one of its names is first accessed, so
+# a single-provider process never imports the other provider's auth SDK.
+_LAZY_EXPORTS = {
+    "GmailIMAPClient": "src.imap.imap_client",
+    "EmailMessage": "src.imap.imap_client",
+    "create_imap_client_from_config": "src.imap.imap_client",
+    "OutlookIMAPClient": "src.imap.outlook_imap_client",
+    "create_outlook_imap_client_from_config": "src.imap.outlook_imap_client",
+}
 
 __all__ = [
     "GmailIMAPClient",
@@ -9,3 +18,10 @@ __all__ = [
     "OutlookIMAPClient",
     "create_outlook_imap_client_from_config",
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
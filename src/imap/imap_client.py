@@ -3,22 +3,46 @@ IMAP client with OAuth2 authentication and UID/UIDVALIDITY tracking.
 Handles email fetching with proper state management.
 """
 import email
+import time
+from functools import lru_cache
 from email.header import decode_header
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable, TYPE_CHECKING
 from datetime import datetime, timezone
-import json
 
+import orjson
 from imapclient import IMAPClient
 from imapclient.exceptions import IMAPClientError
 
-from src.auth.oauth2_gmail import OAuth2Gmail
 from src.common.logging_config import get_logger
 from src.common.retry import retry_on_imap_error
 from src.common.exceptions import IMAPConnectionError
 
+if TYPE_CHECKING:
+    from src.auth.oauth2_gmail import OAuth2Gmail
+
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _utc_isoformat(value: datetime) -> str:
+    """
+    Format a UTC datetime as ISO 8601 with a Z suffix.
+
+    Messages from one fetch share a fetched_at value, so the single-entry
+    cache formats it once per batch instead of once per message.
+    """
+    return value.isoformat().replace("+00:00", "Z")
+
+
+# Items requested per message by fetch_messages()
+FETCH_ITEMS = [
+    'RFC822.SIZE',
+    'ENVELOPE',
+    'BODY.PEEK[HEADER]',
+    'BODY.PEEK[TEXT]<0.5000>'  # First 5KB of body
+]
+
+
 class EmailMessage:
     """Represents a parsed email message"""
 
@@ -35,7 +59,8 @@ class EmailMessage:
         body_html: str,
         size: int,
         headers: Dict[str, str],
-        message_id: str
+        message_id: str,
+        fetched_at: Optional[datetime] = None
     ):
         self.uid = uid
         self.uidvalidity = uidvalidity
@@ -49,7 +74,7 @@ class EmailMessage:
         self.size = size
         self.headers = headers
         self.message_id = message_id
-        self.fetched_at = datetime.now(timezone.utc)
+        self.fetched_at = fetched_at or datetime.now(timezone.utc)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for Redis storage"""
@@ -66,12 +91,16 @@ class EmailMessage:
             "size": self.size,
             "headers": self.headers,
             "message_id": self.message_id,
-            "fetched_at": self.fetched_at.isoformat() + "Z"
+            "fetched_at": _utc_isoformat(self.fetched_at)
         }
 
     def to_json(self) -> str:
         """Convert to JSON string"""
-        return json.dumps(self.to_dict(), ensure_ascii=False)
+        return self.to_json_bytes().decode("utf-8")
+
+    def to_json_bytes(self) -> bytes:
+        """Convert to UTF-8 encoded JSON, ready to be sent to Redis as-is"""
+        return orjson.dumps(self.to_dict())
 
 
 class GmailIMAPClient:
@@ -80,9 +109,12 @@ class GmailIMAPClient:
     Handles UID/UIDVALIDITY tracking and email fetching.
     """
 
+    # RFC 2177: re-issue IDLE at least every 29 minutes
+    IDLE_MAX_SECONDS = 29 * 60
+
     def __init__(
         self,
-        oauth2: OAuth2Gmail,
+        oauth2: "OAuth2Gmail",
         username: str,
         host: str = "imap.gmail.com",
         port: int = 993
@@ -142,6 +174,21 @@ class GmailIMAPClient:
                 self.current_mailbox = None
                 self.current_uidvalidity = None
 
+    def noop(self):
+        """
+        Send NOOP to keep an idle connection open.
+
+        Raises:
+            IMAPConnectionError: If not connected or the server does not answer
+        """
+        if not self.client:
+            raise IMAPConnectionError("Not connected")
+        try:
+            self.client.noop()
+        except Exception as e:
+            logger.warning(f"IMAP NOOP failed: {e}")
+            raise IMAPConnectionError(f"IMAP NOOP failed: {e}")
+
     def select_mailbox(self, mailbox: str = "INBOX") -> Tuple[int, int]:
         """
         Select mailbox and get UIDVALIDITY and message count.
@@ -233,17 +280,12 @@ class GmailIMAPClient:
             return []
 
         try:
-            # Fetch message data
-            fetch_data = self.client.fetch(
-                uids,
-                [
-                    'RFC822.SIZE',
-                    'ENVELOPE',
-                    'BODY.PEEK[HEADER]',
-                    'BODY.PEEK[TEXT]<0.5000>'  # First 5KB of body
-                ]
-            )
+            # A single UID FETCH for the given UIDs; callers keep the list
+            # bounded (the producer chunks by IMAP_FETCH_CHUNK_SIZE)
+            fetch_data = self.client.fetch(uids, FETCH_ITEMS)
 
+            # One timestamp for the whole fetch, shared by every message
+            fetched_at = datetime.now(timezone.utc)
             messages = []
             for uid in uids:
                 if uid not in fetch_data:
@@ -251,7 +293,7 @@ class GmailIMAPClient:
                     continue
 
                 msg_data = fetch_data[uid]
-                email_msg = self._parse_message(uid, msg_data)
+                email_msg = self._parse_message(uid, msg_data, fetched_at)
                 messages.append(email_msg)
 
             logger.info(f"Fetched and parsed {len(messages)} messages")
@@ -261,13 +303,80 @@ class GmailIMAPClient:
             logger.error(f"Failed to fetch messages: {e}")
             raise IMAPConnectionError(f"Failed to fetch messages: {e}")
 
-    def _parse_message(self, uid: int, msg_data: Dict) -> EmailMessage:
+    def supports_idle(self) -> bool:
+        """
+        Check if the connected server advertises the IDLE capability.
+
+        Returns:
+            True if IDLE can be used, False otherwise (or when disconnected)
+        """
+        if not self.client:
+            return False
+        try:
+            return bool(self.client.has_capability("IDLE"))
+        except Exception as e:
+            logger.debug(f"Could not query IMAP capabilities: {e}")
+            return False
+
+    def idle_wait(
+        self,
+        timeout: float,
+        should_stop: Optional[Callable[[], bool]] = None,
+        check_interval: float = 5.0
+    ) -> bool:
+        """
+        Block in IMAP IDLE until the server announces new messages.
+
+        Args:
+            timeout: Maximum seconds to wait (capped at IDLE_MAX_SECONDS)
+            should_stop: Optional callable; IDLE ends early when it returns True
+            check_interval: Seconds between should_stop checks
+
+        Returns:
+            True if an EXISTS notification arrived, False on timeout or stop
+
+        Raises:
+            IMAPConnectionError: If no mailbox is selected or IDLE fails
+        """
+        if not self.client or not self.current_mailbox:
+            raise IMAPConnectionError("No mailbox selected")
+
+        deadline = time.monotonic() + min(timeout, self.IDLE_MAX_SECONDS)
+        new_mail = False
+
+        try:
+            self.client.idle()
+            while not new_mail:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (should_stop and should_stop()):
+                    break
+                responses = self.client.idle_check(timeout=min(remaining, check_interval))
+                new_mail = any(
+                    len(response) > 1 and response[1] == b'EXISTS'
+                    for response in responses
+                )
+            self.client.idle_done()
+        except Exception as e:
+            logger.error(f"IMAP IDLE failed: {e}")
+            raise IMAPConnectionError(f"IMAP IDLE failed: {e}")
+
+        if new_mail:
+            logger.debug(f"IDLE: new messages announced in '{self.current_mailbox}'")
+        return new_mail
+
+    def _parse_message(
+        self,
+        uid: int,
+        msg_data: Dict,
+        fetched_at: Optional[datetime] = None
+    ) -> EmailMessage:
         """
         Parse raw IMAP message data into EmailMessage.
 
         Args:
             uid: Message UID
             msg_data: Raw message data from IMAP fetch
+            fetched_at: Fetch timestamp (UTC); defaults to now
 
         Returns:
             EmailMessage object
@@ -304,7 +413,8 @@ class GmailIMAPClient:
             body_html='',  # Not fetching full HTML for efficiency
             size=size,
             headers=headers,
-            message_id=message_id
+            message_id=message_id,
+            fetched_at=fetched_at
         )
 
     @staticmethod
@@ -367,7 +477,7 @@ class GmailIMAPClient:
 
 
 # Factory function
-def create_imap_client_from_config(config, oauth2: OAuth2Gmail) -> GmailIMAPClient:
+def create_imap_client_from_config(config, oauth2: "OAuth2Gmail") -> GmailIMAPClient:
     """
     Create GmailIMAPClient from configuration.
 
@@ -3,16 +3,18 @@ IMAP client for Outlook/Microsoft 365 with OAuth2 authentication.
 Handles email fetching via IMAP with UID/UIDVALIDITY tracking.
 Reuses the same EmailMessage data class as the Gmail client.
 """
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, TYPE_CHECKING
 
 from imapclient import IMAPClient
 
-from src.auth.oauth2_outlook import OAuth2Outlook
 from src.imap.imap_client import EmailMessage, GmailIMAPClient
 from src.common.logging_config import get_logger
 from src.common.retry import retry_on_imap_error
 from src.common.exceptions import IMAPConnectionError
 
+if TYPE_CHECKING:
+    from src.auth.oauth2_outlook import OAuth2Outlook
+
 logger = get_logger(__name__)
 
 
@@ -27,7 +29,7 @@ class OutlookIMAPClient(GmailIMAPClient):
 
     def __init__(
         self,
-        oauth2: OAuth2Outlook,
+        oauth2: "OAuth2Outlook",
         username: str,
         host: str = "outlook.office365.com",
         port: int = 993,
@@ -83,7 +85,7 @@ class OutlookIMAPClient(GmailIMAPClient):
 
 # Factory function
 def create_outlook_imap_client_from_config(
-    config, oauth2: OAuth2Outlook
+    config, oauth2: "OAuth2Outlook"
 ) -> OutlookIMAPClient:
     """
     Create OutlookIMAPClient from configuration.
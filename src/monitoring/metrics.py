@@ -338,13 +338,21 @@ class BackgroundMetricsUpdater:
     def is_running(self) -> bool:
         return self._thread is not None and self._thread.is_alive()
 
+    def tick(self) -> None:
+        """
+        Run one update cycle without the dedicated thread.
+
+        Lets a shared ``PeriodicScheduler`` drive the updater at ``interval``.
+        """
+        try:
+            self._update()
+        except Exception as exc:
+            logger.warning(f"BackgroundMetricsUpdater error: {exc}")
+
     def _run(self) -> None:
         """Main loop executed in the daemon thread."""
         while not self._stop_event.is_set():
-            try:
-                self._update()
-            except Exception as exc:
-                logger.warning(f"BackgroundMetricsUpdater error: {exc}")
+            self.tick()
             self._stop_event.wait(self.interval)
 
     def _update(self) -> None:
@@ -11,6 +11,22 @@ from src.common.exceptions import StateManagementError
 
 logger = get_logger(__name__)
 
+# Compare-and-set for the post-batch state write. Runs server-side so the
+# UIDVALIDITY check, UID/timestamp updates and email count increment cost a
+# single round-trip. Returns the new email total, or -1 on UIDVALIDITY mismatch.
+# KEYS: uidvalidity, last_uid, last_poll, total_emails
+# ARGV: uidvalidity, last_uid, timestamp, count
+_UPDATE_AND_INCREMENT_SCRIPT = """
+local stored = redis.call('GET', KEYS[1])
+if stored and stored ~= ARGV[1] then
+    return -1
+end
+redis.call('SET', KEYS[1], ARGV[1])
+redis.call('SET', KEYS[2], ARGV[2])
+redis.call('SET', KEYS[3], ARGV[3])
+return redis.call('INCRBY', KEYS[4], ARGV[4])
+"""
+
 
 class ProducerStateManager:
     """
@@ -29,9 +45,15 @@ class ProducerStateManager:
         self.redis = redis_client
         self.username = username
         self.key_prefix = f"producer_state:{username}"
+        self._update_script = None
 
         logger.info(f"State manager initialized for {username}")
 
+    @staticmethod
+    def _utc_timestamp() -> str:
+        """Current UTC time as an ISO 8601 string with a Z suffix"""
+        return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
     def _make_key(self, mailbox: str, key_type: str) -> str:
         """
         Generate Redis key for state storage.
@@ -196,7 +218,7 @@ class ProducerStateManager:
         """
         try:
             key = self._make_key(mailbox, "last_poll")
-            timestamp = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+            timestamp = self._utc_timestamp()
             self.redis.set(key, timestamp)
 
             logger.debug(f"Updated last poll time for {mailbox}: {timestamp}")
@@ -318,6 +340,64 @@ class ProducerStateManager:
             logger.error(f"Failed atomic state update for {mailbox}: {e}")
             raise StateManagementError(f"Failed to update state: {e}")
 
+    def update_and_increment(
+        self,
+        mailbox: str,
+        current_uidvalidity: int,
+        new_last_uid: int,
+        count: int
+    ) -> int:
+        """
+        Update mailbox state and email count in a single Redis round-trip.
+
+        Combines atomic_update_state() and increment_email_count() into one
+        server-side script: UIDVALIDITY is verified, last UID, UIDVALIDITY
+        and last poll time are stored, and the email count is incremented.
+
+        Args:
+            mailbox: Mailbox name
+            current_uidvalidity: Current UIDVALIDITY
+            new_last_uid: New last processed UID
+            count: Number of emails pushed in this batch
+
+        Returns:
+            New total email count for the mailbox
+
+        Raises:
+            StateManagementError: If UIDVALIDITY mismatch or update fails
+        """
+        try:
+            if self._update_script is None:
+                self._update_script = self.redis.client.register_script(
+                    _UPDATE_AND_INCREMENT_SCRIPT
+                )
+
+            total = self._update_script(
+                keys=[
+                    self._make_key(mailbox, "uidvalidity"),
+                    self._make_key(mailbox, "last_uid"),
+                    self._make_key(mailbox, "last_poll"),
+                    self._make_key(mailbox, "total_emails"),
+                ],
+                args=[current_uidvalidity, new_last_uid, self._utc_timestamp(), count]
+            )
+        except Exception as e:
+            logger.error(f"Failed atomic state update for {mailbox}: {e}")
+            raise StateManagementError(f"Failed to update state: {e}")
+
+        if total == -1:
+            logger.error(
+                f"UIDVALIDITY mismatch during update for {mailbox}. "
+                "Mailbox may have been reset."
+            )
+            raise StateManagementError("UIDVALIDITY mismatch during state update")
+
+        logger.info(
+            f"State updated for {mailbox}: "
+            f"UIDVALIDITY={current_uidvalidity}, last_UID={new_last_uid}, total={total}"
+        )
+        return total
+
 
 # Factory function
 def create_state_manager_from_config(config, redis_client: RedisClient, username: str) -> ProducerStateManager:
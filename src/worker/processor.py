@@ -5,9 +5,10 @@ Implements normalization, validation, classification, and output forwarding.
 """
 from typing import Dict, Any, Optional, Callable, List
 from datetime import datetime, timezone
-import json
 import re
 
+import orjson
+
 from src.common.logging_config import get_logger
 from src.common.exceptions import ProcessingError
 
@@ -177,11 +178,12 @@ class EmailProcessor:
         # --- Forward to output stream ---
         if self.output_stream and self.redis_client:
             try:
-                payload = json.dumps(result, ensure_ascii=False, default=str)
+                payload = orjson.dumps(result, default=str)
                 self.redis_client.xadd(
                     self.output_stream,
                     {"payload": payload},
                     maxlen=10000,
+                    approximate=True,
                 )
                 logger.debug(
                     f"Forwarded {result['message_id']} to {self.output_stream}"
@@ -372,7 +374,8 @@ def create_processor_from_config(
         Configured EmailProcessor instance
     """
     try:
-        from config.settings import settings
+        from config.settings import get_settings
+        settings = get_settings()
         output_stream = settings.processor.output_stream_name
         max_size = settings.processor.max_email_size_bytes
     except Exception:
@@ -251,6 +251,14 @@ class ConnectionWatchdog:
             self._thread.join(timeout=5.0)
         logger.info("ConnectionWatchdog stopped")
 
+    def tick(self) -> None:
+        """
+        Run all checks once without the dedicated thread.
+
+        Lets a shared PeriodicScheduler drive the watchdog at check_interval.
+        """
+        self._check_all()
+
     def _run_loop(self) -> None:
         """Main watchdog loop."""
         while self._running:
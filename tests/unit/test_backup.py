@@ -50,6 +50,19 @@ class TestTriggerBgsave:
         result = trigger_bgsave(client, timeout=1)
         assert result is False
 
+    @patch("scripts.backup.time.sleep")
+    def test_bgsave_polls_with_backoff(self, mock_sleep):
+        client = MagicMock()
+        t0 = datetime(2026, 1, 1, 0, 0, 0)
+        t1 = datetime(2026, 1, 1, 0, 0, 5)
+        client.lastsave.side_effect = [t0, t0, t0, t0, t0, t1]
+
+        assert trigger_bgsave(client, timeout=10) is True
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        assert delays[0] == pytest.approx(0.02)
+        assert delays == sorted(delays)
+        assert max(delays) <= 0.5
+
 
 # -----------------------------------------------------------------------
 # locate_rdb_file
@@ -105,6 +118,55 @@ class TestCopyBackup:
         assert dest.name.endswith(".rdb")
         assert dest.read_bytes() == b"REDIS0009"
 
+    def test_preserves_mtime(self, tmp_path):
+        rdb = tmp_path / "dump.rdb"
+        rdb.write_bytes(b"REDIS0009" * 1000)
+        old = time.time() - 3600
+        os.utime(rdb, (old, old))
+
+        dest = copy_backup(rdb, tmp_path / "backups")
+
+        assert dest.read_bytes() == rdb.read_bytes()
+        assert abs(dest.stat().st_mtime - old) < 1
+
+    def test_falls_back_when_copy_file_range_fails(self, tmp_path):
+        rdb = tmp_path / "dump.rdb"
+        rdb.write_bytes(b"REDIS0009")
+
+        with patch("scripts.backup.os.copy_file_range", create=True,
+                   side_effect=OSError(18, "Invalid cross-device link")):
+            dest = copy_backup(rdb, tmp_path / "backups")
+
+        assert dest.read_bytes() == b"REDIS0009"
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="FICLONE is Linux-only")
+    def test_uses_reflink_when_supported(self, tmp_path):
+        rdb = tmp_path / "dump.rdb"
+        rdb.write_bytes(b"REDIS0009")
+        mock_fcntl = MagicMock()
+        mock_fcntl.ioctl.side_effect = (
+            lambda dest_fd, request, src_fd: os.write(dest_fd, os.pread(src_fd, 64, 0))
+        )
+
+        with patch("scripts.backup.fcntl", mock_fcntl), \
+             patch("scripts.backup.os.copy_file_range", create=True) as mock_range:
+            dest = copy_backup(rdb, tmp_path / "backups")
+
+        assert mock_fcntl.ioctl.call_args.args[1] == 0x40049409
+        mock_range.assert_not_called()
+        assert dest.read_bytes() == b"REDIS0009"
+
+    def test_falls_back_when_reflink_fails(self, tmp_path):
+        rdb = tmp_path / "dump.rdb"
+        rdb.write_bytes(b"REDIS0009")
+        mock_fcntl = MagicMock()
+        mock_fcntl.ioctl.side_effect = OSError(95, "Operation not supported")
+
+        with patch("scripts.backup.fcntl", mock_fcntl):
+            dest = copy_backup(rdb, tmp_path / "backups")
+
+        assert dest.read_bytes() == b"REDIS0009"
+
     def test_creates_output_dir(self, tmp_path):
         rdb = tmp_path / "dump.rdb"
         rdb.write_bytes(b"data")
@@ -165,6 +227,16 @@ class TestListBackups:
     def test_empty_dir(self, tmp_path):
         assert list_backups(tmp_path) == []
 
+    def test_missing_dir(self, tmp_path):
+        assert list_backups(tmp_path / "missing") == []
+
+    def test_ignores_directories(self, tmp_path):
+        (tmp_path / "redis_20260201_120000.rdb").mkdir()
+        (tmp_path / "redis_20260202_120000.rdb").write_bytes(b"a")
+
+        result = list_backups(tmp_path)
+        assert [p.name for p in result] == ["redis_20260202_120000.rdb"]
+
 
 # -----------------------------------------------------------------------
 # run_backup (integration-style with mocks)
@@ -200,6 +272,16 @@ class TestRunBackup:
         assert result is True
         assert len(list_backups(out)) == 1
 
+    @patch("scripts.backup._connect_redis")
+    def test_run_backup_passes_unix_socket(self, mock_connect, tmp_path):
+        mock_connect.return_value.ping.side_effect = Exception("stop here")
+
+        run_backup(
+            output_dir=str(tmp_path / "backups"),
+            unix_socket_path="/run/redis.sock",
+        )
+        assert mock_connect.call_args.args[-1] == "/run/redis.sock"
+
     @patch("scripts.backup._connect_redis")
     def test_run_backup_connect_fail(self, mock_connect, tmp_path):
         client = MagicMock()
@@ -4,7 +4,9 @@ Unit tests for BatchProducer and BatchAcknowledger.
 import unittest
 from unittest.mock import MagicMock, patch
 
-from src.common.batch import BatchProducer, BatchAcknowledger
+from redis.exceptions import NoScriptError, ResponseError
+
+from src.common.batch import BatchProducer, BatchAcknowledger, XACK_MAX_IDS
 
 
 class TestBatchProducer(unittest.TestCase):
@@ -14,6 +16,8 @@ class TestBatchProducer(unittest.TestCase):
         self.redis = MagicMock()
         self.pipe = MagicMock()
         self.redis.pipeline.return_value = self.pipe
+        self.script = MagicMock()
+        self.redis.client.register_script.return_value = self.script
 
     def test_add_buffers_messages(self):
         producer = BatchProducer(
@@ -24,7 +28,7 @@ class TestBatchProducer(unittest.TestCase):
         self.assertEqual(producer.pending_count, 1)
 
     def test_auto_flush_on_batch_size(self):
-        self.pipe.execute.return_value = ["id1", "id2", "id3"]
+        self.script.return_value = ["id1", "id2", "id3"]
         producer = BatchProducer(
             self.redis, "stream", batch_size=3
         )
@@ -36,27 +40,190 @@ class TestBatchProducer(unittest.TestCase):
         self.assertEqual(len(result), 3)
         self.assertEqual(producer.pending_count, 0)
 
-    def test_flush_sends_via_pipeline(self):
-        self.pipe.execute.return_value = ["id1", "id2"]
+    def test_flush_sends_one_script_call(self):
+        self.script.return_value = ["id1", "id2"]
         producer = BatchProducer(
             self.redis, "stream", batch_size=10
         )
         producer.add({"k": "1"})
+        producer.add({"a": "x", "b": 2})
+
+        result = producer.flush()
+
+        self.assertEqual(result, ["id1", "id2"])
+        self.script.assert_called_once_with(
+            keys=["stream"],
+            args=[0, 1, "k", "1", 2, "a", "x", "b", 2],
+        )
+        self.pipe.execute.assert_not_called()
+
+    def test_add_raw_packs_payload_field(self):
+        self.script.return_value = ["id1"]
+        producer = BatchProducer(self.redis, "stream", batch_size=10, maxlen=1000)
+        producer.add_raw(b'{"uid": 1}')
+
+        result = producer.flush()
+
+        self.assertEqual(result, ["id1"])
+        self.script.assert_called_once_with(
+            keys=["stream"],
+            args=[3, b"MAXLEN", b"~", b"1000", 1, b"payload", b'{"uid": 1}'],
+        )
+
+    def test_add_raw_exact_trim(self):
+        self.script.return_value = ["id1"]
+        producer = BatchProducer(
+            self.redis, "stream", batch_size=10, maxlen=50, approximate=False
+        )
+        producer.add_raw(b"x")
+        producer.flush()
+
+        self.script.assert_called_once_with(
+            keys=["stream"], args=[2, b"MAXLEN", b"50", 1, b"payload", b"x"]
+        )
+
+    def test_add_raw_auto_flush(self):
+        self.script.return_value = ["id1", "id2"]
+        producer = BatchProducer(self.redis, "stream", batch_size=2)
+        self.assertIsNone(producer.add_raw(b"a"))
+        self.assertEqual(len(producer.add_raw(b"b")), 2)
+
+    def test_auto_flush_disabled(self):
+        self.script.return_value = ["id1", "id2", "id3"]
+        producer = BatchProducer(
+            self.redis, "stream", batch_size=2, flush_interval_ms=0,
+            auto_flush=False
+        )
+        self.assertIsNone(producer.add_raw(b"a"))
+        self.assertIsNone(producer.add({"k": "v"}))
+        self.assertIsNone(producer.add_raw(b"c"))
+        self.script.assert_not_called()
+        self.assertEqual(producer.pending_count, 3)
+        self.assertEqual(producer.flush(), ["id1", "id2", "id3"])
+
+    def test_script_registered_once(self):
+        self.script.return_value = ["id1"]
+        producer = BatchProducer(self.redis, "stream", batch_size=10)
+        producer.add({"k": "1"})
+        producer.flush()
         producer.add({"k": "2"})
+        producer.flush()
+
+        self.redis.client.register_script.assert_called_once()
+        self.assertEqual(self.script.call_count, 2)
+
+    def test_noscript_falls_back_to_pipeline(self):
+        self.script.side_effect = NoScriptError("No matching script")
+        self.pipe.execute.return_value = ["id1"]
+        producer = BatchProducer(self.redis, "stream", batch_size=10, maxlen=1000)
+        producer.add_raw(b"x")
 
         result = producer.flush()
 
-        self.assertEqual(len(result), 2)
-        self.assertEqual(self.pipe.xadd.call_count, 2)
-        self.pipe.execute.assert_called_once()
+        self.assertEqual(result, ["id1"])
+        self.redis.pipeline.assert_called_once_with(transaction=False)
+        self.pipe.execute_command.assert_called_once_with(
+            b"XADD", b"stream", b"MAXLEN", b"~", b"1000", b"*", b"payload", b"x"
+        )
+        self.pipe.execute.assert_called_once_with(raise_on_error=False)
+
+    def test_flush_passes_bytes_ids_through(self):
+        self.script.return_value = [b"1-0", b"1-1"]
+        producer = BatchProducer(self.redis, "stream", batch_size=10)
+        producer.add_raw(b"a")
+        producer.add_raw(b"b")
+
+        self.assertEqual(producer.flush(), [b"1-0", b"1-1"])
+
+    def test_flush_returns_count_without_ids(self):
+        self.script.return_value = ["id1", "id2"]
+        producer = BatchProducer(self.redis, "stream", batch_size=10, return_ids=False)
+        self.assertEqual(producer.flush(), 0)
+        producer.add_raw(b"a")
+        producer.add_raw(b"b")
+
+        self.assertEqual(producer.flush(), 2)
+        self.assertEqual(producer.total_sent, 2)
+
+    def test_flush_each_reports_per_message_outcome(self):
+        error = ResponseError("OOM")
+        self.script.return_value = ["id1", error, "id3"]
+        producer = BatchProducer(self.redis, "stream", batch_size=10)
+        for payload in (b"a", b"b", b"c"):
+            producer.add_raw(payload)
+
+        outcomes = producer.flush_each()
+
+        self.assertEqual(outcomes, ["id1", error, "id3"])
+        self.assertEqual(producer.pending_count, 0)
+        self.assertEqual(producer.total_sent, 2)
+
+    def test_flush_raises_on_message_error(self):
+        self.script.return_value = ["id1", ResponseError("OOM")]
+        producer = BatchProducer(self.redis, "stream", batch_size=10)
+        producer.add_raw(b"a")
+        producer.add_raw(b"b")
+
+        with self.assertRaises(ResponseError):
+            producer.flush()
+
+        self.assertEqual(producer.pending_count, 2)
+
+    @patch("src.common.batch.time.monotonic")
+    def test_flush_interval_flushes_stale_partial_batch(self, mock_clock):
+        self.script.return_value = ["id1", "id2"]
+        producer = BatchProducer(self.redis, "stream", batch_size=10, flush_interval_ms=100)
+        mock_clock.return_value = 1.0
+        self.assertIsNone(producer.add_raw(b"a"))
+        mock_clock.return_value = 1.05
+        self.assertIsNone(producer.add_raw(b"b"))
+        mock_clock.return_value = 1.2
+
+        self.assertEqual(producer.add_raw(b"c"), ["id1", "id2"])
+        self.script.assert_called_once()
+
+    def test_no_flush_interval_by_default(self):
+        producer = BatchProducer(self.redis, "stream", batch_size=10)
+        with patch("src.common.batch.time.monotonic") as mock_clock:
+            producer.add_raw(b"a")
+            producer.add_raw(b"b")
+        mock_clock.assert_not_called()
+        self.script.assert_not_called()
+
+    def test_reset_clears_buffer_and_resizes(self):
+        producer = BatchProducer(self.redis, "stream", batch_size=10)
+        producer.add({"k": "1"})
+
+        producer.reset(batch_size=3)
+
+        self.assertEqual(producer.pending_count, 0)
+        self.assertEqual(producer.batch_size, 3)
+
+    def test_reset_drops_queued_script_args(self):
+        self.script.return_value = ["id1"]
+        producer = BatchProducer(self.redis, "stream", batch_size=10)
+        producer.add_raw(b"dropped")
+        producer.reset()
+        producer.add_raw(b"kept")
+
+        producer.flush()
+
+        self.script.assert_called_once_with(
+            keys=["stream"], args=[0, 1, b"payload", b"kept"]
+        )
+
+    def test_uses_slots(self):
+        producer = BatchProducer(self.redis, "stream")
+        self.assertFalse(hasattr(producer, "__dict__"))
 
     def test_flush_empty_buffer(self):
         producer = BatchProducer(self.redis, "stream")
         result = producer.flush()
         self.assertEqual(result, [])
+        self.script.assert_not_called()
 
     def test_stats_tracking(self):
-        self.pipe.execute.return_value = ["id1", "id2"]
+        self.script.return_value = ["id1", "id2"]
         producer = BatchProducer(
             self.redis, "stream", batch_size=10
         )
@@ -71,7 +238,7 @@ class TestBatchProducer(unittest.TestCase):
         self.assertEqual(stats["pending"], 0)
 
     def test_flush_error_keeps_buffer(self):
-        self.pipe.execute.side_effect = Exception("Connection lost")
+        self.script.side_effect = Exception("Connection lost")
         producer = BatchProducer(self.redis, "stream")
         producer.add({"k": "1"})
 
@@ -81,6 +248,22 @@ class TestBatchProducer(unittest.TestCase):
         # Buffer should be retained for retry
         self.assertEqual(producer.pending_count, 1)
 
+    def test_add_after_failed_flush_grows_buffer(self):
+        self.script.side_effect = [Exception("Connection lost"), ["id1", "id2", "id3"]]
+        producer = BatchProducer(self.redis, "stream", batch_size=2)
+        producer.add_raw(b"a")
+        with self.assertRaises(Exception):
+            producer.add_raw(b"b")
+
+        result = producer.add_raw(b"c")
+
+        self.assertEqual(result, ["id1", "id2", "id3"])
+        self.assertEqual(
+            self.script.call_args.kwargs["args"],
+            [0, 1, b"payload", b"a", 1, b"payload", b"b", 1, b"payload", b"c"],
+        )
+        self.assertEqual(producer.pending_count, 0)
+
 
 class TestBatchAcknowledger(unittest.TestCase):
     """Tests for BatchAcknowledger."""
@@ -99,7 +282,7 @@ class TestBatchAcknowledger(unittest.TestCase):
         self.assertEqual(acker.pending_count, 1)
 
     def test_auto_flush_on_batch_size(self):
-        self.pipe.execute.return_value = [1, 1, 1]
+        self.redis.xack.return_value = 3
         acker = BatchAcknowledger(
             self.redis, "stream", "group", batch_size=3
         )
@@ -110,8 +293,8 @@ class TestBatchAcknowledger(unittest.TestCase):
         self.assertEqual(result, 3)
         self.assertEqual(acker.pending_count, 0)
 
-    def test_flush_sends_via_pipeline(self):
-        self.pipe.execute.return_value = [1, 1]
+    def test_flush_sends_single_xack(self):
+        self.redis.xack.return_value = 2
         acker = BatchAcknowledger(
             self.redis, "stream", "group"
         )
@@ -120,7 +303,40 @@ class TestBatchAcknowledger(unittest.TestCase):
         count = acker.flush()
 
         self.assertEqual(count, 2)
+        self.redis.xack.assert_called_once_with("stream", "group", "msg-1", "msg-2")
+        self.redis.pipeline.assert_not_called()
+
+    def test_large_flush_split_into_pipelined_xacks(self):
+        self.pipe.execute.return_value = [XACK_MAX_IDS, 5]
+        acker = BatchAcknowledger(
+            self.redis, "stream", "group", batch_size=XACK_MAX_IDS + 10
+        )
+        for i in range(XACK_MAX_IDS + 5):
+            acker.add(f"msg-{i}")
+
+        count = acker.flush()
+
+        self.assertEqual(count, XACK_MAX_IDS + 5)
         self.assertEqual(self.pipe.xack.call_count, 2)
+        self.assertEqual(len(self.pipe.xack.call_args_list[1].args), 2 + 5)
+        self.redis.xack.assert_not_called()
+
+    @patch("src.common.batch.time.monotonic")
+    def test_flush_interval_flushes_stale_acks(self, mock_clock):
+        self.redis.xack.return_value = 2
+        acker = BatchAcknowledger(
+            self.redis, "stream", "group", batch_size=10, flush_interval_ms=50
+        )
+        mock_clock.return_value = 5.0
+        self.assertIsNone(acker.add("msg-1"))
+        mock_clock.return_value = 5.1
+
+        self.assertEqual(acker.add("msg-2"), 2)
+        self.assertEqual(acker.pending_count, 0)
+
+    def test_uses_slots(self):
+        acker = BatchAcknowledger(self.redis, "stream", "group")
+        self.assertFalse(hasattr(acker, "__dict__"))
 
     def test_flush_empty(self):
         acker = BatchAcknowledger(
@@ -130,7 +346,7 @@ class TestBatchAcknowledger(unittest.TestCase):
         self.assertEqual(count, 0)
 
     def test_stats(self):
-        self.pipe.execute.return_value = [1, 1]
+        self.redis.xack.return_value = 2
         acker = BatchAcknowledger(
             self.redis, "stream", "group"
         )
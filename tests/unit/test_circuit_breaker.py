@@ -1,9 +1,11 @@
 """
 Unit tests for CircuitBreaker and CircuitBreakers registry.
 """
+import gc
+import threading
 import time
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from src.common.circuit_breaker import (
     CircuitBreaker,
@@ -53,6 +55,131 @@ class TestCircuitBreaker(unittest.TestCase):
         # Still below threshold since reset
         self.assertTrue(self.cb.is_closed)
 
+    def test_closed_allow_request_skips_lock(self):
+        self.cb._lock = MagicMock()
+        self.assertTrue(self.cb.allow_request())
+        self.cb._lock.__enter__.assert_not_called()
+
+    def test_closed_success_without_failures_skips_lock(self):
+        self.cb._lock = MagicMock()
+        self.cb.record_success()
+        self.cb._lock.__enter__.assert_not_called()
+        self.assertEqual(self.cb.get_stats()["total_successes"], 1)
+
+    def test_stats_summed_across_threads(self):
+        def work():
+            for _ in range(100):
+                self.cb.record_success()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.cb.record_failure()
+
+        stats = self.cb.get_stats()
+        self.assertEqual(stats["total_successes"], 400)
+        self.assertEqual(stats["total_failures"], 1)
+        self.assertEqual(stats["total_calls"], 401)
+
+    def test_exited_threads_release_shards(self):
+        def work():
+            self.cb.record_success()
+            self.cb.record_failure()
+
+        for _ in range(20):
+            t = threading.Thread(target=work)
+            t.start()
+            t.join()
+        gc.collect()
+
+        self.assertLessEqual(len(self.cb._shards), 1)
+        stats = self.cb.get_stats()
+        self.assertEqual(stats["total_calls"], 40)
+        self.assertEqual(stats["total_successes"], 20)
+        self.assertEqual(stats["total_failures"], 20)
+
+    def test_recovery_uses_monotonic_clock(self):
+        for _ in range(3):
+            self.cb.record_failure()
+
+        # A wall-clock jump must not end the recovery window early
+        with patch("src.common.circuit_breaker.time.time", return_value=1e12):
+            self.assertEqual(self.cb.state, CircuitState.OPEN)
+            self.assertGreater(self.cb.get_retry_after(), 0.0)
+
+    def test_open_failure_skips_lock(self):
+        for _ in range(3):
+            self.cb.record_failure()
+        opened_at = self.cb._last_failure_time
+        self.cb._lock = MagicMock()
+
+        self.cb.record_failure()
+
+        self.cb._lock.__enter__.assert_not_called()
+        self.assertEqual(self.cb._last_failure_time, opened_at)
+        self.assertEqual(self.cb._call_totals()[2], 4)
+
+    def test_failure_window_ignores_old_failures(self):
+        cb = CircuitBreaker("windowed", failure_threshold=3, failure_window=10.0)
+        clock = [0]
+        with patch(
+            "src.common.circuit_breaker.time.monotonic_ns",
+            side_effect=lambda: clock[0],
+        ):
+            cb.record_failure()
+            cb.record_failure()
+            clock[0] = 11 * 10**9  # first two failures leave the window
+            cb.record_failure()
+            self.assertEqual(cb._state, CircuitState.CLOSED)
+            self.assertEqual(cb._failure_count, 1)
+
+            clock[0] += 10**9
+            cb.record_failure()
+            cb.record_failure()
+            self.assertEqual(cb._state, CircuitState.OPEN)
+
+    def test_failure_window_success_does_not_reset(self):
+        cb = CircuitBreaker("windowed", failure_threshold=3, failure_window=10.0)
+        cb.record_failure()
+        cb.record_failure()
+        cb._lock = MagicMock()
+        cb.record_success()
+        cb._lock.__enter__.assert_not_called()
+        cb._lock = threading.Lock()
+
+        cb.record_failure()
+        self.assertTrue(cb.is_open)
+
+    def test_failure_window_cleared_on_close(self):
+        cb = CircuitBreaker(
+            "windowed", failure_threshold=2, recovery_timeout=0.0,
+            success_threshold=1, failure_window=10.0
+        )
+        cb.record_failure()
+        cb.record_failure()
+        self.assertEqual(cb.state, CircuitState.HALF_OPEN)
+        cb.record_success()
+        self.assertTrue(cb.is_closed)
+
+        cb.record_failure()
+        self.assertTrue(cb.is_closed)
+        self.assertEqual(cb.get_stats()["failure_count"], 1)
+
+    def test_get_stats_skips_lock(self):
+        for _ in range(3):
+            self.cb.record_failure()
+        self.cb._lock = MagicMock()
+        with patch(
+            "src.common.circuit_breaker.time.monotonic_ns",
+            return_value=self.cb._last_failure_time + 2 * 10**9,
+        ):
+            stats = self.cb.get_stats()
+        self.cb._lock.__enter__.assert_not_called()
+        # Reports the recovery the next state read would perform
+        self.assertEqual(stats["state"], "half_open")
+
     def test_transitions_to_half_open(self):
         for _ in range(3):
             self.cb.record_failure()
@@ -126,7 +253,7 @@ class TestCircuitBreaker(unittest.TestCase):
 
         result = succeeds()
         self.assertEqual(result, 42)
-        self.assertEqual(cb._total_successes, 1)
+        self.assertEqual(cb.get_stats()["total_successes"], 1)
 
     def test_get_stats(self):
         self.cb.record_success()
@@ -177,6 +304,32 @@ class TestCircuitBreakers(unittest.TestCase):
         self.assertIn("redis", stats)
         self.assertIn("imap", stats)
 
+    def test_get_all_stats_cached(self):
+        cb = CircuitBreakers.get("redis")
+        first = CircuitBreakers.get_all_stats()
+        cb.record_success()
+        self.assertIs(CircuitBreakers.get_all_stats(), first)
+
+    def test_get_all_stats_refreshed_on_state_change(self):
+        cb = CircuitBreakers.get("redis", failure_threshold=1)
+        CircuitBreakers.get_all_stats()
+        cb.record_failure()
+        self.assertEqual(CircuitBreakers.get_all_stats()["redis"]["state"], "open")
+
+    def test_get_all_stats_refreshed_on_new_breaker(self):
+        CircuitBreakers.get("redis")
+        CircuitBreakers.get_all_stats()
+        CircuitBreakers.get("imap")
+        self.assertIn("imap", CircuitBreakers.get_all_stats())
+
+    def test_get_all_stats_refreshed_after_ttl(self):
+        cb = CircuitBreakers.get("redis")
+        CircuitBreakers.get_all_stats()
+        cb.record_success()
+        with patch.object(CircuitBreakers, "_stats_ttl", 0.0):
+            stats = CircuitBreakers.get_all_stats()
+        self.assertEqual(stats["redis"]["total_successes"], 1)
+
     def test_reset_all(self):
         CircuitBreakers.get("redis")
         CircuitBreakers.reset_all()
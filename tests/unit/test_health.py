@@ -2,15 +2,19 @@
 Unit tests for HealthCheck, HealthRegistry, and HealthServer.
 """
 import json
+import threading
 import time
 import unittest
 import urllib.request
 from unittest.mock import MagicMock, patch
 
+from datetime import datetime, timedelta, timezone
+
 from src.common.health import (
     HealthCheck,
     HealthRegistry,
-    HealthServer
+    HealthServer,
+    _iso_utc_z,
 )
 from src.common.circuit_breaker import CircuitBreakers
 
@@ -80,6 +84,25 @@ class TestHealthCheck(unittest.TestCase):
         self.assertGreater(result["response_time_ms"], 0)
 
 
+class TestIsoUtcZ(unittest.TestCase):
+    """Tests for the timestamp formatter."""
+
+    def test_matches_datetime_isoformat(self):
+        ns = 1_771_329_600_123_456_789
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        expected = (epoch + timedelta(microseconds=ns // 1000)).isoformat()
+        expected = expected.replace("+00:00", "Z")
+        self.assertEqual(_iso_utc_z(ns), expected)
+
+    def test_always_includes_microseconds(self):
+        self.assertEqual(_iso_utc_z(0), "1970-01-01T00:00:00.000000Z")
+
+    def test_defaults_to_now(self):
+        before = datetime.now(timezone.utc).replace(microsecond=0)
+        parsed = datetime.fromisoformat(_iso_utc_z().replace("Z", "+00:00"))
+        self.assertGreaterEqual(parsed, before)
+
+
 class TestHealthRegistry(unittest.TestCase):
     """Tests for HealthRegistry."""
 
@@ -93,6 +116,20 @@ class TestHealthRegistry(unittest.TestCase):
         self.assertEqual(result["component"], "test")
         self.assertIn("uptime_seconds", result)
 
+    def test_liveness_bytes_matches_liveness(self):
+        data = json.loads(self.registry.get_liveness_bytes())
+        expected = self.registry.get_liveness()
+        self.assertEqual(data.keys(), expected.keys())
+        self.assertEqual(data["status"], "alive")
+        self.assertEqual(data["component"], "test")
+        self.assertIsInstance(data["uptime_seconds"], float)
+        self.assertTrue(data["timestamp"].endswith("Z"))
+
+    def test_liveness_bytes_escapes_component(self):
+        registry = HealthRegistry('odd "name"')
+        data = json.loads(registry.get_liveness_bytes())
+        self.assertEqual(data["component"], 'odd "name"')
+
     def test_readiness_with_healthy_checks(self):
         self.registry.register_check(
             HealthCheck("redis", lambda: True, critical=True)
@@ -117,6 +154,97 @@ class TestHealthRegistry(unittest.TestCase):
         result = self.registry.get_readiness()
         self.assertEqual(result["status"], "ready")
 
+    def test_checks_run_concurrently(self):
+        for name in ("a", "b", "c"):
+            self.registry.register_check(
+                HealthCheck(name, lambda: time.sleep(0.2) or True)
+            )
+        start = time.monotonic()
+        result = self.registry.run_checks()
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(
+            [r["name"] for r in result["checks"]], ["a", "b", "c"]
+        )
+        self.assertEqual(result["status"], "healthy")
+
+    def test_timeout_enforced(self):
+        release = threading.Event()
+        check = HealthCheck("hung", lambda: release.wait(5), timeout=0.1)
+        self.registry.register_check(check)
+        try:
+            start = time.monotonic()
+            result = self.registry.run_checks()
+            self.assertLess(time.monotonic() - start, 1.0)
+            self.assertEqual(result["status"], "unhealthy")
+            self.assertIn("timed out", result["checks"][0]["error"])
+            self.assertEqual(check.consecutive_failures, 1)
+        finally:
+            release.set()
+
+    def test_running_check_not_started_twice(self):
+        release = threading.Event()
+        calls = []
+
+        def hung():
+            calls.append(1)
+            return release.wait(5)
+
+        registry = HealthRegistry("test", checks_ttl=0)
+        registry.register_check(HealthCheck("hung", hung, timeout=0.05))
+        try:
+            registry.run_checks()
+            registry.run_checks()
+            self.assertEqual(len(calls), 1)
+        finally:
+            release.set()
+
+    def test_results_cached_within_ttl(self):
+        calls = []
+        self.registry.register_check(
+            HealthCheck("redis", lambda: calls.append(1) or True)
+        )
+        first = self.registry.get_readiness()
+        self.registry.get_status()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(first["status"], "ready")
+
+    def test_results_refreshed_after_ttl(self):
+        calls = []
+        registry = HealthRegistry("test", checks_ttl=0.05)
+        registry.register_check(
+            HealthCheck("redis", lambda: calls.append(1) or True)
+        )
+        registry.run_checks()
+        time.sleep(0.1)
+        registry.run_checks()
+        self.assertEqual(len(calls), 2)
+
+    def test_concurrent_callers_share_one_refresh(self):
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.1)
+            return True
+
+        self.registry.register_check(HealthCheck("redis", slow))
+        threads = [
+            threading.Thread(target=self.registry.run_checks) for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+
+    def test_register_check_invalidates_cache(self):
+        self.registry.register_check(HealthCheck("redis", lambda: True))
+        self.registry.run_checks()
+        self.registry.register_check(HealthCheck("imap", lambda: False))
+        result = self.registry.run_checks()
+        self.assertEqual(len(result["checks"]), 2)
+        self.assertEqual(result["status"], "unhealthy")
+
     def test_stats_provider(self):
         self.registry.register_stats_provider(
             "worker",
@@ -144,6 +272,9 @@ class TestHealthServer(unittest.TestCase):
         cls.registry.register_check(
             HealthCheck("redis", lambda: True, critical=True)
         )
+        cls.registry.register_stats_provider(
+            "shards", lambda: {0: {"lag": 1}, "updated": time.time()}
+        )
         cls.server = HealthServer(cls.registry, port=18080)
         cls.server.start()
         time.sleep(0.3)  # Wait for server to start
@@ -180,6 +311,11 @@ class TestHealthServer(unittest.TestCase):
         self.assertIn("health_checks", data)
         self.assertIn("circuit_breakers", data)
 
+    def test_status_encodes_non_string_keys(self):
+        status, data = self._get("/status")
+        self.assertEqual(status, 200)
+        self.assertEqual(data["statistics"]["shards"]["0"], {"lag": 1})
+
     def test_unknown_endpoint(self):
         status, data = self._get("/unknown")
         self.assertEqual(status, 404)
@@ -187,6 +323,49 @@ class TestHealthServer(unittest.TestCase):
     def test_server_is_running(self):
         self.assertTrue(self.server.is_running)
 
+    def test_response_headers(self):
+        resp = urllib.request.urlopen("http://127.0.0.1:18080/health", timeout=2)
+        body = resp.read()
+        self.assertEqual(resp.headers["Content-Type"], "application/json")
+        self.assertEqual(int(resp.headers["Content-Length"]), len(body))
+        self.assertIsNotNone(resp.headers["Date"])
+        self.assertIsNotNone(resp.headers["Server"])
+
+    def test_handler_class_built_once(self):
+        server = HealthServer(self.registry, port=0)
+        self.assertIs(server._handler.registry, self.registry)
+
+
+class TestHealthServerConcurrency(unittest.TestCase):
+    """Slow readiness checks must not block liveness probes."""
+
+    def test_liveness_served_during_slow_readiness(self):
+        release = threading.Event()
+        registry = HealthRegistry("concurrent")
+        registry.register_check(
+            HealthCheck("slow", lambda: release.wait(2), critical=True)
+        )
+        server = HealthServer(registry, port=18081)
+        server.start()
+        time.sleep(0.3)
+        try:
+            slow = threading.Thread(
+                target=lambda: urllib.request.urlopen(
+                    "http://127.0.0.1:18081/ready", timeout=3
+                ).read()
+            )
+            slow.start()
+            time.sleep(0.1)
+
+            start = time.monotonic()
+            resp = urllib.request.urlopen("http://127.0.0.1:18081/health", timeout=1)
+            self.assertEqual(resp.status, 200)
+            self.assertLess(time.monotonic() - start, 1.0)
+        finally:
+            release.set()
+            slow.join()
+            server.stop()
+
 
 if __name__ == "__main__":
     unittest.main()
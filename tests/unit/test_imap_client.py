@@ -67,6 +67,16 @@ class TestEmailMessage:
         assert d["size"] == 1500
         assert "fetched_at" in d
 
+    def test_to_dict_fetched_at_is_utc_z(self):
+        """Test fetched_at is ISO 8601 with a single Z suffix"""
+        fetched = datetime(2026, 2, 16, 10, 30, 5, tzinfo=timezone.utc)
+        msg = EmailMessage(
+            uid=1, uidvalidity=1, mailbox="INBOX", from_addr="a@b.com",
+            to_addrs=[], subject="s", date=None, body_text="", body_html="",
+            size=0, headers={}, message_id="<1@local>", fetched_at=fetched
+        )
+        assert msg.to_dict()["fetched_at"] == "2026-02-16T10:30:05Z"
+
     def test_to_dict_truncates_body(self):
         """Test body_text is truncated to 2000 chars"""
         long_body = "x" * 3000
@@ -120,6 +130,13 @@ class TestEmailMessage:
         data = json.loads(j)
         assert data["uid"] == 100
 
+    def test_to_json_bytes_is_utf8_json(self, sample_email_message):
+        """Test to_json_bytes returns UTF-8 JSON matching to_json"""
+        import json
+        b = sample_email_message.to_json_bytes()
+        assert isinstance(b, bytes)
+        assert json.loads(b) == json.loads(sample_email_message.to_json())
+
     def test_to_dict_date_iso_format(self, sample_email_message):
         """Test date is serialized as ISO format"""
         d = sample_email_message.to_dict()
@@ -289,6 +306,104 @@ class TestGmailIMAPClientFetchMessages:
             imap_client.fetch_messages([1, 2])
 
 
+    def test_fetch_messages_single_uid_fetch(self, imap_client):
+        """Test the given UIDs go out in one UID FETCH (the caller chunks)"""
+        imap_client.client = MagicMock()
+        imap_client.current_mailbox = "INBOX"
+        imap_client.client.fetch.side_effect = lambda uids, items: {
+            uid: {} for uid in uids
+        }
+
+        with patch.object(
+            imap_client, "_parse_message",
+            side_effect=lambda uid, data, fetched_at: uid,
+        ):
+            result = imap_client.fetch_messages([1, 2, 3, 4, 5])
+
+        assert result == [1, 2, 3, 4, 5]
+        assert [c.args[0] for c in imap_client.client.fetch.call_args_list] == [
+            [1, 2, 3, 4, 5]
+        ]
+
+    def test_fetch_messages_share_fetched_at(self, imap_client):
+        """Test every message of one fetch gets the same timestamp"""
+        imap_client.client = MagicMock()
+        imap_client.current_mailbox = "INBOX"
+        imap_client.client.fetch.return_value = {1: {}, 2: {}}
+
+        with patch.object(imap_client, "_parse_message",
+                          side_effect=lambda uid, data, fetched_at: fetched_at):
+            result = imap_client.fetch_messages([1, 2])
+
+        assert result[0] is result[1]
+        assert result[0].tzinfo is timezone.utc
+
+
+class TestGmailIMAPClientNoop:
+    """Test NOOP keepalive"""
+
+    def test_noop_sends_command(self, imap_client):
+        imap_client.client = MagicMock()
+        imap_client.noop()
+        imap_client.client.noop.assert_called_once()
+
+    def test_noop_failure_raises(self, imap_client):
+        imap_client.client = MagicMock()
+        imap_client.client.noop.side_effect = Exception("connection reset")
+
+        with pytest.raises(IMAPConnectionError):
+            imap_client.noop()
+
+    def test_noop_without_client_raises(self, imap_client):
+        with pytest.raises(IMAPConnectionError):
+            imap_client.noop()
+
+
+class TestGmailIMAPClientIdle:
+    """Test IMAP IDLE support"""
+
+    def test_supports_idle_without_client(self, imap_client):
+        assert imap_client.supports_idle() is False
+
+    def test_supports_idle_checks_capability(self, imap_client):
+        imap_client.client = MagicMock()
+        imap_client.client.has_capability.return_value = True
+
+        assert imap_client.supports_idle() is True
+        imap_client.client.has_capability.assert_called_once_with("IDLE")
+
+    def test_idle_wait_returns_on_exists(self, imap_client):
+        """Test EXISTS notification ends IDLE with True"""
+        imap_client.client = MagicMock()
+        imap_client.current_mailbox = "INBOX"
+        imap_client.client.idle_check.return_value = [(5, b'EXISTS')]
+
+        assert imap_client.idle_wait(timeout=30) is True
+        imap_client.client.idle.assert_called_once()
+        imap_client.client.idle_done.assert_called_once()
+
+    def test_idle_wait_stops_when_requested(self, imap_client):
+        """Test should_stop ends IDLE without new mail"""
+        imap_client.client = MagicMock()
+        imap_client.current_mailbox = "INBOX"
+
+        assert imap_client.idle_wait(timeout=30, should_stop=lambda: True) is False
+        imap_client.client.idle_check.assert_not_called()
+        imap_client.client.idle_done.assert_called_once()
+
+    def test_idle_wait_no_mailbox_raises(self, imap_client):
+        with pytest.raises(IMAPConnectionError, match="No mailbox selected"):
+            imap_client.idle_wait(timeout=30)
+
+    def test_idle_wait_failure_raises(self, imap_client):
+        imap_client.client = MagicMock()
+        imap_client.current_mailbox = "INBOX"
+        imap_client.client.idle.side_effect = Exception("socket closed")
+
+        with pytest.raises(IMAPConnectionError, match="IMAP IDLE failed"):
+            imap_client.idle_wait(timeout=30)
+
+
 class TestGmailIMAPClientContextManager:
     """Test context manager"""
 
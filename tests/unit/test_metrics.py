@@ -254,6 +254,17 @@ class TestBackgroundMetricsUpdater:
 
         assert UPTIME_SECONDS._value.get() > 0
 
+    def test_tick_updates_without_thread(self):
+        mc = MetricsCollector()
+        redis_mock = MagicMock()
+        redis_mock.xlen.return_value = 42
+
+        updater = BackgroundMetricsUpdater(collector=mc, redis_client=redis_mock)
+        updater.tick()
+
+        assert mc.get_stream_depth() == 42.0
+        assert not updater.is_running
+
     def test_is_not_running_before_start(self):
         mc = MetricsCollector()
         redis_mock = MagicMock()
@@ -1,6 +1,7 @@
 """
 Unit tests for OAuth2Gmail authentication manager.
 """
+import os
 import pytest
 import json
 from unittest.mock import patch, MagicMock, mock_open
@@ -98,6 +99,27 @@ class TestSaveCredentials:
         assert saved["refresh_token"] == "refresh-token"
         assert saved["client_id"] == "cid"
 
+    def test_save_replaces_file_atomically(self, oauth2):
+        """Test the token is written to a temp file and renamed into place"""
+        Path(oauth2.token_file).write_text('{"token": "old"}')
+        mock_creds = MagicMock()
+        mock_creds.token = "new-token"
+        mock_creds.refresh_token = "r"
+        mock_creds.token_uri = "u"
+        mock_creds.client_id = "c"
+        mock_creds.client_secret = "s"
+        mock_creds.scopes = []
+        mock_creds.expiry = None
+        oauth2.credentials = mock_creds
+
+        with patch("src.auth.oauth2_gmail.os.replace", wraps=os.replace) as mock_replace:
+            oauth2.save_credentials()
+
+        tmp_file, target = mock_replace.call_args.args
+        assert Path(target) == Path(oauth2.token_file)
+        assert not Path(tmp_file).exists()
+        assert json.loads(Path(oauth2.token_file).read_text())["token"] == "new-token"
+
     def test_save_raises_on_write_error(self, oauth2):
         """Test that save raises OAuth2AuthenticationError on failure"""
         mock_creds = MagicMock()
@@ -132,6 +154,17 @@ class TestAuthenticate:
 
         assert result == mock_creds
 
+    @patch("src.auth.oauth2_gmail.Credentials")
+    def test_valid_in_memory_credentials_skip_file(self, mock_creds_cls, oauth2):
+        """Test authenticate does not re-read the token file when not needed"""
+        mock_creds = MagicMock()
+        mock_creds.valid = True
+        oauth2.credentials = mock_creds
+        Path(oauth2.token_file).write_text('{"token": "x"}')
+
+        assert oauth2.authenticate() is mock_creds
+        mock_creds_cls.from_authorized_user_file.assert_not_called()
+
     @patch("src.auth.oauth2_gmail.Request")
     @patch("src.auth.oauth2_gmail.Credentials")
     def test_refreshes_expired_token(self, mock_creds_cls, mock_request, oauth2):
@@ -244,6 +277,49 @@ class TestGenerateXOAuth2String:
         assert "user=user@gmail.com" in decoded
         assert "auth=Bearer ya29.abc123" in decoded
 
+    def test_reuses_cached_string_for_same_token(self, oauth2):
+        """Test reconnects skip the token check while the token is fresh"""
+        mock_creds = MagicMock()
+        mock_creds.expired = False
+        mock_creds.token = "ya29.abc123"
+        mock_creds.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
+        oauth2.credentials = mock_creds
+
+        first = oauth2.generate_xoauth2_string("user@gmail.com")
+        with patch.object(oauth2, "get_access_token") as mock_get:
+            second = oauth2.generate_xoauth2_string("user@gmail.com")
+
+        assert second == first
+        mock_get.assert_not_called()
+
+    def test_regenerates_when_token_near_expiry(self, oauth2):
+        mock_creds = MagicMock()
+        mock_creds.expired = False
+        mock_creds.token = "ya29.abc123"
+        mock_creds.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(minutes=2)
+        oauth2.credentials = mock_creds
+
+        oauth2.generate_xoauth2_string("user@gmail.com")
+        with patch.object(oauth2, "get_access_token", return_value="ya29.new") as mock_get:
+            result = oauth2.generate_xoauth2_string("user@gmail.com")
+
+        mock_get.assert_called_once()
+        import base64
+        assert "auth=Bearer ya29.new" in base64.b64decode(result).decode()
+
+    def test_regenerates_for_other_user(self, oauth2):
+        mock_creds = MagicMock()
+        mock_creds.expired = False
+        mock_creds.token = "ya29.abc123"
+        mock_creds.expiry = None
+        oauth2.credentials = mock_creds
+
+        oauth2.generate_xoauth2_string("a@gmail.com")
+        result = oauth2.generate_xoauth2_string("b@gmail.com")
+
+        import base64
+        assert "user=b@gmail.com" in base64.b64decode(result).decode()
+
 
 class TestIsTokenValid:
     """Test is_token_valid method"""
@@ -280,8 +356,8 @@ class TestRevokeToken:
         """revoke when no credentials should not raise"""
         oauth2.revoke_token()
 
-    @patch("requests.post")
-    def test_revoke_deletes_token_file(self, mock_post, oauth2):
+    @patch.object(OAuth2Gmail, "_session")
+    def test_revoke_deletes_token_file(self, mock_session, oauth2):
         """Test that revoke deletes the token file"""
         mock_creds = MagicMock()
         mock_creds.token = "tok"
@@ -292,9 +368,15 @@ class TestRevokeToken:
 
         oauth2.revoke_token()
 
+        mock_session.return_value.post.assert_called_once()
+        assert mock_session.return_value.post.call_args.kwargs["params"] == {"token": "tok"}
         assert not Path(oauth2.token_file).exists()
         assert oauth2.credentials is None
 
+    def test_session_is_shared(self, oauth2, tmp_path):
+        other = OAuth2Gmail("cid", "cs", token_file=str(tmp_path / "other.json"))
+        assert oauth2._session() is other._session()
+
 
 class TestGetTokenInfo:
     """Test get_token_info method"""
@@ -3,14 +3,21 @@ Unit tests for OAuth2Outlook authentication manager.
 """
 import pytest
 import json
+import os
+import time
 from unittest.mock import patch, MagicMock, PropertyMock
 from pathlib import Path
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.auth.oauth2_outlook import OAuth2Outlook, create_outlook_oauth2_from_config, OUTLOOK_SCOPES
+from src.auth.oauth2_outlook import (
+    OAuth2Outlook,
+    create_outlook_oauth2_from_config,
+    OUTLOOK_SCOPES,
+    _OrjsonTokenCache,
+)
 from src.common.exceptions import OAuth2AuthenticationError, TokenRefreshError
 
 
@@ -18,7 +25,8 @@ from src.common.exceptions import OAuth2AuthenticationError, TokenRefreshError
 def oauth2(tmp_path):
     """Create OAuth2Outlook instance with temp token path"""
     token_file = str(tmp_path / "test_outlook_token.json")
-    with patch("src.auth.oauth2_outlook.msal") as mock_msal:
+    with patch("src.auth.oauth2_outlook.msal") as mock_msal, \
+         patch("src.auth.oauth2_outlook._OrjsonTokenCache", return_value=MagicMock()):
         mock_app = MagicMock()
         mock_app.get_accounts.return_value = []
         mock_msal.ConfidentialClientApplication.return_value = mock_app
@@ -38,7 +46,8 @@ def oauth2(tmp_path):
 def public_oauth2(tmp_path):
     """Create OAuth2Outlook as public client (no client secret)"""
     token_file = str(tmp_path / "test_outlook_token_public.json")
-    with patch("src.auth.oauth2_outlook.msal") as mock_msal:
+    with patch("src.auth.oauth2_outlook.msal") as mock_msal, \
+         patch("src.auth.oauth2_outlook._OrjsonTokenCache", return_value=MagicMock()):
         mock_app = MagicMock()
         mock_app.get_accounts.return_value = []
         mock_msal.PublicClientApplication.return_value = mock_app
@@ -62,6 +71,7 @@ class TestOAuth2OutlookInit:
         assert oauth2.tenant_id == "test-tenant"
         assert oauth2._access_token is None
         assert oauth2._token_expiry is None
+        assert oauth2._token_deadline is None
 
     def test_init_creates_token_directory(self, tmp_path):
         token_dir = tmp_path / "subdir" / "tokens"
@@ -99,14 +109,17 @@ class TestLoadCredentials:
         Path(oauth2.token_file).write_text('{"AccessToken": {}}')
 
         # Mock deserialization success and accounts found
-        # Also mock _build_msal_app to avoid real MSAL authority lookup
-        with patch.object(oauth2, '_build_msal_app') as mock_build:
-            mock_app = MagicMock()
-            mock_app.get_accounts.return_value = [{"username": "user@outlook.com"}]
-            mock_build.return_value = mock_app
+        oauth2._app.get_accounts.return_value = [{"username": "user@outlook.com"}]
+        app = oauth2._app
 
+        with patch.object(oauth2, '_build_msal_app') as mock_build:
             result = oauth2.load_credentials()
-            assert result is True
+
+        assert result is True
+        # The loaded cache is shared with the existing app; no rebuild
+        mock_build.assert_not_called()
+        assert oauth2._app is app
+        oauth2._cache.deserialize.assert_called_once_with(b'{"AccessToken": {}}')
 
     def test_returns_false_when_cache_empty(self, oauth2):
         """Test loading credentials with no cached accounts"""
@@ -144,6 +157,30 @@ class TestSaveCredentials:
         content = Path(oauth2.token_file).read_text(encoding="utf-8")
         assert "AccessToken" in content
 
+    def test_save_replaces_file_atomically(self, oauth2):
+        oauth2._cache.has_state_changed = True
+        oauth2._cache.serialize.return_value = '{"AccessToken": {}}'
+
+        with patch("src.auth.oauth2_outlook.os.replace", wraps=os.replace) as mock_replace, \
+             patch("src.auth.oauth2_outlook.os.fsync") as mock_fsync:
+            oauth2.save_credentials()
+
+        mock_fsync.assert_called_once()
+        mock_replace.assert_called_once_with(
+            Path(str(oauth2.token_file) + ".tmp"), oauth2.token_file
+        )
+        assert not Path(str(oauth2.token_file) + ".tmp").exists()
+
+    def test_save_skips_unchanged_serialization(self, oauth2):
+        oauth2._cache.has_state_changed = True
+        oauth2._cache.serialize.return_value = '{"AccessToken": {}}'
+        oauth2.save_credentials()
+
+        with patch("src.auth.oauth2_outlook.os.replace") as mock_replace:
+            oauth2.save_credentials()
+
+        mock_replace.assert_not_called()
+
     def test_save_raises_on_write_error(self, oauth2):
         """Test that save raises OAuth2AuthenticationError on failure"""
         oauth2._cache.has_state_changed = True
@@ -241,16 +278,14 @@ class TestGetAccessToken:
 
     def test_returns_valid_cached_token(self, oauth2):
         """Test returns cached token when valid"""
-        oauth2._access_token = "valid-token"
-        oauth2._token_expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+        oauth2._set_token_from_result({"access_token": "valid-token", "expires_in": 3600})
 
         result = oauth2.get_access_token()
         assert result == "valid-token"
 
     def test_refreshes_expired_token_silently(self, oauth2):
         """Test refreshes token via silent acquisition when expired"""
-        oauth2._access_token = "old-token"
-        oauth2._token_expiry = datetime.now(timezone.utc) - timedelta(hours=1)
+        oauth2._set_token_from_result({"access_token": "old-token", "expires_in": -3600})
 
         oauth2._app.get_accounts.return_value = [{"username": "user@outlook.com"}]
         oauth2._app.acquire_token_silent.return_value = {
@@ -263,6 +298,29 @@ class TestGetAccessToken:
         assert result == "refreshed-token"
         assert oauth2._access_token == "refreshed-token"
 
+    def test_silent_refresh_defers_save_until_close(self, oauth2):
+        oauth2._set_token_from_result({"access_token": "old", "expires_in": -3600})
+        oauth2._app.get_accounts.return_value = [{"username": "user@outlook.com"}]
+        oauth2._app.acquire_token_silent.return_value = {
+            "access_token": "refreshed-token",
+            "expires_in": 3600,
+        }
+        oauth2._cache.has_state_changed = True
+        oauth2._cache.serialize.return_value = '{"RefreshToken": {}}'
+
+        oauth2.get_access_token()
+        assert not Path(oauth2.token_file).exists()
+
+        oauth2.close()
+        assert Path(oauth2.token_file).read_text() == '{"RefreshToken": {}}'
+        assert oauth2._cache.has_state_changed is False
+
+    def test_close_swallows_save_errors(self, oauth2):
+        oauth2._cache.has_state_changed = True
+        oauth2._cache.serialize.side_effect = Exception("disk full")
+
+        oauth2.close()  # Should not raise
+
     def test_raises_when_no_token_and_no_accounts(self, oauth2):
         """Test raises TokenRefreshError when unable to refresh"""
         oauth2._access_token = None
@@ -273,8 +331,7 @@ class TestGetAccessToken:
 
     def test_raises_when_silent_acquisition_fails(self, oauth2):
         """Test raises when silent acquire returns None"""
-        oauth2._access_token = "old"
-        oauth2._token_expiry = datetime.now(timezone.utc) - timedelta(hours=1)
+        oauth2._set_token_from_result({"access_token": "old", "expires_in": -3600})
 
         oauth2._app.get_accounts.return_value = [{"username": "user@outlook.com"}]
         oauth2._app.acquire_token_silent.return_value = None
@@ -288,8 +345,7 @@ class TestGenerateXOAuth2String:
 
     def test_generates_base64_string(self, oauth2):
         """Test that XOAUTH2 string is generated correctly"""
-        oauth2._access_token = "test-access-token"
-        oauth2._token_expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+        oauth2._set_token_from_result({"access_token": "test-access-token", "expires_in": 3600})
 
         result = oauth2.generate_xoauth2_string("user@outlook.com")
 
@@ -300,8 +356,7 @@ class TestGenerateXOAuth2String:
 
     def test_xoauth2_format_matches_rfc(self, oauth2):
         """Test XOAUTH2 format is RFC-compliant with \\x01 separators"""
-        oauth2._access_token = "tok"
-        oauth2._token_expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+        oauth2._set_token_from_result({"access_token": "tok", "expires_in": 3600})
 
         result = oauth2.generate_xoauth2_string("u@example.com")
 
@@ -311,6 +366,29 @@ class TestGenerateXOAuth2String:
         assert decoded == "user=u@example.com\x01auth=Bearer tok\x01\x01"
 
 
+    def test_reuses_encoded_string_for_same_token(self, oauth2):
+        oauth2._set_token_from_result({"access_token": "tok", "expires_in": 3600})
+
+        import base64
+        with patch("src.auth.oauth2_outlook.base64.b64encode", wraps=base64.b64encode) as enc:
+            first = oauth2.generate_xoauth2_string("u@example.com")
+            second = oauth2.generate_xoauth2_string("u@example.com")
+
+        assert first == second
+        enc.assert_called_once()
+
+    def test_new_token_invalidates_cached_string(self, oauth2):
+        oauth2._set_token_from_result({"access_token": "tok1", "expires_in": 3600})
+        first = oauth2.generate_xoauth2_string("u@example.com")
+        oauth2._set_token_from_result({"access_token": "tok2", "expires_in": 3600})
+
+        second = oauth2.generate_xoauth2_string("u@example.com")
+
+        import base64
+        assert first != second
+        assert base64.b64decode(second).decode() == "user=u@example.com\x01auth=Bearer tok2\x01\x01"
+
+
 class TestIsTokenValid:
     """Test is_token_valid method"""
 
@@ -319,28 +397,62 @@ class TestIsTokenValid:
 
     def test_false_when_no_expiry(self, oauth2):
         oauth2._access_token = "tok"
-        oauth2._token_expiry = None
+        oauth2._token_deadline = None
         assert oauth2.is_token_valid() is False
 
     def test_true_when_valid(self, oauth2):
-        oauth2._access_token = "tok"
-        oauth2._token_expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+        oauth2._set_token_from_result({"access_token": "tok", "expires_in": 3600})
         assert oauth2.is_token_valid() is True
 
     def test_false_when_expiring_soon(self, oauth2):
         """Test returns False when token expires within 5 minutes"""
-        oauth2._access_token = "tok"
-        oauth2._token_expiry = datetime.now(timezone.utc) + timedelta(minutes=2)
+        oauth2._set_token_from_result({"access_token": "tok", "expires_in": 120})
         assert oauth2.is_token_valid() is False
 
 
+class TestAccountsCache:
+    """Test memoized account lookup"""
+
+    def test_reuses_accounts_while_cache_unchanged(self, oauth2):
+        oauth2._cache.has_state_changed = False
+        oauth2._app.get_accounts.return_value = [{"username": "u@o.com"}]
+
+        assert oauth2._accounts() == [{"username": "u@o.com"}]
+        assert oauth2._accounts() == [{"username": "u@o.com"}]
+
+        oauth2._app.get_accounts.assert_called_once()
+
+    def test_reuses_accounts_while_refresh_unsaved(self, oauth2):
+        # A silent refresh leaves has_state_changed set until close()
+        oauth2._accounts()
+        oauth2._cache.has_state_changed = True
+        oauth2._accounts()
+        oauth2._accounts()
+
+        oauth2._app.get_accounts.assert_called_once()
+
+    def test_load_credentials_invalidates_accounts(self, oauth2):
+        oauth2._accounts()
+        Path(oauth2.token_file).write_text('{"AccessToken": {}}')
+        oauth2.load_credentials()
+
+        assert oauth2._app.get_accounts.call_count == 2
+
+    def test_token_acquisition_invalidates_accounts(self, oauth2):
+        oauth2._cache.has_state_changed = False
+        oauth2._accounts()
+        oauth2._set_token_from_result({"access_token": "tok"})
+        oauth2._accounts()
+
+        assert oauth2._app.get_accounts.call_count == 2
+
+
 class TestRevokeToken:
     """Test revoke_token method"""
 
     def test_revoke_clears_state(self, oauth2):
         """Test that revoke clears token and removes accounts"""
-        oauth2._access_token = "tok"
-        oauth2._token_expiry = datetime.now(timezone.utc)
+        oauth2._set_token_from_result({"access_token": "tok", "expires_in": 0})
         oauth2._app.get_accounts.return_value = [{"username": "u@o.com"}]
 
         Path(oauth2.token_file).write_text("{}")
@@ -349,6 +461,7 @@ class TestRevokeToken:
 
         assert oauth2._access_token is None
         assert oauth2._token_expiry is None
+        assert oauth2._token_deadline is None
         assert not Path(oauth2.token_file).exists()
         oauth2._app.remove_account.assert_called_once()
 
@@ -376,8 +489,7 @@ class TestGetTokenInfo:
         assert info["has_token"] is False
 
     def test_with_valid_token(self, oauth2):
-        oauth2._access_token = "tok"
-        oauth2._token_expiry = datetime.now(timezone.utc) + timedelta(hours=1)
+        oauth2._set_token_from_result({"access_token": "tok", "expires_in": 3600})
         oauth2._app.get_accounts.return_value = [
             {"username": "user@outlook.com", "home_account_id": "id123"}
         ]
@@ -427,6 +539,8 @@ class TestSetTokenFromResult:
         # Should expire in roughly 2 hours
         delta = oauth2._token_expiry - datetime.now(timezone.utc)
         assert 7100 < delta.total_seconds() < 7300
+        remaining = oauth2._token_deadline - time.monotonic()
+        assert 6800 < remaining < 6900  # 5-minute margin already applied
 
     def test_defaults_expires_in(self, oauth2):
         """Test defaults to 3600 when expires_in not provided"""
@@ -435,3 +549,72 @@ class TestSetTokenFromResult:
 
         delta = oauth2._token_expiry - datetime.now(timezone.utc)
         assert 3500 < delta.total_seconds() < 3700
+
+
+class TestOrjsonTokenCache:
+    """Test the orjson-backed MSAL token cache"""
+
+    def test_round_trip(self):
+        cache = _OrjsonTokenCache()
+        cache.deserialize(b'{"AccessToken": {"k": {"secret": "tok"}}, "Account": {}}')
+        cache.has_state_changed = True
+
+        data = cache.serialize()
+
+        assert json.loads(data) == {"AccessToken": {"k": {"secret": "tok"}}, "Account": {}}
+        assert cache.has_state_changed is False
+
+    def test_empty_state(self):
+        cache = _OrjsonTokenCache()
+        cache.deserialize("")
+        assert json.loads(cache.serialize()) == {}
+
+    @staticmethod
+    def _msal_cache_file(path):
+        """Write a token file the way plain MSAL does after a login."""
+        import base64
+        import msal
+
+        def b64(data):
+            raw = json.dumps(data).encode()
+            return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+        now = int(time.time())
+        cache = msal.SerializableTokenCache()
+        cache.add({
+            "client_id": "cid",
+            "scope": ["https://outlook.office.com/IMAP.AccessAsUser.All"],
+            "token_endpoint": "https://login.microsoftonline.com/common/oauth2/v2.0/token",
+            "response": {
+                "access_token": "at",
+                "token_type": "Bearer",
+                "expires_in": 3600,
+                "refresh_token": "rt",
+                "client_info": b64({"uid": "u", "utid": "t"}),
+                "id_token": "h." + b64({
+                    "iss": "https://login.microsoftonline.com/t/v2.0",
+                    "sub": "s", "aud": "cid", "oid": "u", "tid": "t",
+                    "preferred_username": "user@outlook.com",
+                    "iat": now, "exp": now + 3600,
+                }) + ".sig",
+            },
+        })
+        path.write_text(cache.serialize())
+        return cache
+
+    def test_round_trips_real_msal_cache_file(self, tmp_path):
+        import msal
+
+        token_file = tmp_path / "token.json"
+        original = self._msal_cache_file(token_file)
+
+        cache = _OrjsonTokenCache()
+        cache.deserialize(token_file.read_bytes())
+
+        account = msal.TokenCache.CredentialType.ACCOUNT
+        refresh = msal.TokenCache.CredentialType.REFRESH_TOKEN
+        assert list(cache.search(account)) == list(original.search(account))
+        assert [t["secret"] for t in cache.search(refresh)] == ["rt"]
+        assert cache.has_state_changed is False
+        # Written back byte-for-byte in MSAL's own format
+        assert cache.serialize() == token_file.read_text()
@@ -1,6 +1,8 @@
 """
 Unit tests for EmailProcessor.
 """
+import json
+
 import pytest
 from unittest.mock import Mock
 from datetime import datetime
@@ -264,6 +266,26 @@ class TestEmailProcessor:
         }
         processor.process(data)
         mock_redis.xadd.assert_called_once()
+        assert mock_redis.xadd.call_args.kwargs["approximate"] is True
+
+    def test_output_stream_payload_is_json(self):
+        """Test forwarded payload decodes to the processed result"""
+        mock_redis = Mock()
+        processor = EmailProcessor(
+            output_stream="out_stream", redis_client=mock_redis
+        )
+        data = {
+            "message_id": "fwd-2",
+            "from": "a@b.com",
+            "subject": "Café ☕",
+            "date": "2026-01-01",
+            "size": 100,
+        }
+        processor.process(data)
+        fields = mock_redis.xadd.call_args.args[1]
+        payload = json.loads(fields["payload"])
+        assert payload["message_id"] == "fwd-2"
+        assert payload["subject"] == "Café ☕"
 
 
 class TestExtendedEmailProcessor:
@@ -3,6 +3,7 @@ Unit tests for EmailProducer main orchestration class.
 Tests focus on the orchestration methods, not the main loop.
 """
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch, MagicMock, PropertyMock
 
 import sys
@@ -15,11 +16,12 @@ from src.common.exceptions import (
     RedisConnectionError,
     StateManagementError,
 )
+from src.common.circuit_breaker import CircuitBreakerError, CircuitState
 
 
 @pytest.fixture
 def mock_settings():
-    """Mock the settings singleton"""
+    """Mock the application settings"""
     mock = MagicMock()
     mock.logging.level = "INFO"
     mock.redis.host = "localhost"
@@ -39,9 +41,11 @@ def mock_settings():
     mock.imap.host = "imap.gmail.com"
     mock.imap.port = 993
     mock.imap.poll_interval_seconds = 60
+    mock.imap.fetch_chunk_size = 25
     mock.circuit_breaker.failure_threshold = 5
     mock.circuit_breaker.recovery_timeout_seconds = 60.0
     mock.circuit_breaker.success_threshold = 3
+    mock.circuit_breaker.failure_window_seconds = None
     mock.monitoring.producer_health_port = 8080
     mock.monitoring.producer_metrics_port = 9090
     mock.dlq.stream_name = "test_dlq"
@@ -51,7 +55,7 @@ def mock_settings():
 @pytest.fixture
 def producer(mock_settings):
     """Create an EmailProducer with all dependencies mocked"""
-    with patch("producer.settings", mock_settings), \
+    with patch("producer.get_settings", return_value=mock_settings), \
          patch("producer.create_redis_client_from_config") as mock_redis_factory, \
          patch("producer.create_oauth2_from_config") as mock_oauth_factory, \
          patch("producer.ProducerStateManager") as mock_sm_cls, \
@@ -102,7 +106,7 @@ class TestEmailProducerInit:
         """Test that producer raises if OAuth2 is not configured"""
         mock_settings.oauth2.is_configured = False
 
-        with patch("producer.settings", mock_settings), \
+        with patch("producer.get_settings", return_value=mock_settings), \
              patch("producer.create_redis_client_from_config"), \
              patch("producer.CircuitBreakers"), \
              patch("producer.ShutdownManager"), \
@@ -113,6 +117,31 @@ class TestEmailProducerInit:
             with pytest.raises(OAuth2AuthenticationError, match="OAuth2 not configured"):
                 EmailProducer("test@gmail.com")
 
+    def test_import_does_not_load_settings(self):
+        import importlib
+        import producer as producer_module
+
+        try:
+            with patch("config.settings.get_settings") as mock_get:
+                importlib.reload(producer_module)
+            mock_get.assert_not_called()
+        finally:
+            importlib.reload(producer_module)
+
+    def test_init_uses_passed_settings(self, mock_settings):
+        with patch("producer.get_settings") as mock_get, \
+             patch("producer.create_redis_client_from_config"), \
+             patch("producer.create_oauth2_from_config"), \
+             patch("producer.ProducerStateManager"), \
+             patch("producer.CircuitBreakers"), \
+             patch("producer.ShutdownManager"):
+
+            from producer import EmailProducer
+            p = EmailProducer("test@gmail.com", settings=mock_settings)
+
+        mock_get.assert_not_called()
+        assert p.settings is mock_settings
+
 
 class TestVerifyConnectivity:
     """Test verify_connectivity method"""
@@ -146,7 +175,7 @@ class TestFetchAndPushEmails:
     def test_no_new_emails(self, producer, mock_settings):
         """Test when no new emails found"""
         with patch("producer.create_imap_client_from_config") as mock_imap_factory, \
-             patch("producer.settings", mock_settings):
+             patch("producer.get_settings", return_value=mock_settings):
             mock_imap = MagicMock()
             mock_imap.select_mailbox.return_value = (12345, 10)
             mock_imap.fetch_uids_since.return_value = []
@@ -161,37 +190,250 @@ class TestFetchAndPushEmails:
     def test_push_new_emails(self, producer, mock_settings):
         """Test pushing new emails to stream via BatchProducer"""
         with patch("producer.create_imap_client_from_config") as mock_imap_factory, \
-             patch("producer.settings", mock_settings), \
-             patch("producer.BatchProducer") as mock_batch_cls:
+             patch("producer.get_settings", return_value=mock_settings):
             mock_imap = MagicMock()
             mock_imap.select_mailbox.return_value = (12345, 10)
             mock_imap.fetch_uids_since.return_value = [101, 102]
 
             mock_msg1 = MagicMock()
             mock_msg1.uid = 101
-            mock_msg1.to_json.return_value = '{"uid": 101}'
+            mock_msg1.to_json_bytes.return_value = b'{"uid": 101}'
             mock_msg2 = MagicMock()
             mock_msg2.uid = 102
-            mock_msg2.to_json.return_value = '{"uid": 102}'
+            mock_msg2.to_json_bytes.return_value = b'{"uid": 102}'
             mock_imap.fetch_messages.return_value = [mock_msg1, mock_msg2]
             mock_imap_factory.return_value = mock_imap
 
             mock_batch = MagicMock()
-            mock_batch.flush.return_value = ["id-1", "id-2"]
-            mock_batch_cls.return_value = mock_batch
+            mock_batch.flush_each.return_value = ["id-1", "id-2"]
+            producer.batch = mock_batch
 
             producer._mock_state.check_uidvalidity_change.return_value = False
             producer._mock_state.get_last_uid.return_value = 100
 
             count = producer.fetch_and_push_emails()
             assert count == 2
-            assert mock_batch.add.call_count == 2
-            mock_batch.flush.assert_called_once()
+            assert mock_batch.add_raw.call_count == 2
+            mock_batch.add_raw.assert_any_call(b'{"uid": 101}')
+            mock_batch.reset.assert_called_once_with()
+            mock_batch.flush_each.assert_called_once()
+            producer._mock_state.update_and_increment.assert_called_once_with(
+                "INBOX", 12345, 102, 2
+            )
+
+    def test_full_batch_flags_backlog(self, producer, mock_settings):
+        """Test a poll that fills batch_size asks for an immediate re-poll"""
+        producer.batch_size = 2
+        with patch("producer.create_imap_client_from_config") as mock_imap_factory, \
+             patch("producer.get_settings", return_value=mock_settings):
+            mock_imap = MagicMock()
+            mock_imap.select_mailbox.return_value = (12345, 10)
+            mock_imap.fetch_uids_since.return_value = [101, 102]
+            messages = []
+            for uid in (101, 102):
+                msg = MagicMock()
+                msg.uid = uid
+                msg.to_json_bytes.return_value = b"{}"
+                messages.append(msg)
+            mock_imap.fetch_messages.return_value = messages
+            mock_imap_factory.return_value = mock_imap
+
+            mock_batch = MagicMock()
+            mock_batch.flush_each.return_value = ["id-1", "id-2"]
+            producer.batch = mock_batch
+            producer._mock_state.check_uidvalidity_change.return_value = False
+            producer._mock_state.get_last_uid.return_value = 100
+
+            producer.fetch_and_push_emails()
+            assert producer._backlog is True
+
+            mock_batch.flush_each.return_value = ["id-1", RedisConnectionError("OOM")]
+            producer.fetch_and_push_emails()
+            assert producer._backlog is False
+
+    def test_failed_push_stops_state_advance(self, producer, mock_settings):
+        """Test state only advances across the leading run of pushed emails"""
+        with patch("producer.create_imap_client_from_config") as mock_imap_factory, \
+             patch("producer.get_settings", return_value=mock_settings):
+            mock_imap = MagicMock()
+            mock_imap.select_mailbox.return_value = (12345, 10)
+            mock_imap.fetch_uids_since.return_value = [101, 102, 103]
+            messages = []
+            for uid in (101, 102, 103):
+                msg = MagicMock()
+                msg.uid = uid
+                msg.to_json_bytes.return_value = b"{}"
+                messages.append(msg)
+            mock_imap.fetch_messages.return_value = messages
+            mock_imap_factory.return_value = mock_imap
+
+            mock_batch = MagicMock()
+            mock_batch.flush_each.return_value = [
+                "id-1", RedisConnectionError("OOM"), "id-3"
+            ]
+            producer.batch = mock_batch
+
+            producer._mock_state.check_uidvalidity_change.return_value = False
+            producer._mock_state.get_last_uid.return_value = 100
+
+            count = producer.fetch_and_push_emails()
+            # UID 103 is pushed again next poll, so it is not counted now
+            assert count == 1
+            producer._mock_state.update_and_increment.assert_called_once_with(
+                "INBOX", 12345, 101, 1
+            )
+
+    def _poll_with(self, producer, mock_settings, messages, outcomes):
+        """Run one poll over the given messages and XADD outcomes (or error)."""
+        with patch("producer.create_imap_client_from_config") as mock_imap_factory, \
+             patch("producer.get_settings", return_value=mock_settings):
+            mock_imap = MagicMock()
+            mock_imap.select_mailbox.return_value = (12345, 10)
+            mock_imap.fetch_uids_since.return_value = [m.uid for m in messages]
+            mock_imap.fetch_messages.return_value = messages
+            mock_imap_factory.return_value = mock_imap
+
+            mock_batch = MagicMock()
+            if isinstance(outcomes, Exception):
+                mock_batch.flush_each.side_effect = outcomes
+            else:
+                mock_batch.flush_each.return_value = outcomes
+            producer.batch = mock_batch
+            producer._mock_state.check_uidvalidity_change.return_value = False
+            producer._mock_state.get_last_uid.return_value = 100
+
+            return producer.fetch_and_push_emails(), mock_batch
+
+    def test_unserializable_email_skipped(self, producer, mock_settings):
+        """Test a message that cannot be serialized is skipped, not blocking"""
+        messages = self._messages_for([101, 102, 103])
+        messages[1].to_json_bytes.side_effect = ValueError("bad header")
+
+        count, mock_batch = self._poll_with(
+            producer, mock_settings, messages, ["id-1", "id-3"]
+        )
+
+        assert count == 2
+        assert mock_batch.add_raw.call_count == 2
+        producer._mock_state.update_and_increment.assert_called_once_with(
+            "INBOX", 12345, 103, 2
+        )
+
+    def test_unserializable_email_after_failure_not_skipped(self, producer, mock_settings):
+        """Test state never moves past a failed push, even over skipped UIDs"""
+        messages = self._messages_for([101, 102, 103])
+        messages[2].to_json_bytes.side_effect = ValueError("bad header")
+
+        count, _ = self._poll_with(
+            producer, mock_settings, messages,
+            [RedisConnectionError("OOM"), "id-2"]
+        )
+
+        assert count == 0
+        producer._mock_state.update_and_increment.assert_not_called()
+
+    def test_flush_error_pushes_nothing(self, producer, mock_settings):
+        messages = self._messages_for([101, 102])
+        count, _ = self._poll_with(
+            producer, mock_settings, messages, RedisConnectionError("down")
+        )
+
+        assert count == 0
+        producer._mock_state.update_and_increment.assert_not_called()
+
+    @staticmethod
+    def _messages_for(uids):
+        messages = []
+        for uid in uids:
+            msg = MagicMock()
+            msg.uid = uid
+            msg.to_json_bytes.return_value = b"{}"
+            messages.append(msg)
+        return messages
+
+    def test_pushes_in_chunks_with_prefetch(self, producer, mock_settings):
+        """Test UIDs beyond one fetch chunk are fetched and pushed per chunk"""
+        producer.fetch_chunk_size = 2
+        with patch("producer.create_imap_client_from_config") as mock_imap_factory, \
+             patch("producer.get_settings", return_value=mock_settings):
+            mock_imap = MagicMock()
+            mock_imap.select_mailbox.return_value = (12345, 10)
+            mock_imap.fetch_uids_since.return_value = [101, 102, 103]
+            mock_imap.fetch_messages.side_effect = self._messages_for
+            mock_imap_factory.return_value = mock_imap
+
+            mock_batch = MagicMock()
+            mock_batch.flush_each.side_effect = [["id-1", "id-2"], ["id-3"]]
+            producer.batch = mock_batch
+            producer._mock_state.check_uidvalidity_change.return_value = False
+            producer._mock_state.get_last_uid.return_value = 100
+
+            count = producer.fetch_and_push_emails()
+            producer.cleanup()
+
+        assert count == 3
+        assert [c.args[0] for c in mock_imap.fetch_messages.call_args_list] == [
+            [101, 102], [103]
+        ]
+        assert producer._mock_state.update_and_increment.call_args_list == [
+            (("INBOX", 12345, 102, 2),), (("INBOX", 12345, 103, 1),)
+        ]
+
+    def test_default_config_prefetches(self, producer, mock_settings):
+        """Test a full poll at the default batch size spans several chunks"""
+        assert producer.fetch_chunk_size < producer.batch_size
+        uids = list(range(101, 101 + producer.batch_size))
+        with patch("producer.create_imap_client_from_config") as mock_imap_factory, \
+             patch("producer.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as mock_pool:
+            mock_imap = MagicMock()
+            mock_imap.select_mailbox.return_value = (12345, 100)
+            mock_imap.fetch_uids_since.return_value = uids
+            mock_imap.fetch_messages.side_effect = self._messages_for
+            mock_imap_factory.return_value = mock_imap
+
+            mock_batch = MagicMock()
+            mock_batch.flush_each.side_effect = lambda: ["id"] * producer.fetch_chunk_size
+            producer.batch = mock_batch
+            producer._mock_state.check_uidvalidity_change.return_value = False
+            producer._mock_state.get_last_uid.return_value = 100
+
+            count = producer.fetch_and_push_emails()
+            producer.cleanup()
+
+        assert count == producer.batch_size
+        assert mock_imap.fetch_messages.call_count == 2
+        mock_pool.assert_called_once()
+
+    def test_failed_chunk_stops_remaining_chunks(self, producer, mock_settings):
+        """Test a partially failed chunk is not followed by later chunks"""
+        producer.fetch_chunk_size = 2
+        with patch("producer.create_imap_client_from_config") as mock_imap_factory, \
+             patch("producer.get_settings", return_value=mock_settings):
+            mock_imap = MagicMock()
+            mock_imap.select_mailbox.return_value = (12345, 10)
+            mock_imap.fetch_uids_since.return_value = [101, 102, 103]
+            mock_imap.fetch_messages.side_effect = self._messages_for
+            mock_imap_factory.return_value = mock_imap
+
+            mock_batch = MagicMock()
+            mock_batch.flush_each.return_value = ["id-1", RedisConnectionError("OOM")]
+            producer.batch = mock_batch
+            producer._mock_state.check_uidvalidity_change.return_value = False
+            producer._mock_state.get_last_uid.return_value = 100
+
+            count = producer.fetch_and_push_emails()
+            producer.cleanup()
+
+        assert count == 1
+        mock_batch.flush_each.assert_called_once()
+        producer._mock_state.update_and_increment.assert_called_once_with(
+            "INBOX", 12345, 101, 1
+        )
 
     def test_uidvalidity_change_resets_state(self, producer, mock_settings):
         """Test state reset when UIDVALIDITY changes"""
         with patch("producer.create_imap_client_from_config") as mock_imap_factory, \
-             patch("producer.settings", mock_settings):
+             patch("producer.get_settings", return_value=mock_settings):
             mock_imap = MagicMock()
             mock_imap.select_mailbox.return_value = (99999, 10)
             mock_imap.fetch_uids_since.return_value = []
@@ -204,6 +446,160 @@ class TestFetchAndPushEmails:
             producer._mock_state.reset_mailbox_state.assert_called_once_with("INBOX")
 
 
+class TestWaitForNextPoll:
+    """Test the wait between polls"""
+
+    def test_uses_idle_when_supported(self, producer):
+        mock_imap = MagicMock()
+        mock_imap.supports_idle.return_value = True
+        mock_imap.IDLE_MAX_SECONDS = 29 * 60
+        producer.imap_client = mock_imap
+
+        producer._wait_for_next_poll()
+
+        mock_imap.idle_wait.assert_called_once()
+        # IDLE ends by the poll interval at the latest
+        assert mock_imap.idle_wait.call_args.args[0] == 60
+        producer.shutdown.wait_for_shutdown.assert_not_called()
+
+    def test_idle_capped_by_server_limit(self, producer):
+        mock_imap = MagicMock()
+        mock_imap.supports_idle.return_value = True
+        mock_imap.IDLE_MAX_SECONDS = 29 * 60
+        producer.imap_client = mock_imap
+        producer.poll_interval = 3600
+
+        producer._wait_for_next_poll()
+
+        assert mock_imap.idle_wait.call_args.args[0] == 29 * 60
+
+    def test_wait_after_failed_poll_bounded_by_poll_interval(self, producer):
+        """Mail left unpushed by a Redis failure is retried within one interval"""
+        mock_imap = MagicMock()
+        mock_imap.supports_idle.return_value = True
+        mock_imap.IDLE_MAX_SECONDS = 29 * 60
+        producer.imap_client = mock_imap
+
+        with patch.object(
+            producer, "fetch_and_push_emails",
+            side_effect=RedisConnectionError("connection refused"),
+        ):
+            with pytest.raises(RedisConnectionError) as exc_info:
+                producer._do_poll()
+            producer._handle_poll_error(exc_info.value)
+
+        producer._wait_for_next_poll()
+
+        assert mock_imap.idle_wait.call_args.args[0] <= producer.poll_interval
+
+    def test_sleeps_when_idle_unsupported(self, producer):
+        mock_imap = MagicMock()
+        mock_imap.supports_idle.return_value = False
+        producer.imap_client = mock_imap
+
+        producer._wait_for_next_poll()
+
+        producer.shutdown.wait_for_shutdown.assert_called_once_with(timeout=60)
+
+    def test_long_sleep_sends_keepalive(self, producer):
+        """Test NOOP is sent between sleep segments longer than the keepalive"""
+        mock_imap = MagicMock()
+        mock_imap.supports_idle.return_value = False
+        producer.imap_client = mock_imap
+        producer.poll_interval = 700
+        producer.shutdown.wait_for_shutdown.return_value = False
+
+        producer._wait_for_next_poll()
+
+        calls = producer.shutdown.wait_for_shutdown.call_args_list
+        timeouts = [c.kwargs["timeout"] for c in calls]
+        assert timeouts == [300, 300, 100]
+        assert mock_imap.noop.call_count == 2
+
+    def test_keepalive_failure_drops_connection(self, producer):
+        mock_imap = MagicMock()
+        mock_imap.noop.side_effect = IMAPConnectionError("IMAP NOOP failed")
+        producer.imap_client = mock_imap
+
+        producer._keepalive()
+
+        mock_imap.disconnect.assert_called_once()
+        assert producer.imap_client is None
+
+    def test_idle_failure_drops_connection(self, producer):
+        """Test IDLE errors force a reconnect on the next poll"""
+        mock_imap = MagicMock()
+        mock_imap.supports_idle.return_value = True
+        mock_imap.IDLE_MAX_SECONDS = 29 * 60
+        mock_imap.idle_wait.side_effect = IMAPConnectionError("IMAP IDLE failed")
+        producer.imap_client = mock_imap
+
+        producer._wait_for_next_poll()
+
+        mock_imap.disconnect.assert_called_once()
+        assert producer.imap_client is None
+
+
+class TestDoPoll:
+    """Test a single poll iteration"""
+
+    def test_returns_count_and_records_metrics(self, producer):
+        producer._metrics = MagicMock()
+        with patch.object(producer, "fetch_and_push_emails", return_value=3):
+            assert producer._do_poll() == 3
+
+        producer._metrics.inc_produced.assert_called_once_with(3)
+        producer.redis_cb.record_success.assert_called()
+
+    def test_skips_when_circuit_open(self, producer):
+        producer.redis_cb.is_open = True
+        with patch.object(producer, "fetch_and_push_emails") as mock_fetch:
+            assert producer._do_poll() is None
+
+        mock_fetch.assert_not_called()
+        producer.shutdown.wait_for_shutdown.assert_called_once_with(timeout=5)
+
+    def test_dry_run_waits_on_shutdown_event(self, producer):
+        """Test dry run waits interruptibly instead of sleeping"""
+        with patch.object(producer, "fetch_and_push_emails") as mock_fetch:
+            assert producer._do_poll(dry_run=True) is None
+
+        mock_fetch.assert_not_called()
+        producer.shutdown.wait_for_shutdown.assert_called_once_with(
+            timeout=producer.poll_interval
+        )
+
+
+class TestHandlePollError:
+    """Test poll failure dispatch"""
+
+    def test_imap_error_drops_connection(self, producer):
+        mock_imap = MagicMock()
+        producer.imap_client = mock_imap
+
+        producer._handle_poll_error(IMAPConnectionError("lost"))
+
+        mock_imap.disconnect.assert_called_once()
+        assert producer.imap_client is None
+        producer.imap_cb.record_failure.assert_called_once()
+
+    def test_redis_error_records_failure(self, producer):
+        error = RedisConnectionError("down")
+        producer._handle_poll_error(error)
+        producer.redis_cb.record_failure.assert_called_once_with(error)
+
+    def test_circuit_breaker_error_waits_interruptibly(self, producer):
+        producer._handle_poll_error(CircuitBreakerError("redis", CircuitState.OPEN, 7.0))
+        producer.shutdown.wait_for_shutdown.assert_called_once_with(timeout=7.0)
+
+    def test_unknown_error_falls_back_to_generic_handler(self, producer):
+        with patch("producer.logger") as mock_logger:
+            producer._handle_poll_error(KeyError("boom"))
+
+        mock_logger.error.assert_called_once()
+        assert mock_logger.error.call_args.kwargs["exc_info"] is True
+
+
 class TestCleanup:
     """Test cleanup method"""
 
@@ -218,6 +614,11 @@ class TestCleanup:
         producer.cleanup()
         producer._mock_redis.close.assert_called_once()
 
+    def test_cleanup_closes_oauth2(self, producer):
+        producer.oauth2 = MagicMock()
+        producer.cleanup()
+        producer.oauth2.close.assert_called_once()
+
 
 class TestEmailProviderDispatch:
     """Test email provider selection (gmail vs outlook)"""
@@ -237,7 +638,7 @@ class TestEmailProviderDispatch:
         mock_settings.outlook_oauth2.redirect_uri = "http://localhost:8080"
         mock_settings.email_provider = "outlook"
 
-        with patch("producer.settings", mock_settings), \
+        with patch("producer.get_settings", return_value=mock_settings), \
              patch("producer.create_redis_client_from_config") as mock_redis_factory, \
              patch("producer.create_outlook_oauth2_from_config") as mock_outlook_oauth_factory, \
              patch("producer.ProducerStateManager"), \
@@ -260,7 +661,7 @@ class TestEmailProviderDispatch:
 
     def test_producer_raises_on_unsupported_provider(self, mock_settings):
         """Test that unsupported provider raises ValueError"""
-        with patch("producer.settings", mock_settings), \
+        with patch("producer.get_settings", return_value=mock_settings), \
              patch("producer.create_redis_client_from_config"), \
              patch("producer.CircuitBreakers"), \
              patch("producer.ShutdownManager"), \
@@ -276,7 +677,7 @@ class TestEmailProviderDispatch:
         mock_settings.outlook_oauth2 = MagicMock()
         mock_settings.outlook_oauth2.is_configured = False
 
-        with patch("producer.settings", mock_settings), \
+        with patch("producer.get_settings", return_value=mock_settings), \
              patch("producer.create_redis_client_from_config"), \
              patch("producer.CircuitBreakers"), \
              patch("producer.ShutdownManager"), \
@@ -297,7 +698,7 @@ class TestEmailProviderDispatch:
         mock_settings.outlook_oauth2.token_file = "tokens/outlook_t.json"
         mock_settings.outlook_oauth2.redirect_uri = "http://localhost:8080"
 
-        with patch("producer.settings", mock_settings), \
+        with patch("producer.get_settings", return_value=mock_settings), \
              patch("producer.create_redis_client_from_config") as mock_redis_factory, \
              patch("producer.create_outlook_oauth2_from_config") as mock_outlook_oauth_factory, \
              patch("producer.create_outlook_imap_client_from_config") as mock_outlook_imap_factory, \
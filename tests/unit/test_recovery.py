@@ -152,6 +152,13 @@ class TestConnectionWatchdog(unittest.TestCase):
         self.assertTrue(status["redis"]["healthy"])
         self.assertEqual(status["redis"]["consecutive_failures"], 0)
 
+    def test_tick_runs_checks(self):
+        check = MagicMock(return_value=True)
+        self.watchdog.add_check("redis", check)
+        self.watchdog.tick()
+
+        check.assert_called_once()
+
     def test_failing_check(self):
         self.watchdog.add_check("redis", lambda: False)
         self.watchdog._check_all()
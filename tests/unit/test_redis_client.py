@@ -2,6 +2,8 @@
 Unit tests for RedisClient wrapper.
 Uses mocking to test without requiring actual Redis instance.
 """
+import socket
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock, call
 import redis
@@ -45,6 +47,26 @@ class TestRedisClientInit:
         assert call_kwargs['port'] == 6379
         assert call_kwargs['db'] == 0
 
+    def test_init_enables_tcp_keepalive(self, mock_redis_pool, mock_redis_client):
+        """Test pooled connections use tuned keepalive and health checks"""
+        RedisClient()
+
+        call_kwargs = mock_redis_pool.call_args[1]
+        assert call_kwargs['socket_keepalive'] is True
+        assert call_kwargs['health_check_interval'] == 30
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            assert call_kwargs['socket_keepalive_options'][socket.TCP_KEEPIDLE] == 30
+
+    def test_init_with_unix_socket(self, mock_redis_pool, mock_redis_client):
+        """Test UNIX socket path replaces the TCP endpoint"""
+        RedisClient(host='ignored', unix_socket_path='/run/redis.sock')
+
+        call_kwargs = mock_redis_pool.call_args[1]
+        assert call_kwargs['path'] == '/run/redis.sock'
+        assert call_kwargs['connection_class'] is redis.connection.UnixDomainSocketConnection
+        assert 'host' not in call_kwargs
+        assert 'socket_keepalive' not in call_kwargs
+
     def test_init_with_custom_params(self, mock_redis_pool, mock_redis_client):
         """Test initialization with custom parameters"""
         client = RedisClient(
@@ -113,6 +135,7 @@ class TestRedisClientXADD:
         assert msg_id == "1234567890124-0"
         call_kwargs = mock_redis_client.xadd.call_args[1]
         assert call_kwargs['maxlen'] == 1000
+        assert call_kwargs['approximate'] is True  # MAXLEN ~ by default
 
     def test_xadd_failure(self, mock_redis_pool, mock_redis_client):
         """Test XADD failure"""
@@ -187,3 +187,58 @@ class TestRestoreBackupForce:
             force=True,
         )
         assert result is False
+
+    @patch("redis.Redis")
+    def test_force_copies_backup_and_reloads(self, mock_redis_cls, tmp_path):
+        f = tmp_path / "redis_20260217_120000.rdb"
+        f.write_bytes(b"REDIS0009data")
+        target = tmp_path / "data" / "dump.rdb"
+        target.parent.mkdir()
+        target.write_bytes(b"REDIS0009old")
+
+        with patch("scripts.restore.locate_redis_rdb", return_value=target), \
+             patch("scripts.backup.os.fsync") as mock_fsync:
+            result = restore_backup(backup_file=f, host="localhost", force=True)
+
+        assert result is True
+        mock_redis_cls.assert_called_once()  # lookup and reload share a client
+        mock_fsync.assert_called_once()
+        assert target.read_bytes() == b"REDIS0009data"
+        mock_redis_cls.return_value.execute_command.assert_called_once_with(
+            "DEBUG", "RELOAD"
+        )
+
+    @patch("redis.Redis")
+    def test_force_reuses_lookup_client(self, mock_redis_cls, tmp_path):
+        f = tmp_path / "redis_20260217_120000.rdb"
+        f.write_bytes(b"REDIS0009data")
+        client = mock_redis_cls.return_value
+        client.config_get.side_effect = lambda k: {
+            "dir": {"dir": str(tmp_path)},
+            "dbfilename": {"dbfilename": "dump.rdb"},
+        }[k]
+
+        with patch("scripts.backup.os.fsync"):
+            assert restore_backup(backup_file=f, host="localhost", force=True) is True
+
+        mock_redis_cls.assert_called_once()
+        client.ping.assert_called_once()
+        client.execute_command.assert_called_once_with("DEBUG", "RELOAD")
+
+    @patch("redis.Redis")
+    def test_force_over_unix_socket_counts_as_local(self, mock_redis_cls, tmp_path):
+        f = tmp_path / "redis_20260217_120000.rdb"
+        f.write_bytes(b"REDIS0009data")
+        target = tmp_path / "dump.rdb"
+
+        with patch("scripts.restore.locate_redis_rdb", return_value=target), \
+             patch("scripts.backup.os.fsync"):
+            result = restore_backup(
+                backup_file=f,
+                host="10.0.0.5",
+                force=True,
+                unix_socket_path="/run/redis.sock",
+            )
+
+        assert result is True
+        assert mock_redis_cls.call_args.kwargs["unix_socket_path"] == "/run/redis.sock"
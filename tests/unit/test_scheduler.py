@@ -0,0 +1,92 @@
+"""
+Unit tests for PeriodicScheduler.
+"""
+import unittest
+import threading
+import time
+from unittest.mock import MagicMock
+
+from src.common.scheduler import PeriodicScheduler
+
+
+class TestPeriodicScheduler(unittest.TestCase):
+    """Tests for PeriodicScheduler."""
+
+    def setUp(self):
+        self.scheduler = PeriodicScheduler(name="test-scheduler")
+
+    def tearDown(self):
+        self.scheduler.stop(timeout=1)
+
+    def test_start_and_stop(self):
+        self.scheduler.add_job("noop", lambda: None, interval=0.05)
+        self.scheduler.start()
+        self.assertTrue(self.scheduler.is_running)
+
+        self.scheduler.stop()
+        self.assertFalse(self.scheduler.is_running)
+
+    def test_jobs_share_one_thread(self):
+        threads = set()
+        self.scheduler.add_job(
+            "a", lambda: threads.add(threading.current_thread().name), interval=0.05
+        )
+        self.scheduler.add_job(
+            "b", lambda: threads.add(threading.current_thread().name), interval=0.05
+        )
+        self.scheduler.start()
+        time.sleep(0.2)
+        self.scheduler.stop()
+
+        self.assertEqual(threads, {"test-scheduler"})
+
+    def test_job_runs_repeatedly(self):
+        job = MagicMock()
+        self.scheduler.add_job("job", job, interval=0.05)
+        self.scheduler.start()
+        time.sleep(0.25)
+        self.scheduler.stop()
+
+        self.assertGreaterEqual(job.call_count, 3)
+
+    def test_delayed_first_run(self):
+        job = MagicMock()
+        self.scheduler.add_job("job", job, interval=10, run_immediately=False)
+        self.scheduler.start()
+        time.sleep(0.1)
+        self.scheduler.stop()
+
+        job.assert_not_called()
+
+    def test_failing_job_does_not_stop_others(self):
+        healthy = MagicMock()
+        self.scheduler.add_job("bad", MagicMock(side_effect=Exception("boom")), interval=0.05)
+        self.scheduler.add_job("good", healthy, interval=0.05)
+        self.scheduler.start()
+        time.sleep(0.2)
+        self.scheduler.stop()
+
+        self.assertGreaterEqual(healthy.call_count, 2)
+
+    def test_stop_interrupts_wait(self):
+        self.scheduler.add_job("slow", lambda: None, interval=60)
+        self.scheduler.start()
+
+        start = time.monotonic()
+        self.scheduler.stop()
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_rejects_non_positive_interval(self):
+        with self.assertRaises(ValueError):
+            self.scheduler.add_job("bad", lambda: None, interval=0)
+
+    def test_rejects_jobs_while_running(self):
+        self.scheduler.add_job("job", lambda: None, interval=60)
+        self.scheduler.start()
+
+        with self.assertRaises(RuntimeError):
+            self.scheduler.add_job("late", lambda: None, interval=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
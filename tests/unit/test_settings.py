@@ -0,0 +1,113 @@
+"""
+Unit tests for configuration loading and the cached settings factory.
+"""
+import pytest
+from unittest.mock import patch
+from pydantic import ValidationError
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import config.settings as settings_module
+from config.settings import (
+    Settings, RedisSettings, OAuth2Settings, OutlookOAuth2Settings, get_settings
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_settings_cache():
+    """Ensure each test starts with an empty settings cache"""
+    settings_module._build_settings.cache_clear()
+    yield
+    settings_module._build_settings.cache_clear()
+
+
+class TestGetSettings:
+    """Test get_settings factory"""
+
+    def test_returns_settings_instance(self):
+        assert isinstance(get_settings(), Settings)
+
+    def test_returns_cached_instance(self):
+        """Test repeated calls return the same object"""
+        assert get_settings() is get_settings()
+
+    def test_env_change_rebuilds(self, monkeypatch):
+        """Test a changed environment variable yields a fresh instance"""
+        first = get_settings()
+        monkeypatch.setenv("REDIS_STREAM_NAME", "rebuilt_stream")
+
+        second = get_settings()
+        assert second is not first
+        assert second.redis.stream_name == "rebuilt_stream"
+        assert get_settings() is second
+
+    def test_unrelated_env_change_keeps_cache(self, monkeypatch):
+        """Test variables outside the settings schema don't invalidate"""
+        first = get_settings()
+        monkeypatch.setenv("UNRELATED_VARIABLE", "x")
+
+        assert get_settings() is first
+
+    def test_env_keys_include_unprefixed_sections(self):
+        """Test sections with an empty prefix contribute their field names"""
+        assert "REDIS_HOST" in settings_module._SETTINGS_ENV_KEYS
+        assert "CONSUMER_GROUP_NAME" in settings_module._SETTINGS_ENV_KEYS
+        assert "EMAIL_PROVIDER" in settings_module._SETTINGS_ENV_KEYS
+
+
+class TestLoadEnvOnce:
+    """Test .env loading guard"""
+
+    def test_loads_dotenv_only_once(self, monkeypatch):
+        """Test load_dotenv runs on the first call only"""
+        monkeypatch.setattr(settings_module, "_dotenv_loaded", False)
+        monkeypatch.delenv(settings_module._ENV_LOADED_FLAG, raising=False)
+
+        with patch("config.settings.load_dotenv") as mock_load:
+            settings_module._load_env_once()
+            settings_module._load_env_once()
+
+        mock_load.assert_called_once()
+
+    def test_skips_when_environment_flag_set(self, monkeypatch):
+        """Test inherited flag skips the .env read entirely"""
+        monkeypatch.setattr(settings_module, "_dotenv_loaded", False)
+        monkeypatch.setenv(settings_module._ENV_LOADED_FLAG, "1")
+
+        with patch("config.settings.load_dotenv") as mock_load:
+            settings_module._load_env_once()
+
+        mock_load.assert_not_called()
+
+
+class TestSettingsSchema:
+    """Test settings model configuration"""
+
+    def test_settings_are_frozen(self):
+        """Test cached settings cannot be mutated at runtime"""
+        settings = get_settings()
+        with pytest.raises(ValidationError):
+            settings.redis.port = 1234
+
+    def test_env_prefix_applied(self, monkeypatch):
+        monkeypatch.setenv("REDIS_PORT", "6380")
+        assert RedisSettings().port == 6380
+
+    def test_secret_reference_resolved(self, monkeypatch):
+        """Test env: references are resolved for sensitive fields"""
+        monkeypatch.setenv("MY_REDIS_SECRET", "s3cret")
+        monkeypatch.setenv("REDIS_PASSWORD", "env:MY_REDIS_SECRET")
+
+        assert Settings().redis.password == "s3cret"
+
+    def test_is_configured_cached_per_instance(self):
+        """Test the OAuth2 configured probe is computed once"""
+        oauth2 = OAuth2Settings(client_id="cid", client_secret="secret")
+        assert oauth2.is_configured is True
+        assert oauth2.__dict__["is_configured"] is True
+
+        outlook = OutlookOAuth2Settings(client_id="")
+        assert outlook.is_configured is False
+        assert "is_configured" not in outlook.model_dump()
@@ -219,6 +219,55 @@ class TestAtomicUpdateState:
             state_manager.atomic_update_state("INBOX", 99999, 100)
 
 
+class TestUpdateAndIncrement:
+    """Test update_and_increment"""
+
+    def test_single_script_call(self, state_manager, mock_redis):
+        """Test state and count are written with one script invocation"""
+        script = mock_redis.client.register_script.return_value
+        script.return_value = 15
+
+        result = state_manager.update_and_increment("INBOX", 12345, 999, 5)
+
+        assert result == 15
+        script.assert_called_once()
+        kwargs = script.call_args.kwargs
+        assert kwargs["keys"] == [
+            "producer_state:user@gmail.com:INBOX:uidvalidity",
+            "producer_state:user@gmail.com:INBOX:last_uid",
+            "producer_state:user@gmail.com:INBOX:last_poll",
+            "producer_state:user@gmail.com:INBOX:total_emails",
+        ]
+        assert kwargs["args"][0] == 12345
+        assert kwargs["args"][1] == 999
+        assert kwargs["args"][3] == 5
+        mock_redis.get.assert_not_called()
+        mock_redis.set.assert_not_called()
+
+    def test_script_registered_once(self, state_manager, mock_redis):
+        """Test the Lua script is registered lazily and reused"""
+        mock_redis.client.register_script.return_value.return_value = 1
+
+        state_manager.update_and_increment("INBOX", 1, 10, 1)
+        state_manager.update_and_increment("INBOX", 1, 11, 1)
+
+        mock_redis.client.register_script.assert_called_once()
+
+    def test_raises_on_uidvalidity_mismatch(self, state_manager, mock_redis):
+        """Test script mismatch sentinel is raised as StateManagementError"""
+        mock_redis.client.register_script.return_value.return_value = -1
+
+        with pytest.raises(StateManagementError, match="UIDVALIDITY mismatch"):
+            state_manager.update_and_increment("INBOX", 99999, 100, 1)
+
+    def test_raises_on_redis_error(self, state_manager, mock_redis):
+        """Test Redis failures are wrapped"""
+        mock_redis.client.register_script.return_value.side_effect = Exception("down")
+
+        with pytest.raises(StateManagementError, match="Failed to update state"):
+            state_manager.update_and_increment("INBOX", 1, 10, 1)
+
+
 class TestCreateStateManagerFromConfig:
     """Test factory function"""
 
@@ -15,7 +15,7 @@ from src.common.exceptions import ProcessingError
 
 @pytest.fixture
 def mock_settings():
-    """Mock the settings singleton"""
+    """Mock the application settings"""
     mock = MagicMock()
     mock.logging.level = "INFO"
     mock.redis.host = "localhost"
@@ -34,6 +34,7 @@ def mock_settings():
     mock.circuit_breaker.failure_threshold = 5
     mock.circuit_breaker.recovery_timeout_seconds = 60.0
     mock.circuit_breaker.success_threshold = 3
+    mock.circuit_breaker.failure_window_seconds = None
     mock.recovery.min_idle_ms = 300000
     mock.recovery.max_claim_count = 50
     mock.recovery.max_delivery_count = 10
@@ -45,7 +46,7 @@ def mock_settings():
 @pytest.fixture
 def worker(mock_settings):
     """Create an EmailWorker with all dependencies mocked"""
-    with patch("worker.settings", mock_settings), \
+    with patch("worker.get_settings", return_value=mock_settings), \
          patch("worker.RedisClient") as mock_redis_cls, \
          patch("worker.create_idempotency_manager_from_config") as mock_idemp, \
          patch("worker.create_backoff_manager_from_config") as mock_backoff, \
@@ -110,6 +111,17 @@ class TestEmailWorkerInit:
         assert worker.messages_processed == 0
         assert worker.messages_failed == 0
 
+    def test_import_does_not_load_settings(self):
+        import importlib
+        import worker as worker_module
+
+        try:
+            with patch("config.settings.get_settings") as mock_get:
+                importlib.reload(worker_module)
+            mock_get.assert_not_called()
+        finally:
+            importlib.reload(worker_module)
+
 
 class TestEnsureConsumerGroup:
     """Test ensure_consumer_group method"""
@@ -7,11 +7,12 @@ correlation IDs, orphaned message recovery.
 """
 import sys
 import time
+import logging
 import argparse
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, TYPE_CHECKING
 from datetime import datetime
 
-from config.settings import settings
+from config.settings import get_settings
 from src.common.redis_client import create_redis_client_from_config, RedisClient
 from src.common.logging_config import setup_logging
 from src.common.exceptions import (
@@ -28,13 +29,19 @@ from src.worker.dlq import create_dlq_manager_from_config
 from src.worker.processor import create_processor_from_config
 from src.worker.recovery import OrphanedMessageRecovery, ConnectionWatchdog
 from src.common.batch import BatchAcknowledger
+from src.common.scheduler import PeriodicScheduler
 from src.monitoring.metrics import (
     get_metrics_collector,
     start_metrics_server,
     BackgroundMetricsUpdater,
 )
 
-logger = setup_logging(__name__, level=settings.logging.level)
+if TYPE_CHECKING:
+    from config.settings import Settings
+
+# Handlers are configured in main(), so importing this module (or running
+# --help) does not load settings or build the JSON logging stack
+logger = logging.getLogger(__name__)
 
 # Set component name for logging
 set_component("worker")
@@ -52,7 +59,8 @@ class EmailWorker:
         consumer_group: str,
         consumer_name: str,
         batch_size: int = 10,
-        block_timeout_ms: int = 5000
+        block_timeout_ms: int = 5000,
+        settings: Optional["Settings"] = None
     ):
         """
         Initialize email worker.
@@ -63,23 +71,29 @@ class EmailWorker:
             consumer_name: This consumer's unique name
             batch_size: Number of messages to fetch per batch
             block_timeout_ms: Timeout for blocking read in milliseconds
+            settings: Application settings (loaded with get_settings() if None)
         """
+        if settings is None:
+            settings = get_settings()
+        self.settings = settings
         self.stream_name = stream_name
         self.consumer_group = consumer_group
         self.consumer_name = consumer_name
         self.batch_size = batch_size
         self.block_timeout_ms = block_timeout_ms
+        # Read per failed message; cached so the hot path skips the settings tree
+        self.max_retry_attempts = settings.dlq.max_retry_attempts
 
         # Initialize components
-        from config.settings import settings as cfg
         self.redis = RedisClient(
-            host=cfg.redis.host,
-            port=cfg.redis.port,
-            username=cfg.redis.username,
-            password=cfg.redis.password,
-            db=cfg.redis.db,
-            ssl=cfg.redis.ssl,
-            ssl_ca_certs=cfg.redis.ssl_ca_certs
+            host=settings.redis.host,
+            port=settings.redis.port,
+            username=settings.redis.username,
+            password=settings.redis.password,
+            db=settings.redis.db,
+            ssl=settings.redis.ssl,
+            ssl_ca_certs=settings.redis.ssl_ca_certs,
+            unix_socket_path=settings.redis.unix_socket_path
         )
         self.idempotency = create_idempotency_manager_from_config(
             self.redis,
@@ -88,7 +102,7 @@ class EmailWorker:
         self.backoff = create_backoff_manager_from_config(
             initial_delay=float(settings.dlq.initial_backoff_seconds),
             max_delay=float(settings.dlq.max_backoff_seconds),
-            max_retries=settings.dlq.max_retry_attempts
+            max_retries=self.max_retry_attempts
         )
         self.dlq = create_dlq_manager_from_config(
             self.redis,
@@ -101,7 +115,8 @@ class EmailWorker:
             "redis",
             failure_threshold=settings.circuit_breaker.failure_threshold,
             recovery_timeout=settings.circuit_breaker.recovery_timeout_seconds,
-            success_threshold=settings.circuit_breaker.success_threshold
+            success_threshold=settings.circuit_breaker.success_threshold,
+            failure_window=settings.circuit_breaker.failure_window_seconds
         )
 
         # Shutdown manager
@@ -208,9 +223,9 @@ class EmailWorker:
 
             # Process the message
             try:
-                proc_start = time.time()
+                proc_start_ns = time.monotonic_ns()
                 result = self.processor.process(message_data)
-                proc_elapsed = time.time() - proc_start
+                proc_elapsed = (time.monotonic_ns() - proc_start_ns) / 1e9
                 
                 # Mark as processed (idempotency)
                 self.idempotency.mark_processed(email_id)
@@ -236,7 +251,7 @@ class EmailWorker:
                 
                 logger.error(
                     f"Processing failed for {email_id}: {e} "
-                    f"(attempt {retry_count}/{settings.dlq.max_retry_attempts})"
+                    f"(attempt {retry_count}/{self.max_retry_attempts})"
                 )
                 return False
 
@@ -249,7 +264,7 @@ class EmailWorker:
                 
                 logger.exception(
                     f"Unexpected error processing {email_id}: {e} "
-                    f"(attempt {retry_count}/{settings.dlq.max_retry_attempts})"
+                    f"(attempt {retry_count}/{self.max_retry_attempts})"
                 )
                 return False
 
@@ -279,34 +294,37 @@ class EmailWorker:
         )
         health_server = HealthServer(
             health_registry,
-            port=settings.monitoring.worker_health_port
+            port=self.settings.monitoring.worker_health_port
         )
         health_server.start()
 
         # Setup Prometheus metrics server
-        start_metrics_server(port=settings.monitoring.worker_metrics_port)
+        start_metrics_server(port=self.settings.monitoring.worker_metrics_port)
         metrics_updater = BackgroundMetricsUpdater(
             collector=get_metrics_collector(),
             redis_client=self.redis,
             stream_name=self.stream_name,
-            dlq_stream_name=settings.dlq.stream_name,
+            dlq_stream_name=self.settings.dlq.stream_name,
         )
-        metrics_updater.start()
 
         # Setup connection watchdog
         watchdog = ConnectionWatchdog(check_interval=30)
         watchdog.add_check("redis", lambda: self.redis.ping())
-        watchdog.start()
+
+        # Both periodic tasks share one scheduler thread
+        scheduler = PeriodicScheduler(name="worker-scheduler")
+        scheduler.add_job(
+            "metrics_updater", metrics_updater.tick, metrics_updater.interval
+        )
+        scheduler.add_job("watchdog", watchdog.tick, watchdog.check_interval)
+        scheduler.start()
 
         # Register shutdown callbacks
         self.shutdown.register(
             lambda: health_server.stop(), priority=5, name="health_server"
         )
         self.shutdown.register(
-            lambda: watchdog.stop(), priority=5, name="watchdog"
-        )
-        self.shutdown.register(
-            lambda: metrics_updater.stop(), priority=5, name="metrics_updater"
+            lambda: scheduler.stop(), priority=5, name="scheduler"
         )
         self.shutdown.register(
             lambda: self.redis.close(), priority=35, name="redis"
@@ -334,7 +352,7 @@ class EmailWorker:
                         message_id=msg_id,
                         original_data={"message_id": msg_id},
                         error=Exception("Exceeded max delivery count"),
-                        retry_count=settings.recovery.max_delivery_count
+                        retry_count=self.settings.recovery.max_delivery_count
                     )
                     self.redis.xack(
                         self.stream_name, self.consumer_group, msg_id
@@ -348,7 +366,7 @@ class EmailWorker:
             logger.warning(f"Orphan recovery failed (non-fatal): {e}")
 
         # Main processing loop
-        recovery_interval = settings.recovery.check_interval_seconds
+        recovery_interval = self.settings.recovery.check_interval_seconds
         last_recovery = time.time()
 
         while self.shutdown.is_running:
@@ -359,7 +377,7 @@ class EmailWorker:
                         f"Redis circuit breaker open, waiting "
                         f"{self.redis_cb.get_retry_after():.0f}s..."
                     )
-                    time.sleep(5)
+                    self.shutdown.wait_for_shutdown(timeout=5)
                     continue
 
                 # Periodic orphan recovery
@@ -438,15 +456,15 @@ class EmailWorker:
             except RedisConnectionError as e:
                 logger.error(f"Redis connection error: {e}")
                 self.redis_cb.record_failure(e)
-                time.sleep(5)
+                self.shutdown.wait_for_shutdown(timeout=5)
 
             except CircuitBreakerError as e:
                 logger.warning(f"Circuit breaker: {e}")
-                time.sleep(e.retry_after)
+                self.shutdown.wait_for_shutdown(timeout=e.retry_after)
 
             except Exception as e:
                 logger.exception(f"Unexpected error in worker loop: {e}")
-                time.sleep(1)
+                self.shutdown.wait_for_shutdown(timeout=1)
 
         logger.info("Worker shutting down gracefully...")
         self.log_stats()
@@ -479,47 +497,54 @@ def main():
     parser = argparse.ArgumentParser(
         description="Email Worker - Consume and process emails from Redis Streams"
     )
+    # Defaults are resolved from settings after parsing, so --help works
+    # without a valid environment
     parser.add_argument(
         "--stream",
-        default=settings.redis.stream_name,
-        help=f"Redis stream name (default: {settings.redis.stream_name})"
+        help="Redis stream name (default: REDIS_STREAM_NAME)"
     )
     parser.add_argument(
         "--group",
-        default=settings.worker.consumer_group_name,
-        help=f"Consumer group name (default: {settings.worker.consumer_group_name})"
+        help="Consumer group name (default: CONSUMER_GROUP_NAME)"
     )
     parser.add_argument(
         "--consumer",
-        default=settings.worker.consumer_name,
-        help=f"Consumer name (default: {settings.worker.consumer_name})"
+        help="Consumer name (default: CONSUMER_NAME)"
     )
     parser.add_argument(
         "--batch-size",
         type=int,
-        default=settings.worker.batch_size,
-        help=f"Batch size (default: {settings.worker.batch_size})"
+        help="Batch size (default: BATCH_SIZE)"
     )
     parser.add_argument(
         "--block-timeout",
         type=int,
-        default=settings.worker.block_timeout_ms,
-        help=f"Block timeout in ms (default: {settings.worker.block_timeout_ms})"
+        help="Block timeout in ms (default: BLOCK_TIMEOUT_MS)"
     )
 
     args = parser.parse_args()
 
+    settings = get_settings()
+    setup_logging(__name__, level=settings.logging.level)
+
     # Setup shutdown manager (replaces old signal handlers)
     shutdown = ShutdownManager()
     shutdown.install_signal_handlers()
 
     # Create and run worker
     worker = EmailWorker(
-        stream_name=args.stream,
-        consumer_group=args.group,
-        consumer_name=args.consumer,
-        batch_size=args.batch_size,
-        block_timeout_ms=args.block_timeout
+        stream_name=args.stream or settings.redis.stream_name,
+        consumer_group=args.group or settings.worker.consumer_group_name,
+        consumer_name=args.consumer or settings.worker.consumer_name,
+        batch_size=(
+            args.batch_size if args.batch_size is not None
+            else settings.worker.batch_size
+        ),
+        block_timeout_ms=(
+            args.block_timeout if args.block_timeout is not None
+            else settings.worker.block_timeout_ms
+        ),
+        settings=settings
     )
 
     try: